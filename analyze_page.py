@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Page-weight and critical-path report for index.html and static/.
+
+Every asset the page asks for is resolved: <link>, <script>, <img>/srcset,
+<video>/<source>/poster, inline style url(...), and the url(...)/@import
+references inside local stylesheets. For each request the report gives its
+type, size on disk (remote sizes only with --remote) and how it loads:
+
+    render-blocking   stylesheet, or synchronous <script> in <head>
+    parser-blocking   synchronous <script> in <body>
+    deferred / async  <script defer|async|type=module>
+    lazy              <img loading="lazy">
+    candidate         srcset / <picture><source> alternative; the browser picks
+                      one per image, so only the <img src> is counted
+    on-demand         url(...) inside a stylesheet (fonts, backgrounds); fetched
+                      only when a rule uses it, so left out of the page total
+    non-blocking      everything else (images, media, icons)
+
+Files under static/ that nothing references are listed as unused. Byte
+budgets from page_budgets.json are enforced; any overrun exits with 1.
+
+    python analyze_page.py [index.html] [--budgets page_budgets.json] [--remote]
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+import urllib.request
+from dataclasses import asdict, dataclass
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "page_budgets.json")
+
+TYPES = {
+    ".css": "css", ".js": "js", ".mjs": "js",
+    ".png": "image", ".jpg": "image", ".jpeg": "image", ".gif": "image", ".svg": "image",
+    ".webp": "image", ".avif": "image", ".ico": "image",
+    ".mp4": "video", ".webm": "video", ".mov": "video",
+    ".woff": "font", ".woff2": "font", ".ttf": "font", ".otf": "font", ".eot": "font",
+    ".pdf": "document", ".html": "html",
+}
+
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)|@import\s+(['"])([^'"]+)\3""")
+
+
+@dataclass
+class Asset:
+    url: str
+    tag: str
+    type: str
+    loading: str
+    line: int
+    # Local file the URL resolves to, or None for remote URLs.
+    path: str = None
+    bytes: int = None
+    referenced_from: str = "index.html"
+    missing: bool = False
+
+    @property
+    def remote(self):
+        return self.path is None
+
+    @property
+    def blocking(self):
+        return self.loading in ("render-blocking", "parser-blocking")
+
+
+def asset_type(url, hint=None):
+    ext = os.path.splitext(urlsplit(url).path)[1].lower()
+    if ext in TYPES:
+        return TYPES[ext]
+    if "fonts.googleapis.com" in url:
+        return "css"
+    return hint or "other"
+
+
+def _srcset_urls(srcset):
+    return [part.strip().split()[0] for part in srcset.split(",") if part.strip()]
+
+
+class _AssetCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.assets = []
+        self.in_head = False
+        # <noscript> content is never fetched when scripts run.
+        self.in_noscript = False
+
+    def _add(self, url, tag, loading, hint=None):
+        if not url or self.in_noscript or url.startswith(("data:", "#", "mailto:", "javascript:")):
+            return
+        self.assets.append(Asset(url, tag, asset_type(url, hint), loading, self.getpos()[0]))
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == "head":
+            self.in_head = True
+        elif tag == "body":
+            self.in_head = False
+        elif tag == "noscript":
+            self.in_noscript = True
+        elif tag == "link":
+            rel = (a.get("rel") or "").lower().split()
+            if "stylesheet" in rel:
+                media = (a.get("media") or "all").lower()
+                blocking = media in ("all", "screen") or "print" not in media
+                self._add(a.get("href"), "link", "render-blocking" if blocking else "non-blocking", "css")
+            elif rel and set(rel) & {"icon", "apple-touch-icon", "preload", "modulepreload", "manifest"}:
+                self._add(a.get("href"), "link", "non-blocking")
+        elif tag == "script" and a.get("src"):
+            if "async" in a:
+                loading = "async"
+            elif "defer" in a or a.get("type") == "module":
+                loading = "deferred"
+            else:
+                loading = "render-blocking" if self.in_head else "parser-blocking"
+            self._add(a["src"], "script", loading, "js")
+        elif tag == "img":
+            loading = "lazy" if (a.get("loading") or "").lower() == "lazy" else "non-blocking"
+            self._add(a.get("src"), "img", loading, "image")
+            for url in _srcset_urls(a.get("srcset") or ""):
+                self._add(url, "img", "candidate", "image")
+        elif tag in ("video", "audio"):
+            self._add(a.get("src"), tag, "non-blocking", "video")
+            self._add(a.get("poster"), tag, "non-blocking", "image")
+        elif tag == "source":
+            self._add(a.get("src"), tag, "non-blocking", "video")
+            for url in _srcset_urls(a.get("srcset") or ""):
+                self._add(url, tag, "candidate", "image")
+        elif tag in ("iframe", "embed"):
+            self._add(a.get("src"), tag, "non-blocking")
+        elif tag == "object":
+            self._add(a.get("data"), tag, "non-blocking")
+        style = a.get("style")
+        if style:
+            for m in _CSS_URL.finditer(style):
+                self._add(m.group(2) or m.group(4), tag, "non-blocking")
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.in_head = False
+        elif tag == "noscript":
+            self.in_noscript = False
+
+
+# ------------------------------------------------------------
+# Resolution
+# ------------------------------------------------------------
+
+def _local_path(url, base_dir):
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc:
+        return None
+    return os.path.normpath(os.path.join(base_dir, parts.path))
+
+
+def _remote_size(url, timeout=5.0):
+    """Content-Length from a HEAD request, or None."""
+    try:
+        request = urllib.request.Request(url, method="HEAD", headers={"User-Agent": "analyze_page"})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            length = response.headers.get("Content-Length")
+            return int(length) if length else None
+    except (OSError, ValueError):
+        return None
+
+
+def resolve(asset, base_dir, remote=False):
+    if asset.path is None:
+        asset.path = _local_path(asset.url, base_dir)
+    if asset.path is not None:
+        asset.missing = not os.path.isfile(asset.path)
+        asset.bytes = None if asset.missing else os.path.getsize(asset.path)
+    elif remote:
+        asset.bytes = _remote_size(urljoin("https:", asset.url) if asset.url.startswith("//") else asset.url)
+    return asset
+
+
+def collect_assets(html_path, remote=False):
+    with open(html_path, "r") as f:
+        source = f.read()
+    base_dir = os.path.dirname(os.path.abspath(html_path))
+    collector = _AssetCollector()
+    collector.feed(source)
+    collector.close()
+    page = Asset(os.path.basename(html_path), "document", "html", "render-blocking", 1,
+                 path=os.path.abspath(html_path), referenced_from="")
+    assets = [resolve(page, base_dir)]
+    seen = set()
+    queue = list(collector.assets)
+    while queue:
+        asset = resolve(queue.pop(0), base_dir, remote)
+        key = (asset.path or asset.url, asset.loading)
+        if key in seen:
+            continue
+        seen.add(key)
+        assets.append(asset)
+        if asset.type == "css" and asset.path is not None:
+            for inner in _stylesheet_css_refs(asset, base_dir):
+                queue.append(inner)
+    return assets
+
+
+def _stylesheet_css_refs(css_asset, base_dir):
+    if css_asset.missing:
+        return []
+    with open(css_asset.path, "r", errors="replace") as f:
+        text = f.read()
+    css_dir = os.path.dirname(css_asset.path)
+    found = []
+    for m in _CSS_URL.finditer(text):
+        url = m.group(2) or m.group(4)
+        if url.startswith("data:"):
+            continue
+        is_import = m.group(4) is not None
+        clean = url.split("?")[0].split("#")[0]
+        asset = Asset(url, "css", asset_type(clean, "css" if is_import else None),
+                      "render-blocking" if is_import else "on-demand", 0,
+                      referenced_from=os.path.relpath(css_asset.path, base_dir))
+        asset.path = _local_path(clean, css_dir)
+        found.append(asset)
+    return found
+
+
+def unused_files(assets, static_dir, ignore=()):
+    used = {a.path for a in assets if a.path and not a.missing}
+    unused = []
+    for root, _, files in os.walk(static_dir):
+        for name in sorted(files):
+            path = os.path.normpath(os.path.join(root, name))
+            rel = os.path.relpath(path, os.path.dirname(static_dir))
+            if path not in used and not any(fnmatch.fnmatch(rel, pattern) for pattern in ignore):
+                unused.append((rel, os.path.getsize(path)))
+    return sorted(unused)
+
+
+# ------------------------------------------------------------
+# Budgets and report
+# ------------------------------------------------------------
+
+def counted(assets):
+    """Assets that every visit downloads (known size, not on-demand or a srcset candidate)."""
+    return [a for a in assets if a.bytes is not None and a.loading not in ("on-demand", "candidate")]
+
+
+def bytes_by_type(assets):
+    totals = {}
+    for a in counted(assets):
+        totals[a.type] = totals.get(a.type, 0) + a.bytes
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def load_budgets(path=DEFAULT_BUDGETS_PATH):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def check_budgets(assets, unused, budgets):
+    """Return (name, limit, actual) for every budget, in config order."""
+    results = []
+    page = counted(assets)
+    if "total" in budgets:
+        results.append(("total", budgets["total"], sum(a.bytes for a in page)))
+    if "render_blocking" in budgets:
+        results.append(("render_blocking", budgets["render_blocking"],
+                        sum(a.bytes for a in page if a.blocking)))
+    if "render_blocking_requests" in budgets:
+        results.append(("render_blocking_requests", budgets["render_blocking_requests"],
+                        sum(1 for a in assets if a.blocking and a.type != "html")))
+    by_type = bytes_by_type(assets)
+    for name, limit in budgets.get("types", {}).items():
+        results.append((f"type:{name}", limit, by_type.get(name, 0)))
+    for pattern, limit in budgets.get("files", {}).items():
+        actual = max([a.bytes for a in page if a.path and fnmatch.fnmatch(a.url, pattern)] or [0])
+        results.append((f"file:{pattern}", limit, actual))
+    if "unused_bytes" in budgets:
+        results.append(("unused_bytes", budgets["unused_bytes"], sum(size for _, size in unused)))
+    return results
+
+
+def _size(n):
+    if n is None:
+        return "?"
+    for unit in ("B", "KB", "MB"):
+        if n < 1024 or unit == "MB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def render(assets, unused, budget_results):
+    lines = ["=" * 70, "REQUESTS", "=" * 70]
+    width = max(len(a.url) for a in assets)
+    for a in assets:
+        note = " (missing)" if a.missing else " (remote)" if a.remote and a.bytes is None else ""
+        lines.append(f"  {a.url.ljust(width)}  {a.type:<8} {_size(a.bytes):>9}  {a.loading}{note}")
+
+    lines += ["", "=" * 70, "BYTES BY TYPE", "=" * 70]
+    page = counted(assets)
+    for name, total in bytes_by_type(assets).items():
+        lines.append(f"  {name:<10} {_size(total):>10}")
+    lines.append(f"  {'total':<10} {_size(sum(a.bytes for a in page)):>10}"
+                 f"  ({sum(1 for a in assets if a.remote and a.bytes is None)} remote requests of unknown size)")
+
+    blocking = [a for a in assets if a.blocking and a.type != "html"]
+    lines += ["", "=" * 70, f"RENDER-BLOCKING REQUESTS: {len(blocking)}", "=" * 70]
+    for a in blocking:
+        lines.append(f"  line {a.line:>4}  {a.loading:<16} {_size(a.bytes):>9}  {a.url}")
+
+    missing = [a for a in assets if a.missing]
+    if missing:
+        lines += ["", "=" * 70, f"MISSING LOCAL FILES: {len(missing)}", "=" * 70]
+        for a in missing:
+            lines.append(f"  {a.url}  (from {a.referenced_from or 'index.html'})")
+
+    lines += ["", "=" * 70, f"UNUSED FILES UNDER static/: {len(unused)} "
+              f"({_size(sum(size for _, size in unused))})", "=" * 70]
+    for rel, size in unused:
+        lines.append(f"  {_size(size):>9}  {rel}")
+
+    if budget_results:
+        lines += ["", "=" * 70, "BUDGETS", "=" * 70]
+        for name, limit, actual in budget_results:
+            status = "OK" if actual <= limit else "OVER"
+            shown = (lambda n: str(n)) if name.endswith("_requests") else _size
+            lines.append(f"  {status:<4}  {name:<32} {shown(actual):>9} / {shown(limit)}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report page weight, render-blocking requests and unused static files.")
+    parser.add_argument("page", nargs="?", default="index.html", help="page to analyze (default: index.html)")
+    parser.add_argument("--static", default=None, help="static directory (default: static/ next to the page)")
+    parser.add_argument("--budgets", default=DEFAULT_BUDGETS_PATH, help="byte budgets JSON")
+    parser.add_argument("--no-budgets", action="store_true", help="report only; never fail")
+    parser.add_argument("--remote", action="store_true", help="HEAD remote assets to learn their size")
+    parser.add_argument("--json", metavar="PATH", help="also write the analysis as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    assets = collect_assets(args.page, args.remote)
+    budgets = {} if args.no_budgets or not os.path.exists(args.budgets) else load_budgets(args.budgets)
+    static_dir = args.static or os.path.join(os.path.dirname(os.path.abspath(args.page)), "static")
+    unused = unused_files(assets, static_dir, budgets.get("ignore_unused", []))
+    budget_results = check_budgets(assets, unused, budgets)
+
+    if args.json:
+        data = {"assets": [dict(asdict(a), blocking=a.blocking) for a in assets],
+                "bytes_by_type": bytes_by_type(assets),
+                "unused": [{"path": rel, "bytes": size} for rel, size in unused],
+                "budgets": [{"name": n, "limit": l, "actual": v, "ok": v <= l} for n, l, v in budget_results]}
+        if args.json == "-":
+            json.dump(data, sys.stdout, indent=2)
+        else:
+            with open(args.json, "w") as f:
+                json.dump(data, f, indent=2)
+    if args.json != "-":
+        print(render(assets, unused, budget_results))
+    return 1 if any(actual > limit for _, limit, actual in budget_results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
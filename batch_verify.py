@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Verify many website/paper pairs in parallel and merge the results.
+
+A manifest lists the pairs, with paths relative to the manifest file:
+
+    {"pairs": [
+        {"name": "iso-bench", "website": "site/index.html", "paper": "paper/example_paper.tex"},
+        ...
+    ]}
+
+Each distinct paper is parsed once, in the parent, and its parsed events
+are handed to every worker when the pool starts. The pages themselves are
+then spread over the pool, so several pages of one paper run in parallel.
+A paper or page that cannot be read fails only its own pairs.
+
+    python batch_verify.py manifest.json --jobs 8
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from claims import DEFAULT_CLAIMS_PATH
+from paper_index import DEFAULT_CACHE_DIR, build_paper_index
+from verify_data import Report, describe, load_plan
+from website_index import build_website_index
+
+
+@dataclass
+class Pair:
+    name: str
+    website: str
+    paper: str
+
+
+@dataclass
+class Entry:
+    pair: Pair
+    report: Report = None
+    error: str = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.report.ok
+
+
+def load_manifest(path):
+    with open(path, "r") as f:
+        data = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    pairs = []
+    for raw in data["pairs"] if isinstance(data, dict) else data:
+        website = os.path.join(base, raw["website"])
+        paper = os.path.join(base, raw["paper"])
+        pairs.append(Pair(raw.get("name", raw["website"]), website, paper))
+    return pairs
+
+
+# Per-process worker state, set once by _init_worker.
+_worker = {}
+
+
+def _init_worker(claims_path, cache_dir, memo):
+    """Pool initializer: load the plan and receive the parent's parsed paper events."""
+    _worker.update(plan=load_plan(claims_path), cache_dir=cache_dir, memo=memo, papers={})
+
+
+def _error(e):
+    return f"{type(e).__name__}: {e}"
+
+
+def _worker_paper(paper_path):
+    # The events come from the parent's memo, so only tables are built here,
+    # once per paper per worker.
+    papers = _worker["papers"]
+    if paper_path not in papers:
+        papers[paper_path] = build_paper_index(paper_path, _worker["cache_dir"], memo=_worker["memo"])
+    return papers[paper_path]
+
+
+def _verify_page(position, website_path, paper_path):
+    """Worker: check one page against its (already parsed) paper.
+
+    Returns (position, results, missing files, error); the parent rebuilds the
+    Report so the claims spec is not pickled back once per page.
+    """
+    try:
+        paper = _worker_paper(paper_path)
+        with open(website_path, "r") as f:
+            website = build_website_index(f.read(), website_path)
+        return position, _worker["plan"].execute(website, paper), paper.missing, None
+    except Exception as e:
+        return position, None, None, _error(e)
+
+
+def _parse_papers(paper_paths, cache_dir):
+    """Scan every distinct paper once in the parent.
+
+    Returns (memo, errors): the events of every file by content hash, shared
+    with the workers, and an error message per paper that could not be read.
+    """
+    memo = {}
+    errors = {}
+    for paper_path in paper_paths:
+        try:
+            paper = build_paper_index(paper_path, cache_dir, memo=memo)
+            if not paper.exists(paper.root_path):
+                raise FileNotFoundError(f"paper not found: {paper_path}")
+            paper.files()
+        except Exception as e:
+            errors[paper_path] = _error(e)
+    return memo, errors
+
+
+def verify_batch(pairs, jobs=None, claims_path=DEFAULT_CLAIMS_PATH, cache_dir=DEFAULT_CACHE_DIR):
+    """Check every pair; return one Entry per pair, in manifest order."""
+    entries = [Entry(pair) for pair in pairs]
+    memo, errors = _parse_papers(dict.fromkeys(os.path.abspath(pair.paper) for pair in pairs), cache_dir)
+    tasks = []
+    for position, pair in enumerate(pairs):
+        paper_path = os.path.abspath(pair.paper)
+        if paper_path in errors:
+            entries[position].error = errors[paper_path]
+        else:
+            tasks.append((position, pair.website, paper_path))
+
+    if jobs == 1 or len(tasks) <= 1:
+        _init_worker(claims_path, cache_dir, memo)
+        outputs = [_verify_page(*task) for task in tasks]
+    else:
+        outputs = []
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(claims_path, cache_dir, memo)) as pool:
+            futures = [(task[0], pool.submit(_verify_page, *task)) for task in tasks]
+            for position, future in futures:
+                try:
+                    outputs.append(future.result())
+                except Exception as e:
+                    # The worker itself died (e.g. a broken pool); only this page is lost.
+                    outputs.append((position, None, None, _error(e)))
+
+    spec = load_plan(claims_path).spec
+    for position, results, missing, error in outputs:
+        entry = entries[position]
+        if error is None:
+            entry.report = Report(spec, results, entry.pair.website, entry.pair.paper, missing=missing)
+        else:
+            entry.error = error
+    return entries
+
+
+def render_batch(entries, full=False):
+    """Merged report: one summary row per pair, then every mismatch by pair."""
+    lines = ["=" * 70, "BATCH SUMMARY", "=" * 70]
+    width = max([len(e.pair.name) for e in entries] + [4])
+    lines.append(f"  {'pair'.ljust(width)}  {'checks':>6}  {'passed':>6}  {'mismatches':>10}")
+    for e in entries:
+        if e.error:
+            lines.append(f"  {e.pair.name.ljust(width)}  ERROR: {e.error}")
+        else:
+            r = e.report
+            lines.append(f"  {e.pair.name.ljust(width)}  {len(r.results):>6}  {len(r.matches):>6}"
+                         f"  {len(r.mismatches):>10}" + (f"  MISSING FILES: {len(r.missing)}" if r.missing else ""))
+    failed = [e for e in entries if not e.ok]
+    total = sum(len(e.report.results) for e in entries if e.report)
+    lines.append(f"\nPairs: {len(entries)}  Failed: {len(failed)}  Total checks: {total}")
+
+    for e in entries:
+        if full and e.report:
+            lines.append("\n" + "#" * 70)
+            lines.append(f"# {e.pair.name}: {e.pair.website} vs {e.pair.paper}")
+            lines.append("#" * 70)
+            lines.append(e.report.render())
+        elif e.report and e.report.mismatches:
+            lines.append("\n" + "!" * 70)
+            lines.append(f"{e.pair.name}: {len(e.report.mismatches)} mismatches")
+            lines.append("!" * 70)
+            for r in e.report.mismatches:
+                lines.append(f"\n  {describe(r)}")
+        if e.report and e.report.missing and not full:
+            lines.append(f"\n{e.pair.name}: missing paper files")
+            lines.extend(f"  {path}" for path in e.report.missing)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify many website/paper pairs from a manifest.")
+    parser.add_argument("manifest", help="JSON manifest of website/paper pairs")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--claims", default=DEFAULT_CLAIMS_PATH, help="claims file (default: claims.json)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="parsed-table cache directory")
+    parser.add_argument("--full", action="store_true", help="include each pair's full report")
+    args = parser.parse_args(argv)
+
+    entries = verify_batch(load_manifest(args.manifest), args.jobs, args.claims, args.cache_dir)
+    print(render_batch(entries, args.full))
+    return 0 if all(e.ok for e in entries) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for verify_data.py on synthetic pages and papers.
+
+Each scale writes a generated corpus: an index.html-style page, a .tex paper
+that \\input's one file per block, and a claims file. A block is one page
+section with a results table and a Chart.js quadrant chart, plus one paper
+section with the matching quadrant and success-rate tables and 21 claims and
+2 identities over them. The real page has about a dozen report sections and
+five charts, so the default scales of 10, 100 and 1000 blocks cover 10x to
+1000x.
+
+Every scale runs verify_files() --repeat times with reporting.Profile, takes
+the median of each phase (plan, read, index, extract, check), then runs once
+more under tracemalloc for peak memory. The run fails when
+
+  - a generated corpus does not verify cleanly,
+  - a phase or peak memory exceeds its stored baseline by --tolerance
+    (--memory-tolerance), ignoring differences under --floor-ms,
+  - time or memory per block grows by more than --max-growth between two
+    scales, which catches a change that makes a phase quadratic on any
+    machine, baseline or not,
+  - a pathological input (an unclosed \\label{, an unterminated JS string,
+    ...) scales superlinearly through the regex it targets.
+
+    python bench_verify.py                          # compare with bench_baselines.json
+    python bench_verify.py --update-baselines       # record this machine's numbers
+    python bench_verify.py --scales 10,100 --repeat 3 --keep /tmp/corpus
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from claims import compile_plan, load_claims
+from consistency import round_half_up
+from literal_matcher import scan_literals
+from paper_index import Cell, _MULTIROW, clean_cell, parse_tabular, scan_events
+from reporting import PHASES, Profile
+from verify_data import verify_files
+from website_index import _tokenize
+
+DEFAULT_BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baselines.json")
+DEFAULT_SCALES = (10, 100, 1000)
+BENCH_PHASES = ("plan",) + PHASES
+
+AGENTS = ("Claude Code", "Codex CLI", "TRAE (Sonnet)", "TRAE (GPT-5)")
+QUADRANTS = ("Q1", "Q2", "Q3", "Q4")
+COLORS = ("#2563eb", "#16a34a", "#f59e0b", "#dc2626")
+
+
+# ------------------------------------------------------------
+# Synthetic corpus
+# ------------------------------------------------------------
+
+@dataclass
+class Block:
+    name: str
+    slug: str
+    tasks: int
+    # Per agent: tasks in Q1..Q4, summing to `tasks`.
+    quadrants: list
+
+    def true_success(self, agent):
+        return f"{round_half_up(self.quadrants[agent][0] / self.tasks * 100, 1):.1f}"
+
+
+def make_blocks(scale, seed=0):
+    rng = random.Random(seed)
+    width = max(4, len(str(scale - 1)))
+    blocks = []
+    for i in range(scale):
+        tasks = rng.randint(12, 60)
+        quadrants = []
+        for _ in AGENTS:
+            cuts = sorted(rng.randint(0, tasks) for _ in range(3))
+            quadrants.append([cuts[0], cuts[1] - cuts[0], cuts[2] - cuts[1], tasks - cuts[2]])
+        number = f"{i:0{width}d}"
+        blocks.append(Block(f"Block {number}", f"block{number}", tasks, quadrants))
+    return blocks
+
+
+_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Synthetic results page</title>
+  <link rel="stylesheet" href="static/css/index.css">
+</head>
+<body>
+<section class="hero"><h1 class="title is-1">Synthetic results page</h1>
+  <p>Generated by bench_verify.py; every number below is checked against the paper.</p>
+</section>
+"""
+
+
+def _page_section(block):
+    best = max(range(len(AGENTS)), key=lambda a: block.quadrants[a][0])
+    rows = "\n".join(
+        f"        <tr><td>{agent}</td><td>{block.tasks}</td><td>{block.true_success(a)}%</td></tr>"
+        for a, agent in enumerate(AGENTS))
+    return f"""<section class="section" id="{block.slug}">
+  <div class="container is-max-desktop">
+    <h2 class="title is-3">{block.name}: outcome distribution</h2>
+    <p>{block.name} covers {block.tasks} tasks. The best agent, <strong>{AGENTS[best]}</strong>,
+      reaches <strong>{block.true_success(best)}%</strong> true success with
+      {block.quadrants[best][1]} more tasks where it found the right target (~{block.quadrants[best][2]} regressions).</p>
+    <table class="table is-striped">
+      <thead><tr><th>Agent</th><th>Tasks</th><th>True Success</th></tr></thead>
+      <tbody>
+{rows}
+      </tbody>
+    </table>
+    <div class="chart-container"><canvas id="{block.slug}Chart"></canvas></div>
+  </div>
+</section>
+"""
+
+
+def _chart_script(block):
+    datasets = ",\n".join(
+        f"        {{ label: '{q}', data: [{', '.join(str(block.quadrants[a][i]) for a in range(len(AGENTS)))}], "
+        f"backgroundColor: '{COLORS[i]}' }}"
+        for i, q in enumerate(QUADRANTS))
+    return f"""  new Chart(document.getElementById('{block.slug}Chart'), {{
+    type: 'bar',
+    data: {{
+      labels: agents,
+      datasets: [
+{datasets}
+      ]
+    }},
+    options: {{ ...stacked, plugins: {{ title: {{ display: true, text: '{block.name}' }} }} }}
+  }});
+"""
+
+
+def render_page(blocks):
+    agents = ", ".join(f"'{a}'" for a in AGENTS)
+    script = "".join(_chart_script(b) for b in blocks)
+    return (_PAGE_HEAD + "".join(_page_section(b) for b in blocks)
+            + '<script src="https://cdn.jsdelivr.net/npm/chart.js"></script>\n<script>\n'
+            + f"  const agents = [{agents}];\n"
+            + "  const stacked = { responsive: true, scales: { x: { stacked: true }, y: { stacked: true } } };\n"
+            + script + "</script>\n</body>\n</html>\n")
+
+
+def render_paper_section(block):
+    quadrant_rows = "\n".join(f"{agent} & {' & '.join(map(str, block.quadrants[a]))} \\\\"
+                              for a, agent in enumerate(AGENTS))
+    success_rows = "\n".join(f"{agent} & {block.true_success(a)}\\% \\\\" for a, agent in enumerate(AGENTS))
+    return f"""\\section{{{block.name}}}
+\\label{{sec:{block.slug}}}
+% Generated by bench_verify.py.
+{block.name} covers {block.tasks} tasks; Table~\\ref{{tab:{block.slug}-q}} splits them into quadrants.
+
+\\begin{{table}}[t]
+\\centering
+\\caption{{Distribution of outcomes across quadrants for {block.name}.}}
+\\label{{tab:{block.slug}-q}}
+\\begin{{tabular}}{{lcccc}}
+\\toprule
+Agent & Q1 & Q2 & Q3 & Q4 \\\\
+\\midrule
+{quadrant_rows}
+\\bottomrule
+\\end{{tabular}}
+\\end{{table}}
+
+\\begin{{table}}[t]
+\\centering
+\\caption[True success]{{True success rates for {block.name}.}}
+\\label{{tab:{block.slug}-ts}}
+\\begin{{tabular}}{{lc}}
+\\toprule
+\\textbf{{Agent}} & \\textbf{{True Success}} \\\\
+\\midrule
+{success_rows}
+\\bottomrule
+\\end{{tabular}}
+\\end{{table}}
+"""
+
+
+def render_paper_root(blocks):
+    inputs = "\n".join(f"\\input{{sections/{b.slug}}}" for b in blocks)
+    return ("\\documentclass{article}\n\\usepackage{booktabs}\n\\begin{document}\n"
+            "\\title{Synthetic results paper}\n\\maketitle\n\n" + inputs + "\n\\end{document}\n")
+
+
+def render_claims(blocks):
+    dimensions = {
+        "agents": [{"name": a} for a in AGENTS],
+        "blocks": [{"name": b.name, "tasks": b.tasks, "chart": f"{b.slug}Chart"} for b in blocks],
+        "quadrants": [{"name": q, "column": i} for i, q in enumerate(QUADRANTS)],
+    }
+    # The cube always names its second dimension "project".
+    quadrant_caption = "Distribution of outcomes across quadrants for {%s.name}."
+    success_caption = "True success rates for {%s.name}."
+    metrics = {"tasks": {"value": "{project.tasks}"}}
+    for i, q in enumerate(QUADRANTS):
+        metrics[q] = {"website": {"chart": "{project.chart}", "dataset": q, "label": "{agent.name}"},
+                      "paper": {"table": quadrant_caption % "project", "row": "{agent.name}", "column": i}}
+    metrics["TS"] = {"website": {"section_table": "{project.name}", "row": "{agent.name}", "column": 2},
+                     "paper": {"table": success_caption % "project", "row": "{agent.name}", "column": 0}}
+    return {
+        "dimensions": dimensions,
+        "cube": {"agents": "agents", "projects": "blocks", "metrics": metrics},
+        "sections": [
+            {"id": "1", "title": "TASK COUNTS", "claims": [
+                {"for_each": [["block", "blocks"]],
+                 "description": "{block.name} tasks", "value": "{block.tasks}",
+                 "website": {"literal": ["{block.name} covers {block.tasks} tasks"]},
+                 "paper": {"literal": ["{block.name} covers {block.tasks} tasks"]}}]},
+            {"id": "2", "title": "QUADRANTS", "claims": [
+                {"for_each": [["block", "blocks"], ["agent", "agents"], ["quadrant", "quadrants"]],
+                 "description": "{block.name} {quadrant.name} - {agent.name}",
+                 "website": {"chart": "{block.chart}", "dataset": "{quadrant.name}", "label": "{agent.name}"},
+                 "paper": {"table": quadrant_caption % "block", "row": "{agent.name}", "column": "{quadrant.column}"}}]},
+            {"id": "3", "title": "TRUE SUCCESS", "claims": [
+                {"for_each": [["block", "blocks"], ["agent", "agents"]],
+                 "description": "{block.name} true success - {agent.name}",
+                 "website": {"section_table": "{block.name}", "row": "{agent.name}", "column": 2},
+                 "paper": {"table": success_caption % "block", "row": "{agent.name}", "column": 0, "suffix": "%"}}]},
+            {"id": "4", "title": "QUADRANT SUMS", "identities": [
+                {"description": "quadrant sum", "lhs": "Q1 + Q2 + Q3 + Q4", "rhs": "tasks"}]},
+            {"id": "5", "title": "TRUE SUCCESS vs QUADRANTS", "identities": [
+                {"description": "True Success % vs Q1/tasks", "lhs": "TS", "rhs": "Q1 / tasks * 100",
+                 "round": 1, "suffix": "%"}]},
+        ],
+    }
+
+
+@dataclass
+class Corpus:
+    scale: int
+    website: str
+    paper: str
+    claims: str
+    website_bytes: int
+    paper_bytes: int
+
+
+def write_corpus(scale, root, seed=0):
+    """Write page, paper and claims for `scale` blocks under `root`."""
+    blocks = make_blocks(scale, seed)
+    os.makedirs(os.path.join(root, "paper", "sections"), exist_ok=True)
+    website = os.path.join(root, "index.html")
+    paper = os.path.join(root, "paper", "main.tex")
+    claims = os.path.join(root, "claims.json")
+    page = render_page(blocks)
+    with open(website, "w") as f:
+        f.write(page)
+    paper_bytes = 0
+    for block in blocks:
+        text = render_paper_section(block)
+        paper_bytes += len(text)
+        with open(os.path.join(root, "paper", "sections", block.slug + ".tex"), "w") as f:
+            f.write(text)
+    text = render_paper_root(blocks)
+    with open(paper, "w") as f:
+        f.write(text)
+    with open(claims, "w") as f:
+        json.dump(render_claims(blocks), f, indent=1)
+    return Corpus(scale, website, paper, claims, len(page), paper_bytes + len(text))
+
+
+# ------------------------------------------------------------
+# Measurement
+# ------------------------------------------------------------
+
+@dataclass
+class Measurement:
+    scale: int
+    # Median seconds per phase over the timed runs.
+    phases: dict
+    peak_bytes: int
+    checks: int
+    website_bytes: int = 0
+    paper_bytes: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+
+def _run(corpus):
+    profile = Profile()
+    with profile.phase("plan"):
+        compile_plan(load_claims(corpus.claims))
+    report = verify_files(corpus.website, corpus.paper, corpus.claims, None, profile)
+    return profile, report
+
+
+def measure(corpus, repeat=3):
+    runs = []
+    for _ in range(repeat):
+        profile, report = _run(corpus)
+        runs.append(profile.phases)
+    tracemalloc.start()
+    try:
+        _run(corpus)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    phases = {name: statistics.median(run.get(name, 0.0) for run in runs) for name in BENCH_PHASES}
+    m = Measurement(corpus.scale, phases, peak, len(report.results), corpus.website_bytes, corpus.paper_bytes)
+    # Per block: one literal, a chart/table claim per quadrant cell and a success
+    # claim per agent, then two identities checked in both documents.
+    expected = corpus.scale * (1 + len(AGENTS) * len(QUADRANTS) + len(AGENTS) + 2 * 2 * len(AGENTS))
+    if not report.ok or m.checks != expected:
+        m.errors.append(f"scale {corpus.scale}: generated corpus did not verify "
+                        f"({len(report.mismatches)} mismatches, {m.checks}/{expected} checks)")
+    return m
+
+
+# ------------------------------------------------------------
+# Pathological inputs
+# ------------------------------------------------------------
+
+@dataclass
+class Case:
+    name: str
+    run: object
+    # Size -> input text.
+    make: object
+
+
+CASES = [
+    Case("tex: unclosed \\caption[", scan_events, lambda n: "\\caption[" * n),
+    Case("tex: unclosed \\label{", scan_events, lambda n: "\\label{" * n),
+    Case("tex: unclosed \\input{", scan_events, lambda n: "\\input{" * n),
+    Case("tex: % comment lines", scan_events, lambda n: "% \\label{x} 50\\%\n" * n),
+    Case("tabular: \\\\[ without ]", parse_tabular, lambda n: "a & b \\\\[" * n),
+    Case("tabular: unclosed \\cline{", parse_tabular, lambda n: "\\cline{" * n),
+    Case("tabular: unclosed \\cmidrule(", parse_tabular, lambda n: "\\cmidrule(" * n),
+    Case("cell: unclosed \\textbf{", clean_cell, lambda n: "\\textbf{" * n),
+    Case("cell: \\multirow with stray braces", _MULTIROW.match, lambda n: "\\multirow{2}{*}{" + "}x" * n),
+    Case("cell: digits and commas", lambda text: Cell(text, 0).number, lambda n: "1," * n + "x"),
+    Case("js: unterminated template", lambda text: _tokenize(text, 0), lambda n: "`\\" * n),
+    Case("js: unterminated strings on one line", lambda text: _tokenize(text, 0), lambda n: "'\\'" * n),
+    Case("js: unclosed /* comment", lambda text: _tokenize(text, 0), lambda n: "/* " + "*" * n),
+    Case("literals: overlapping needles", lambda text: scan_literals(text, ["a" * k for k in range(1, 40)]),
+         lambda n: "a" * n),
+]
+
+
+@dataclass
+class CaseResult:
+    name: str
+    small: float
+    large: float
+    # Time ratio divided by size ratio: about 1 when linear.
+    growth: float
+
+
+def _best(fn, arg, repeat):
+    # Like timeit: collector pauses would otherwise dominate the small inputs.
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(arg)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def run_cases(size=5000, factor=4, repeat=3):
+    results = []
+    for case in CASES:
+        small = _best(case.run, case.make(size), repeat)
+        large = _best(case.run, case.make(size * factor), repeat)
+        results.append(CaseResult(case.name, small, large, large / max(small, 1e-9) / factor))
+    return results
+
+
+# ------------------------------------------------------------
+# Thresholds and baselines
+# ------------------------------------------------------------
+
+def load_baselines(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def baseline_record(measurements, cases):
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scales": {str(m.scale): {**{name: round(m.phases[name], 6) for name in BENCH_PHASES},
+                                  "peak_bytes": m.peak_bytes, "checks": m.checks}
+                   for m in measurements},
+        "pathological": {c.name: round(c.large, 6) for c in cases},
+    }
+
+
+def compare(measurements, cases, baselines, tolerance=2.0, memory_tolerance=1.25, max_growth=2.0,
+            floor=0.005):
+    """Return a list of threshold violations (empty when everything passes)."""
+    failures = [error for m in measurements for error in m.errors]
+    by_scale = (baselines or {}).get("scales", {})
+    for m in measurements:
+        base = by_scale.get(str(m.scale))
+        if base is None:
+            continue
+        for name in BENCH_PHASES:
+            now, then = m.phases[name], base.get(name, 0.0)
+            if now > then * tolerance and now - then > floor:
+                failures.append(f"scale {m.scale}: {name} {now * 1000:.1f} ms > {tolerance:g}x baseline "
+                                f"{then * 1000:.1f} ms")
+        if m.peak_bytes > base["peak_bytes"] * memory_tolerance:
+            failures.append(f"scale {m.scale}: peak memory {m.peak_bytes / 1e6:.1f} MB > "
+                            f"{memory_tolerance:g}x baseline {base['peak_bytes'] / 1e6:.1f} MB")
+
+    # Cost per block should stay flat as the corpus grows.
+    ordered = sorted(measurements, key=lambda m: m.scale)
+    for small, large in zip(ordered, ordered[1:]):
+        ratio = large.scale / small.scale
+        for name in BENCH_PHASES:
+            a, b = small.phases[name], large.phases[name]
+            if b > floor and b / max(a, floor / ratio) / ratio > max_growth:
+                failures.append(f"{name}: {small.scale} -> {large.scale} blocks took {b / max(a, 1e-9):.0f}x "
+                                f"longer for {ratio:g}x the input")
+        if large.peak_bytes / small.peak_bytes / ratio > max_growth:
+            failures.append(f"memory: {small.scale} -> {large.scale} blocks grew "
+                            f"{large.peak_bytes / small.peak_bytes:.0f}x for {ratio:g}x the input")
+
+    base_cases = (baselines or {}).get("pathological", {})
+    for c in cases:
+        if c.growth > max_growth and c.large > floor:
+            failures.append(f"pathological '{c.name}': superlinear ({c.growth:.1f}x per unit of input)")
+        then = base_cases.get(c.name)
+        if then is not None and c.large > then * tolerance and c.large - then > floor:
+            failures.append(f"pathological '{c.name}': {c.large * 1000:.1f} ms > {tolerance:g}x baseline "
+                            f"{then * 1000:.1f} ms")
+    return failures
+
+
+def render(measurements, cases, baselines):
+    by_scale = (baselines or {}).get("scales", {})
+    lines = ["-" * 70, "SCALING (median ms per phase; peak MB under tracemalloc)", "-" * 70]
+    lines.append(f"  {'blocks':>7} {'checks':>7} " + " ".join(f"{n:>9}" for n in BENCH_PHASES)
+                 + f" {'total':>9} {'peak':>7}")
+    for m in measurements:
+        lines.append(f"  {m.scale:>7} {m.checks:>7} " + " ".join(f"{m.phases[n] * 1000:9.1f}" for n in BENCH_PHASES)
+                     + f" {m.total * 1000:9.1f} {m.peak_bytes / 1e6:7.1f}")
+        base = by_scale.get(str(m.scale))
+        if base is not None:
+            total = sum(base.get(n, 0.0) for n in BENCH_PHASES)
+            lines.append(f"  {'base':>7} {base['checks']:>7} "
+                         + " ".join(f"{base.get(n, 0.0) * 1000:9.1f}" for n in BENCH_PHASES)
+                         + f" {total * 1000:9.1f} {base['peak_bytes'] / 1e6:7.1f}")
+    if cases:
+        lines += ["", "-" * 70, "PATHOLOGICAL INPUTS (ms at n and 4n; growth 1.0 = linear)", "-" * 70]
+        for c in cases:
+            lines.append(f"  {c.small * 1000:8.2f} {c.large * 1000:8.2f}  x{c.growth:4.1f}  {c.name}")
+    return "\n".join(lines)
+
+
+# ------------------------------------------------------------
+# Command line
+# ------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark verify_data.py on synthetic corpora and check regressions.")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="comma-separated block counts (default: 10,100,1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per scale; the median is kept (default: 3)")
+    parser.add_argument("--baselines", default=DEFAULT_BASELINES, help="baseline file (default: bench_baselines.json)")
+    parser.add_argument("--update-baselines", action="store_true", help="write this run's numbers as the baselines")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="allowed slowdown over baseline (default: 2.0)")
+    parser.add_argument("--memory-tolerance", type=float, default=1.25,
+                        help="allowed peak-memory growth over baseline (default: 1.25)")
+    parser.add_argument("--max-growth", type=float, default=2.0,
+                        help="allowed per-unit cost growth between sizes (default: 2.0)")
+    parser.add_argument("--floor-ms", type=float, default=5.0, help="ignore time differences below this (default: 5)")
+    parser.add_argument("--no-pathological", action="store_true", help="skip the pathological regex inputs")
+    parser.add_argument("--keep", metavar="DIR", help="write the generated corpora under DIR and keep them")
+    args = parser.parse_args(argv)
+
+    scales = sorted(int(s) for s in args.scales.split(","))
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.keep or tmp
+        measurements = []
+        for scale in scales:
+            corpus = write_corpus(scale, os.path.join(root, f"scale-{scale}"))
+            measurements.append(measure(corpus, args.repeat))
+    cases = [] if args.no_pathological else run_cases()
+
+    baselines = load_baselines(args.baselines)
+    print(render(measurements, cases, baselines))
+    if args.update_baselines:
+        with open(args.baselines, "w") as f:
+            json.dump(baseline_record(measurements, cases), f, indent=1)
+            f.write("\n")
+        print(f"\nwrote {args.baselines}")
+        return 0
+
+    failures = compare(measurements, cases, baselines, args.tolerance, args.memory_tolerance, args.max_growth,
+                       args.floor_ms / 1000)
+    if baselines is None:
+        print(f"\nno baselines at {args.baselines}; run with --update-baselines to record them")
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        return 1
+    print("\nOK: all thresholds met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
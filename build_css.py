@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+Prune the page's local stylesheets and icon pack down to what it uses.
+
+Every class, id and tag in the page is collected, together with the classes
+and ids static/js scripts toggle or query (classList.add('visible'),
+querySelector('.more-works-btn'), getElementById(...)). Each selector of
+bulma.min.css, index.css and fontawesome.all.min.css is kept only if every
+class, id and tag it names is in that set; @media/@supports blocks are pruned
+recursively, and @font-face/@keyframes survive only if a kept rule uses
+their family or animation name.
+
+Font Awesome icons (<i class="fas fa-copy">) are replaced by the inline SVG
+that fontawesome.all.min.js would have swapped in at runtime, read from the
+script's own icon packs, so the 1.2 MB script is dropped from the page.
+
+The pruned CSS is minified into static/css/site.<hash>.min.css and loaded
+without blocking render; the rules that match the first --fold elements of
+<body> are inlined in a <style> in <head>. Local files the page still
+references are copied next to the output page.
+
+    python build_css.py [index.html] [--out build]
+    python build_images.py && python build_css.py build/index.html
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sys
+from html.parser import HTMLParser
+
+ICON_SCRIPT = "static/js/fontawesome.all.min.js"
+ICON_PREFIXES = ("fas", "far", "fab")
+OUTPUT_CSS = "static/css/site.{hash}.min.css"
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "source", "track", "wbr"}
+
+
+# ------------------------------------------------------------
+# What the page uses
+# ------------------------------------------------------------
+
+class Usage:
+    """Tags, classes and ids that can appear in the document."""
+
+    def __init__(self):
+        self.tags = {"html", "body"}
+        self.classes = set()
+        self.ids = set()
+
+    def add_element(self, tag, attrs):
+        self.tags.add(tag.lower())
+        self.classes.update((attrs.get("class") or "").split())
+        if attrs.get("id"):
+            self.ids.add(attrs["id"])
+
+    def update(self, other):
+        self.tags |= other.tags
+        self.classes |= other.classes
+        self.ids |= other.ids
+
+
+class _PageScanner(HTMLParser):
+    """Tag spans, and usage of the whole page and of its first `fold` body elements."""
+
+    def __init__(self, source, fold):
+        super().__init__(convert_charrefs=True)
+        self.source = source
+        self.line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+        self.fold = fold
+        # (tag, start, end, attrs, above the fold); end tags are "/tag" with attrs None.
+        self.tags = []
+        self.usage = Usage()
+        self.critical = Usage()
+        self._depth = None
+        self._child = 0
+
+    def _start(self):
+        line, col = self.getpos()
+        return self.line_starts[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        start = self._start()
+        if self._depth is None or tag == "body":
+            in_fold = True
+            if tag == "body":
+                self._depth = 0
+        else:
+            if self._depth == 0:
+                self._child += 1
+            in_fold = self._child <= self.fold
+            if tag not in VOID_TAGS:
+                self._depth += 1
+        self.tags.append((tag, start, start + len(self.get_starttag_text()), a, in_fold))
+        self.usage.add_element(tag, a)
+        if in_fold:
+            self.critical.add_element(tag, a)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self._depth:
+            self._depth -= 1
+
+    def handle_endtag(self, tag):
+        start = self._start()
+        self.tags.append(("/" + tag, start, self.source.index(">", start) + 1, None, False))
+        if self._depth and tag != "body":
+            self._depth -= 1
+
+
+def scan_page(source, fold):
+    scanner = _PageScanner(source, fold)
+    scanner.feed(source)
+    scanner.close()
+    return scanner
+
+
+_JS_CLASS = re.compile(r"""classList\.(?:add|remove|toggle|contains)\(\s*(['"])([^'"]+)\1""")
+_JS_SELECTOR = re.compile(r"""querySelector(?:All)?\(\s*(['"])([^'"]+)\1""")
+_JS_ID = re.compile(r"""getElementById\(\s*(['"])([^'"]+)\1""")
+_JS_TAG = re.compile(r"""createElement\(\s*(['"])([a-zA-Z][\w-]*)\1""")
+
+
+def script_usage(source):
+    """Classes, ids and tags a script adds, removes, queries or creates."""
+    usage = Usage()
+    for m in _JS_CLASS.finditer(source):
+        usage.classes.update(m.group(2).split())
+    for m in _JS_SELECTOR.finditer(source):
+        selector = m.group(2)
+        usage.classes.update(_CLASS.findall(selector))
+        usage.ids.update(_ID.findall(selector))
+        usage.tags.update(t.lower() for t in re.findall(r"(?:^|[\s>+~,])([a-zA-Z][\w-]*)", selector))
+    for m in _JS_ID.finditer(source):
+        usage.ids.add(m.group(2))
+    for m in _JS_TAG.finditer(source):
+        usage.tags.add(m.group(2).lower())
+    return usage
+
+
+# ------------------------------------------------------------
+# CSS
+# ------------------------------------------------------------
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CLASS = re.compile(r"\.((?:\\.|[\w-])+)")
+_ID = re.compile(r"#((?:\\.|[\w-])+)")
+_TAG = re.compile(r"^([a-zA-Z][\w-]*)")
+_GROUP_RULES = ("@media", "@supports", "@layer", "@document", "@-moz-document")
+
+
+def _strip_comments(css):
+    # Comments never appear inside the strings of these stylesheets.
+    return _COMMENT.sub("", css)
+
+
+def blocks(css):
+    """Top-level (prelude, body) pairs; body is None for `@import ...;` statements."""
+    out = []
+    depth = 0
+    start = 0
+    quote = None
+    i = 0
+    while i < len(css):
+        ch = css[i]
+        if quote:
+            if ch == "\\":
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "{":
+            if depth == 0:
+                prelude = css[start:i].strip()
+                body_start = i + 1
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                out.append((prelude, css[body_start:i]))
+                start = i + 1
+        elif ch == ";" and depth == 0:
+            if css[start:i].strip():
+                out.append((css[start:i].strip(), None))
+            start = i + 1
+        i += 1
+    return out
+
+
+def _split_top(text, sep):
+    """Split on `sep` outside strings, parentheses and brackets."""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != "\\":
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _unescape(name):
+    return re.sub(r"\\(.)", r"\1", name)
+
+
+def selector_matches(selector, usage):
+    """False only when the selector names a class, id or tag the page never has."""
+    s = re.sub(r"\[[^\]]*\]", "", selector)
+    while True:
+        stripped = re.sub(r"\([^()]*\)", "", s)
+        if stripped == s:
+            break
+        s = stripped
+    s = re.sub(r"::?[\w-]+", "", s)
+    for compound in re.split(r"[\s>+~]+", s.strip()):
+        if not compound:
+            continue
+        if any(_unescape(c) not in usage.classes for c in _CLASS.findall(compound)):
+            return False
+        if any(_unescape(i) not in usage.ids for i in _ID.findall(compound)):
+            return False
+        tag = _TAG.match(compound)
+        if tag and tag.group(1).lower() not in usage.tags:
+            return False
+    return True
+
+
+def _declarations(body):
+    return [d for d in (part.strip() for part in _split_top(body, ";")) if d]
+
+
+def _referenced(rules, prop_names):
+    """Values of the given properties across kept rules, as one string to search."""
+    values = []
+    for _, body in rules:
+        for decl in _declarations(body):
+            name, _, value = decl.partition(":")
+            if name.strip().lower() in prop_names:
+                values.append(value)
+    return " ".join(values)
+
+
+def prune(css, usage):
+    """Rules of `css` that can match the page, as a nested (prelude, body) list."""
+    kept = []
+    for prelude, body in blocks(css):
+        if prelude.startswith("@"):
+            keyword = prelude.split(None, 1)[0].lower()
+            if body is not None and keyword in _GROUP_RULES:
+                inner = prune(body, usage)
+                if inner:
+                    kept.append((prelude, inner))
+            else:
+                kept.append((prelude, body))
+            continue
+        selectors = [sel for sel in _split_top(prelude, ",") if selector_matches(sel, usage)]
+        if selectors:
+            kept.append((",".join(selectors), body))
+    return kept
+
+
+def _flat(rules):
+    for prelude, body in rules:
+        if isinstance(body, list):
+            yield from _flat(body)
+        elif not prelude.startswith("@"):
+            yield prelude, body
+
+
+def drop_unreferenced(rules, used_rules=None):
+    """Remove @font-face and @keyframes that no kept rule refers to."""
+    used_rules = list(_flat(rules)) if used_rules is None else used_rules
+    families = _referenced(used_rules, {"font-family", "font"})
+    animations = _referenced(used_rules, {"animation", "animation-name", "-webkit-animation",
+                                          "-webkit-animation-name"})
+    kept = []
+    for prelude, body in rules:
+        keyword = prelude.split(None, 1)[0].lower() if prelude.startswith("@") else ""
+        if keyword == "@font-face":
+            family = re.search(r"font-family\s*:\s*(['\"]?)([^;'\"]+)\1", body)
+            if family and family.group(2).strip() not in families:
+                continue
+        elif keyword.endswith("keyframes"):
+            name = prelude.split(None, 1)[1].strip().strip("'\"")
+            if not re.search(r"(?<![\w-])" + re.escape(name) + r"(?![\w-])", animations):
+                continue
+        elif isinstance(body, list):
+            body = drop_unreferenced(body, used_rules)
+            if not body:
+                continue
+        kept.append((prelude, body))
+    return kept
+
+
+def _minify_selector(selector):
+    return re.sub(r"\s*([,>+~])\s*", r"\1", re.sub(r"\s+", " ", selector.strip()))
+
+
+def _minify_body(body):
+    decls = []
+    for decl in _declarations(body):
+        name, sep, value = decl.partition(":")
+        value = re.sub(r"\s+", " ", value.strip())
+        value = re.sub(r"\s*,\s*", ",", value)
+        value = re.sub(r"\s*!important", "!important", value)
+        decls.append(f"{name.strip()}{sep}{value}")
+    return ";".join(decls)
+
+
+def serialize(rules):
+    """Minified CSS text of a (prelude, body) tree."""
+    out = []
+    for prelude, body in rules:
+        if body is None:
+            out.append(re.sub(r"\s+", " ", prelude) + ";")
+        elif isinstance(body, list):
+            out.append(re.sub(r"\s+", " ", prelude) + "{" + serialize(body) + "}")
+        elif prelude.startswith("@") and "{" in body:
+            # @keyframes: a block of selector/body pairs.
+            inner = "".join(f"{_minify_selector(p)}{{{_minify_body(b)}}}" for p, b in blocks(body))
+            out.append(re.sub(r"\s+", " ", prelude) + "{" + inner + "}")
+        elif prelude.startswith("@"):
+            out.append(re.sub(r"\s+", " ", prelude) + "{" + _minify_body(body) + "}")
+        else:
+            out.append(_minify_selector(prelude) + "{" + _minify_body(body) + "}")
+    return "".join(out)
+
+
+# ------------------------------------------------------------
+# Icons
+# ------------------------------------------------------------
+
+_FA_WIDTH_CLASS = re.compile(r"fa-(\dx|lg|xs|sm|fw|w-\d+|spin|pulse|border|inverse|pull-(left|right)|li|ul"
+                             r"|stack(-\dx)?|rotate-\d+|flip-\w+)$")
+
+
+def icon_packs(script):
+    """{prefix: (start, end)} spans of each icon pack object in fontawesome.all.min.js."""
+    packs = {}
+    for m in re.finditer(r'\bM\("(fa[a-z])",(\w)\)', script):
+        start = script.rfind(f"var {m.group(2)}={{", 0, m.start())
+        if start >= 0:
+            packs[m.group(1)] = (start, m.start())
+    return packs
+
+
+def icon_css(script):
+    """The stylesheet the script injects at runtime for its inline SVGs."""
+    m = re.search(r'="(svg:not\(:root\)\.svg-inline--fa[^"]*)"', script)
+    return m.group(1) if m else ""
+
+
+def find_icon(script, span, name):
+    """(width, height, path) of one icon, or None."""
+    key = f'(?:"{name}"|{name})' if re.fullmatch(r"[A-Za-z_$][\w$]*", name) else f'"{name}"'
+    pattern = re.compile(r"[{,]" + key + r':\[(\d+),(\d+),\[[^\]]*\],"[0-9a-f]+","([^"]*)"\]')
+    m = pattern.search(script, *span)
+    return (int(m.group(1)), int(m.group(2)), m.group(3)) if m else None
+
+
+def _icon_name(classes):
+    prefix = next((c for c in classes if c in ICON_PREFIXES), None)
+    names = [c[3:] for c in classes if c.startswith("fa-") and not _FA_WIDTH_CLASS.match(c)]
+    return (prefix, names[0]) if prefix and names else None
+
+
+def icon_svg(prefix, name, width, height, path, classes):
+    extra = [c for c in classes if c not in ICON_PREFIXES and c != f"fa-{name}"]
+    cls = " ".join([f"svg-inline--fa fa-{name} fa-w-{round(width / height * 16)}"] + extra)
+    return (f'<svg class="{cls}" aria-hidden="true" focusable="false" data-prefix="{prefix}" '
+            f'data-icon="{name}" role="img" xmlns="http://www.w3.org/2000/svg" '
+            f'viewBox="0 0 {width} {height}"><path fill="currentColor" d="{path}"></path></svg>')
+
+
+def inline_icons(scanned, script):
+    """Edits replacing each <i class="fas fa-..."></i> with SVG, and the icons not found."""
+    packs = icon_packs(script)
+    edits = []
+    missing = []
+    for i, (tag, start, _, attrs, _) in enumerate(scanned.tags):
+        if tag != "i":
+            continue
+        classes = (attrs.get("class") or "").split()
+        icon = _icon_name(classes)
+        if icon is None:
+            continue
+        found = find_icon(script, packs[icon[0]], icon[1]) if icon[0] in packs else None
+        if found is None:
+            missing.append(" ".join(icon))
+            continue
+        close = next(t for t in scanned.tags[i + 1:] if t[0] == "/i")
+        edits.append((start, close[2], icon_svg(icon[0], icon[1], *found, classes)))
+    return edits, missing
+
+
+# ------------------------------------------------------------
+# Build
+# ------------------------------------------------------------
+
+class Page:
+    """Resolves local URLs of a page against its own directory, then an asset root."""
+
+    def __init__(self, path, asset_root):
+        self.path = path
+        self.dir = os.path.dirname(os.path.abspath(path))
+        self.asset_root = os.path.abspath(asset_root)
+
+    def local(self, url):
+        if not url or _EXTERNAL.match(url):
+            return None
+        url = url.split("#")[0].split("?")[0]
+        for base in (self.dir, self.asset_root):
+            path = os.path.join(base, url)
+            if os.path.isfile(path):
+                return path
+        return None
+
+
+_EXTERNAL = re.compile(r"^([a-z][a-z0-9+.-]*:|/|#)", re.I)
+
+
+def _apply(source, edits):
+    pieces = []
+    last = 0
+    for start, end, text in sorted(edits):
+        pieces.append(source[last:start])
+        pieces.append(text)
+        last = end
+    pieces.append(source[last:])
+    return "".join(pieces)
+
+
+def _whole_line(source, start, end):
+    """Widen a tag's span to its whole line when nothing else is on it."""
+    line_start = source.rfind("\n", 0, start) + 1
+    line_end = source.find("\n", end)
+    line_end = len(source) if line_end < 0 else line_end + 1
+    if source[line_start:start].strip() or source[end:line_end].strip():
+        return start, end
+    return line_start, line_end
+
+
+def _rebase_urls(css, css_path, page):
+    """Rewrite url(...) in a stylesheet for the combined file written under static/css/."""
+    out_dir = os.path.join(page.asset_root, os.path.dirname(OUTPUT_CSS))
+
+    def fix(m):
+        url = m.group(2)
+        if _EXTERNAL.match(url) or url.startswith("data:"):
+            return m.group(0)
+        target = os.path.normpath(os.path.join(os.path.dirname(css_path), url))
+        return f"url({os.path.relpath(target, out_dir)})"
+    return re.sub(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""", fix, css)
+
+
+def build(page_path, out_root, asset_root=".", fold=3, keep=(), log=print):
+    with open(page_path, "r") as f:
+        source = f.read()
+    page = Page(page_path, asset_root)
+
+    # Icons first, so the rest of the build sees the page as it will be served.
+    icon_script = None
+    extra_css = ""
+    scanned = scan_page(source, fold)
+    for tag, start, end, attrs, _ in scanned.tags:
+        if tag == "script" and (attrs.get("src") or "").endswith(os.path.basename(ICON_SCRIPT)):
+            icon_script = (start, page.local(attrs["src"]))
+    inlined, missing = 0, []
+    if icon_script and icon_script[1]:
+        with open(icon_script[1], "r") as f:
+            script = f.read()
+        edits, missing = inline_icons(scanned, script)
+        inlined = len(edits)
+        if not missing:
+            close = source.index("</script>", icon_script[0]) + len("</script>")
+            edits.append((*_whole_line(source, icon_script[0], close), ""))
+            extra_css = icon_css(script)
+        source = _apply(source, edits)
+        scanned = scan_page(source, fold)
+
+    usage, critical = scanned.usage, scanned.critical
+    stylesheets = []
+    for tag, start, end, attrs, _ in scanned.tags:
+        if tag == "link" and "stylesheet" in (attrs.get("rel") or "").lower().split():
+            path = page.local(attrs.get("href"))
+            if path:
+                stylesheets.append((start, end, path))
+        elif tag == "script" and page.local(attrs.get("src")):
+            with open(page.local(attrs["src"]), "r") as f:
+                js = script_usage(f.read())
+            usage.update(js)
+            critical.update(js)
+    usage.classes.update(keep)
+    critical.classes.update(keep)
+    if not stylesheets:
+        sys.exit(f"{page_path}: no local stylesheets to prune")
+
+    # Stylesheets: prune, minify, hash-name, inline the critical part.
+    sheets = []
+    before = 0
+    for _, _, path in stylesheets:
+        with open(path, "r") as f:
+            css = f.read()
+        before += len(css.encode("utf-8"))
+        sheets.append(_rebase_urls(_strip_comments(css), path, page))
+    if extra_css:
+        sheets.append(extra_css)
+    full_css = serialize(drop_unreferenced([r for css in sheets for r in prune(css, usage)]))
+    critical_css = serialize(drop_unreferenced([r for css in sheets for r in prune(css, critical)]))
+    css_url = OUTPUT_CSS.format(hash=hashlib.sha256(full_css.encode("utf-8")).hexdigest()[:10])
+    os.makedirs(os.path.join(out_root, os.path.dirname(css_url)), exist_ok=True)
+    with open(os.path.join(out_root, css_url), "w") as f:
+        f.write(full_css)
+
+    head = (f"<style>{critical_css}</style>\n"
+            f'  <link rel="preload" href="{css_url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f'  <noscript><link rel="stylesheet" href="{css_url}"></noscript>')
+    edits = [(stylesheets[0][0], stylesheets[0][1], head)]
+    edits += [(*_whole_line(source, start, end), "") for start, end, _ in stylesheets[1:]]
+    html = _apply(source, edits)
+
+    out_page = os.path.join(out_root, os.path.basename(page_path))
+    with open(out_page, "w") as f:
+        f.write(html)
+    copied = copy_referenced(html, full_css, out_root, page, css_url)
+
+    log(f"stylesheets: {len(stylesheets)} files, {before:,} -> {len(full_css.encode('utf-8')):,} bytes "
+        f"({len(critical_css.encode('utf-8')):,} inlined as critical)")
+    if icon_script:
+        log(f"icons: {inlined} inlined as SVG, " + (f"not found: {', '.join(missing)} (icon script kept)"
+                                                     if missing else "icon script removed"))
+    log(f"copied {copied} referenced files into {out_root}")
+    return out_page
+
+
+def copy_referenced(html, css, out_root, page, css_url):
+    """Copy local files the output page and stylesheet refer to; return how many were copied."""
+    urls = set(re.findall(r"""(?:src|href|poster|content)\s*=\s*["']([^"']+)["']""", html))
+    for srcset in re.findall(r"""srcset\s*=\s*["']([^"']+)["']""", html):
+        urls.update(part.strip().split()[0] for part in srcset.split(",") if part.strip())
+    css_dir = os.path.dirname(css_url)
+    urls.update(os.path.normpath(os.path.join(css_dir, u))
+                for u in re.findall(r"""url\(\s*['"]?([^'")]+?)['"]?\s*\)""", css)
+                if not _EXTERNAL.match(u) and not u.startswith("data:"))
+    copied = 0
+    for url in sorted(urls):
+        target = os.path.join(out_root, url.split("#")[0].split("?")[0])
+        if os.path.exists(target):
+            continue
+        path = page.local(url)
+        if path is None:
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(path, target)
+        copied += 1
+    return copied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prune unused CSS and icons, inline critical CSS, write to build/.")
+    parser.add_argument("page", nargs="?", default="index.html", help="source page (default: index.html)")
+    parser.add_argument("--out", default="build", help="output directory (default: build)")
+    parser.add_argument("--assets", default=".", help="where static/ lives if not next to the page (default: .)")
+    parser.add_argument("--fold", type=int, default=3,
+                        help="top-level <body> elements treated as above the fold (default: 3)")
+    parser.add_argument("--keep", action="append", default=[], metavar="CLASS",
+                        help="class to keep even if nothing uses it (repeatable)")
+    args = parser.parse_args(argv)
+
+    out_page = build(args.page, args.out, args.assets, args.fold, args.keep)
+    print(f"wrote {out_page}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Responsive image build: resized AVIF/WebP variants with content-hash names.
+
+Needs Pillow, which only this build step uses:  pip install Pillow
+AVIF is produced when the installed Pillow can encode it and skipped otherwise.
+
+Every <img src="static/images/..."> in the page gets variants at each
+configured width up to its own width, in AVIF, WebP and its source format.
+Variants are named <stem>-<width>w.<hash>.<ext>, where hash is taken from the
+variant's bytes, so they can be cached forever. The tag becomes a <picture>
+with one <source> per modern format and an <img> fallback that carries
+srcset, sizes, width/height and decoding="async"; every image after the
+first --eager ones also gets loading="lazy".
+
+A manifest keyed by the source file's hash (and the build settings) lets a
+rerun skip every image that has not changed.
+
+    python build_images.py [index.html] [--out build]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from html.parser import HTMLParser
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+WIDTHS = (480, 960, 1440, 1920)
+IMAGE_PREFIX = "static/images/"
+OUTPUT_SUBDIR = "static/images/r"
+MANIFEST_NAME = "manifest.json"
+
+# Rendered width per class, from static/css/index.css; anything else spans the container.
+SIZES_BY_CLASS = {
+    "lab-logo": "230px",
+    "framework-img": "(max-width: 768px) 100vw, 550px",
+    "figure-img": "(max-width: 768px) 100vw, 480px",
+}
+DEFAULT_SIZES = "(max-width: 1024px) 100vw, 960px"
+
+MIME = {"avif": "image/avif", "webp": "image/webp", "png": "image/png", "jpeg": "image/jpeg"}
+EXTENSIONS = {"avif": "avif", "webp": "webp", "png": "png", "jpeg": "jpg"}
+SAVE_OPTIONS = {
+    "avif": {"quality": 60, "speed": 6},
+    "webp": {"quality": 80, "method": 4},
+    "png": {"optimize": True},
+    "jpeg": {"quality": 85, "progressive": True, "optimize": True},
+}
+
+
+def require_pillow():
+    if Image is None:
+        sys.exit("build_images.py needs Pillow: pip install Pillow")
+
+
+def modern_formats():
+    formats = []
+    if features.check("avif"):
+        formats.append("avif")
+    if features.check("webp"):
+        formats.append("webp")
+    return formats
+
+
+def settings_key(widths, formats):
+    """Changes to widths, formats or encoder options invalidate manifest entries."""
+    raw = json.dumps([list(widths), formats, SAVE_OPTIONS], sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:12]
+
+
+# ------------------------------------------------------------
+# Page scanning
+# ------------------------------------------------------------
+
+class _ImgCollector(HTMLParser):
+    """<img> tags with their exact source span."""
+
+    def __init__(self, source):
+        super().__init__(convert_charrefs=True)
+        self.line_starts = [0]
+        for i, ch in enumerate(source):
+            if ch == "\n":
+                self.line_starts.append(i + 1)
+        self.images = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "img":
+            return
+        line, col = self.getpos()
+        start = self.line_starts[line - 1] + col
+        self.images.append((start, start + len(self.get_starttag_text()), dict(attrs)))
+
+    handle_startendtag = handle_starttag
+
+
+def find_images(source):
+    collector = _ImgCollector(source)
+    collector.feed(source)
+    collector.close()
+    return collector.images
+
+
+# ------------------------------------------------------------
+# Variants
+# ------------------------------------------------------------
+
+def _encode(image, fmt):
+    if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buf = io.BytesIO()
+    image.save(buf, fmt.upper(), **SAVE_OPTIONS[fmt])
+    return buf.getvalue()
+
+
+def build_variants(source_path, out_dir, widths, formats):
+    """Write every variant of one image; return its manifest entry."""
+    with Image.open(source_path) as opened:
+        opened.load()
+        image = opened
+        fallback = "jpeg" if opened.format == "JPEG" else "png"
+        width, height = image.size
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        targets = sorted({w for w in widths if w < width} | {min(width, max(widths))})
+        variants = []
+        for w in targets:
+            h = round(height * w / width)
+            resized = image if w == width else image.resize((w, h), Image.LANCZOS)
+            for fmt in formats + [fallback]:
+                data = _encode(resized, fmt)
+                digest = hashlib.sha256(data).hexdigest()[:10]
+                name = f"{stem}-{w}w.{digest}.{EXTENSIONS[fmt]}"
+                path = os.path.join(out_dir, name)
+                if not os.path.exists(path):
+                    with open(path, "wb") as f:
+                        f.write(data)
+                variants.append({"format": fmt, "width": w, "height": h, "file": name, "bytes": len(data)})
+    return {"width": width, "height": height, "fallback": fallback, "variants": variants}
+
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# ------------------------------------------------------------
+# Markup
+# ------------------------------------------------------------
+
+def _srcset(entry, fmt, url_prefix):
+    return ", ".join(f"{url_prefix}{v['file']} {v['width']}w"
+                     for v in entry["variants"] if v["format"] == fmt)
+
+
+def picture_markup(attrs, entry, sizes, lazy, url_prefix):
+    fallback = [v for v in entry["variants"] if v["format"] == entry["fallback"]]
+    largest = fallback[-1]
+    formats = []
+    for v in entry["variants"]:
+        if v["format"] != entry["fallback"] and v["format"] not in formats:
+            formats.append(v["format"])
+    img = dict(attrs)
+    img["src"] = url_prefix + largest["file"]
+    img["srcset"] = _srcset(entry, entry["fallback"], url_prefix)
+    img["sizes"] = sizes
+    img["width"] = str(entry["width"])
+    img["height"] = str(entry["height"])
+    img["decoding"] = "async"
+    if lazy:
+        img["loading"] = "lazy"
+    img_tag = "<img " + " ".join(f'{k}="{escape(v, quote=True)}"' for k, v in img.items() if v is not None) + ">"
+    sources = "".join(f'<source type="{MIME[fmt]}" srcset="{_srcset(entry, fmt, url_prefix)}" sizes="{sizes}">'
+                      for fmt in formats)
+    return f"<picture>{sources}{img_tag}</picture>"
+
+
+def sizes_for(attrs):
+    for cls in (attrs.get("class") or "").split():
+        if cls in SIZES_BY_CLASS:
+            return SIZES_BY_CLASS[cls]
+    return DEFAULT_SIZES
+
+
+# ------------------------------------------------------------
+# Build
+# ------------------------------------------------------------
+
+def build(page_path, out_root, widths=WIDTHS, eager=2, jobs=None, log=print):
+    require_pillow()
+    with open(page_path, "r") as f:
+        source = f.read()
+    page_dir = os.path.dirname(os.path.abspath(page_path))
+    out_dir = os.path.join(out_root, OUTPUT_SUBDIR)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    formats = modern_formats()
+    settings = settings_key(widths, formats)
+    images = [(start, end, attrs) for start, end, attrs in find_images(source)
+              if (attrs.get("src") or "").startswith(IMAGE_PREFIX)]
+
+    # Source hash -> entry; only images whose hash or settings are new get rebuilt.
+    hashes = {}
+    todo = {}
+    for _, _, attrs in images:
+        path = os.path.join(page_dir, attrs["src"])
+        digest = _file_hash(path)
+        hashes[attrs["src"]] = digest
+        entry = manifest.get(digest)
+        fresh = (entry is not None and entry.get("settings") == settings
+                 and all(os.path.exists(os.path.join(out_dir, v["file"])) for v in entry["variants"]))
+        if not fresh:
+            todo[digest] = path
+
+    if todo:
+        if jobs == 1 or len(todo) == 1:
+            built = {digest: build_variants(path, out_dir, widths, formats) for digest, path in todo.items()}
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {digest: pool.submit(build_variants, path, out_dir, widths, formats)
+                           for digest, path in todo.items()}
+                built = {digest: future.result() for digest, future in futures.items()}
+        for digest, entry in built.items():
+            entry["source"] = os.path.relpath(todo[digest], page_dir)
+            entry["settings"] = settings
+            manifest[digest] = entry
+    log(f"{len(images)} images, {len(todo)} rebuilt, {len(images) - len(todo)} unchanged")
+
+    url_prefix = OUTPUT_SUBDIR + "/"
+    pieces = []
+    last = 0
+    for i, (start, end, attrs) in enumerate(images):
+        entry = manifest[hashes[attrs["src"]]]
+        pieces.append(source[last:start])
+        pieces.append(picture_markup(attrs, entry, sizes_for(attrs), i >= eager, url_prefix))
+        last = end
+    pieces.append(source[last:])
+
+    out_page = os.path.join(out_root, os.path.basename(page_path))
+    with open(out_page, "w") as f:
+        f.write("".join(pieces))
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return out_page, manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build responsive, content-hashed image variants and rewrite <img> tags.")
+    parser.add_argument("page", nargs="?", default="index.html", help="source page (default: index.html)")
+    parser.add_argument("--out", default="build", help="output root for the page and variants (default: build)")
+    parser.add_argument("--widths", default=",".join(map(str, WIDTHS)), help="comma-separated variant widths")
+    parser.add_argument("--eager", type=int, default=2, help="images above the fold, loaded eagerly (default: 2)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="encoder processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    widths = tuple(sorted(int(w) for w in args.widths.split(",")))
+    out_page, _ = build(args.page, args.out, widths, args.eager, args.jobs)
+    print(f"wrote {out_page}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Check every link, anchor and asset reference of one or more pages.
+
+Offline, for each page: in-page anchors (#BibTeX) must name an id or
+<a name> on the target page, and relative hrefs/srcs/srcsets must exist on
+disk ("/..." paths relative to --root, by default the page's directory). External URLs are collected across all pages, de-duplicated, and
+checked concurrently on asyncio with a bounded pool of keep-alive
+connections (a global limit plus a per-host limit). Each URL gets a HEAD,
+then a GET when HEAD fails or is refused; up to five redirects
+are followed, and a loop or a longer chain counts as broken.
+
+Results are cached in .verify_cache/links.json with the ETag and
+Last-Modified of each response. Within --ttl seconds a cached result is
+reused without any request; after that the URL is re-checked with
+If-None-Match/If-Modified-Since, and a 304 renews the entry.
+
+    python check_links.py index.html [more pages...] [--offline] [--ttl 86400] [--root site/]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import sys
+import time
+from dataclasses import asdict, dataclass
+from html.parser import HTMLParser
+from urllib.parse import unquote, urljoin, urlsplit
+
+from paper_index import DEFAULT_CACHE_DIR
+
+CACHE_NAME = "links.json"
+USER_AGENT = "iso-bench-link-check/1.0"
+MAX_REDIRECTS = 5
+# HEAD answers that say nothing about GET, so GET is tried before calling the link broken.
+HEAD_FALLBACK = {400, 403, 404, 405, 406, 429, 500, 501, 502, 503}
+NO_BODY = {204, 304}
+
+
+# ------------------------------------------------------------
+# Page links
+# ------------------------------------------------------------
+
+@dataclass
+class Link:
+    page: str
+    line: int
+    tag: str
+    url: str
+
+
+class _LinkCollector(HTMLParser):
+    ATTRS = {"a": ("href",), "link": ("href",), "script": ("src",), "img": ("src", "srcset"),
+             "source": ("src", "srcset"), "video": ("src", "poster"), "audio": ("src",),
+             "iframe": ("src",), "embed": ("src",), "object": ("data",)}
+
+    def __init__(self, page):
+        super().__init__(convert_charrefs=True)
+        self.page = page
+        self.links = []
+        self.anchors = set()
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if a.get("id"):
+            self.anchors.add(a["id"])
+        if tag == "a" and a.get("name"):
+            self.anchors.add(a["name"])
+        line = self.getpos()[0]
+        for attr in self.ATTRS.get(tag, ()):
+            value = (a.get(attr) or "").strip()
+            if not value:
+                continue
+            urls = [part.strip().split()[0] for part in value.split(",") if part.strip()] \
+                if attr == "srcset" else [value]
+            self.links.extend(Link(self.page, line, tag, url) for url in urls)
+
+    handle_startendtag = handle_starttag
+
+
+def scan_page(path):
+    """(links, anchor names) of one page."""
+    with open(path, "r") as f:
+        source = f.read()
+    collector = _LinkCollector(path)
+    collector.feed(source)
+    collector.close()
+    return collector.links, collector.anchors
+
+
+def is_external(url):
+    return urlsplit(url).scheme in ("http", "https") or url.startswith("//")
+
+
+def check_local(link, anchors_of, root=None):
+    """Problem with an in-page or relative link, or None when it resolves.
+
+    Root-relative paths ("/static/x.png") resolve against `root`, the site
+    root on disk, which defaults to the page's directory.
+    """
+    parts = urlsplit(link.url)
+    if parts.scheme in ("mailto", "tel", "javascript", "data"):
+        return None
+    page_dir = os.path.dirname(os.path.abspath(link.page))
+    path = unquote(parts.path)
+    if path.startswith("/"):
+        base, path = os.path.abspath(root) if root else page_dir, path.lstrip("/")
+    else:
+        base = page_dir
+    target = os.path.normpath(os.path.join(base, path)) if parts.path else os.path.abspath(link.page)
+    if path and not os.path.exists(target):
+        return f"missing file {os.path.relpath(target)}"
+    if parts.fragment and target.endswith((".html", ".htm")):
+        anchors = anchors_of(target)
+        if parts.fragment not in anchors:
+            return f"no id or name '{parts.fragment}' in {os.path.relpath(target)}"
+    return None
+
+
+# ------------------------------------------------------------
+# HTTP
+# ------------------------------------------------------------
+
+class Pool:
+    """Keep-alive connections per (scheme, host, port), bounded globally and per host."""
+
+    def __init__(self, limit=16, per_host=4, timeout=10.0):
+        self.limit = asyncio.Semaphore(limit)
+        self.per_host = per_host
+        self.timeout = timeout
+        self.hosts = {}
+        self.idle = {}
+        self.ssl = ssl.create_default_context()
+
+    def _host_limit(self, key):
+        if key not in self.hosts:
+            self.hosts[key] = asyncio.Semaphore(self.per_host)
+        return self.hosts[key]
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        return await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self.ssl if scheme == "https" else None,
+                                    server_hostname=host if scheme == "https" else None),
+            self.timeout)
+
+    async def request(self, method, url, headers=()):
+        """(status, lower-cased headers) of one request; bodies are never read."""
+        parts = urlsplit(url)
+        scheme = parts.scheme or "https"
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host = parts.netloc.rsplit("@", 1)[-1]
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host}", f"User-Agent: {USER_AGENT}",
+                 "Accept: */*", "Connection: keep-alive"] + [f"{k}: {v}" for k, v in headers]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        async with self.limit, self._host_limit(key):
+            for attempt in range(2):
+                idle = self.idle.get(key)
+                reused = bool(idle)
+                conn = idle.pop() if idle else await self._connect(key)
+                try:
+                    status, response = await asyncio.wait_for(self._exchange(conn, request), self.timeout)
+                except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    conn[1].close()
+                    if reused and attempt == 0:
+                        # The server closed an idle connection; retry once on a fresh one.
+                        continue
+                    raise
+                except asyncio.TimeoutError:
+                    conn[1].close()
+                    raise
+                reusable = ((method == "HEAD" or status in NO_BODY or status < 200)
+                            and response.get("connection", "").lower() != "close")
+                if reusable:
+                    self.idle.setdefault(key, []).append(conn)
+                else:
+                    conn[1].close()
+                return status, response
+
+    @staticmethod
+    async def _exchange(conn, request):
+        reader, writer = conn
+        writer.write(request)
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        for line in header_lines:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+    def close(self):
+        for conns in self.idle.values():
+            for _, writer in conns:
+                writer.close()
+        self.idle.clear()
+
+
+@dataclass
+class Result:
+    url: str
+    ok: bool
+    status: int = None
+    final_url: str = None
+    method: str = None
+    error: str = None
+    etag: str = None
+    last_modified: str = None
+    checked_at: float = 0.0
+    cached: str = None  # "fresh" (no request), "revalidated" (304), or None
+
+
+async def _follow(pool, method, url, headers):
+    """(status, headers, final url, error); error is set when the redirect chain never ends."""
+    seen = {url}
+    for _ in range(MAX_REDIRECTS + 1):
+        status, response = await pool.request(method, url, headers)
+        if status not in (301, 302, 303, 307, 308) or not response.get("location"):
+            return status, response, url, None
+        url = urljoin(url, response["location"])
+        if url in seen:
+            return status, response, url, f"redirect loop at {url}"
+        seen.add(url)
+        headers = ()
+    return status, response, url, f"too many redirects (more than {MAX_REDIRECTS})"
+
+
+async def check_url(pool, url, cached=None):
+    conditional = []
+    if cached is not None and cached.ok:
+        if cached.etag:
+            conditional.append(("If-None-Match", cached.etag))
+        if cached.last_modified:
+            conditional.append(("If-Modified-Since", cached.last_modified))
+    error = None
+    result = None
+    for method in ("HEAD", "GET"):
+        try:
+            status, response, final, error = await _follow(pool, method, url, conditional)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ValueError, IndexError) as e:
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            continue
+        if error is not None:
+            return Result(url, False, status, final, method, error=error, checked_at=time.time())
+        if status == 304 and cached is not None:
+            return Result(**{**asdict(cached), "checked_at": time.time(), "cached": "revalidated"})
+        result = Result(url, 200 <= status < 400, status, final, method,
+                        etag=response.get("etag"), last_modified=response.get("last-modified"),
+                        checked_at=time.time())
+        if result.ok or method == "GET" or status not in HEAD_FALLBACK:
+            return result
+    return result or Result(url, False, error=error, checked_at=time.time())
+
+
+# ------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------
+
+def load_cache(path):
+    try:
+        with open(path, "r") as f:
+            return {url: Result(**entry) for url, entry in json.load(f).items()}
+    except (OSError, ValueError, TypeError):
+        return {}
+
+
+def save_cache(path, results):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({url: {**asdict(r), "cached": None} for url, r in sorted(results.items())}, f, indent=1)
+    os.replace(tmp, path)
+
+
+async def check_external(urls, cache, ttl, limit=16, per_host=4, timeout=10.0):
+    """{url: Result}; fresh cache entries are returned without a request."""
+    pool = Pool(limit, per_host, timeout)
+    now = time.time()
+    results = {}
+    pending = []
+    for url in urls:
+        cached = cache.get(url)
+        if cached is not None and cached.ok and now - cached.checked_at < ttl:
+            results[url] = Result(**{**asdict(cached), "cached": "fresh"})
+        else:
+            pending.append(url)
+    try:
+        checked = await asyncio.gather(*(check_url(pool, url, cache.get(url)) for url in pending))
+    finally:
+        pool.close()
+    results.update(zip(pending, checked))
+    return results
+
+
+# ------------------------------------------------------------
+# Report
+# ------------------------------------------------------------
+
+def check_pages(pages, offline=False, cache_dir=DEFAULT_CACHE_DIR, ttl=86400.0, limit=16, per_host=4,
+                timeout=10.0, root=None):
+    """(problems, external results): problems are (Link, message) pairs."""
+    anchors = {}
+
+    def anchors_of(path):
+        if path not in anchors:
+            anchors[path] = scan_page(path)[1] if os.path.exists(path) else set()
+        return anchors[path]
+
+    problems = []
+    external = {}
+    for page in pages:
+        links, page_anchors = scan_page(page)
+        anchors[os.path.abspath(page)] = page_anchors
+        for link in links:
+            if is_external(link.url):
+                url = "https:" + link.url if link.url.startswith("//") else link.url
+                external.setdefault(url.split("#")[0], []).append(link)
+            else:
+                message = check_local(link, anchors_of, root)
+                if message:
+                    problems.append((link, message))
+    if offline or not external:
+        return problems, {}
+
+    cache_path = os.path.join(cache_dir, CACHE_NAME) if cache_dir else None
+    cache = load_cache(cache_path) if cache_path else {}
+    results = asyncio.run(check_external(list(external), cache, ttl if cache_path else 0, limit, per_host,
+                                         timeout))
+    if cache_path:
+        cache.update(results)
+        save_cache(cache_path, cache)
+    for url, result in results.items():
+        if not result.ok:
+            message = result.error or (f"HTTP {result.status}" if result.status else "no response")
+            problems.extend((link, f"{message} ({url})") for link in external[url])
+    return problems, results
+
+
+def render(problems, results, offline=False):
+    lines = []
+    for link, message in sorted(problems, key=lambda p: (p[0].page, p[0].line)):
+        lines.append(f"{link.page}:{link.line}: <{link.tag}> {link.url}: {message}")
+    if offline:
+        lines.append(f"external URLs not checked (offline); {len(problems)} problems")
+        return "\n".join(lines)
+    fresh = sum(1 for r in results.values() if r.cached == "fresh")
+    revalidated = sum(1 for r in results.values() if r.cached == "revalidated")
+    lines.append(f"{len(results)} external URLs ({fresh} from cache, {revalidated} revalidated, "
+                 f"{len(results) - fresh - revalidated} fetched); {len(problems)} problems")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check links, anchors and asset paths in the given pages.")
+    parser.add_argument("pages", nargs="+", help="HTML pages to check")
+    parser.add_argument("--offline", action="store_true", help="only check anchors and local paths")
+    parser.add_argument("--ttl", type=float, default=86400.0,
+                        help="seconds a cached result is trusted without a request (default: 86400)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="where links.json is kept")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write the cache")
+    parser.add_argument("--connections", type=int, default=16, help="concurrent requests (default: 16)")
+    parser.add_argument("--per-host", type=int, default=4, help="concurrent requests per host (default: 4)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per request (default: 10)")
+    parser.add_argument("--root", help="site root for links starting with '/' (default: each page's directory)")
+    args = parser.parse_args(argv)
+
+    problems, results = check_pages(args.pages, args.offline, None if args.no_cache else args.cache_dir,
+                                    args.ttl, args.connections, args.per_host, args.timeout, args.root)
+    print(render(problems, results, args.offline))
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
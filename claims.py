@@ -0,0 +1,549 @@
+"""
+Declarative claims and the planner that batches their extraction.
+
+A claims file lists report sections, each holding claims that compare a
+"website" value against a "paper" value. A value is described by a source:
+
+    {"value": "0%"}                                     constant
+    {"literal": ["54 tasks", ...], "value": "54"}       presence of any needle
+    {"chart": id, "dataset": name, "label": agent}      Chart.js data point
+    {"section_table": heading, "row": key, "column": n} page table cell
+    {"table": caption, "row": key, "group": g, "column": n}
+                                                        paper table cell, n-th
+                                                        cell right of `row`
+    {"formula": "(Q1 + Q3) / 39 * 100", "inputs": {"Q1": source, ...}, "round": 1}
+
+Sources read the document named by their side unless they set "doc".
+Claims with "for_each" are expanded over the lists in "dimensions", with
+"{agent.name}"-style templates filled in.
+
+Derived metrics are checked as identities over a metric cube instead of as
+per-cell claims. The top-level "cube" maps each metric name to a source per
+document (templated on {agent.*} and {project.*}); a section's "identities"
+then compare whole columns:
+
+    {"description": "quadrant sum", "lhs": "Q1 + Q2 + Q3 + Q4", "rhs": "tasks"}
+                                within each document in "docs"
+    {"description": "Correct Target", "expr": "(Q1 + Q2) / tasks * 100"}
+                                website column against paper column
+
+with "round": n and/or "tolerance": t as the comparison rule (see
+consistency.py) and an optional "projects" filter on the reported cells.
+
+compile_plan() groups claims by the document regions they read (one page
+chart, one paper table, the literal needles of one document), so each
+region is extracted exactly once and shared by every claim that uses it.
+"""
+
+import ast
+import itertools
+import json
+import operator
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+from consistency import MetricCube, Residual, as_vector, compare, round_half_up, safe_div
+
+NOT_FOUND = "NOT FOUND"
+DEFAULT_CLAIMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "claims.json")
+DOCUMENTS = ("website", "paper")
+
+
+@dataclass
+class Claim:
+    section: str
+    description: str
+    website: dict
+    paper: dict
+
+
+@dataclass
+class Identity:
+    section: str
+    description: str
+    lhs: str
+    # None compares `lhs` between the website and paper cubes.
+    rhs: str = None
+    docs: tuple = DOCUMENTS
+    projects: list = None
+    round: int = None
+    tolerance: float = 0.0
+    suffix: str = ""
+
+    @property
+    def metrics(self):
+        names = set(formula_names(self.lhs))
+        return names | set(formula_names(self.rhs)) if self.rhs else names
+
+
+@dataclass
+class CubeSpec:
+    agents: list
+    projects: list
+    metrics: list
+    # (document, metric) -> one source per (agent, project) cell, agent-major.
+    sources: dict
+
+
+@dataclass
+class Section:
+    id: str
+    title: str
+    claims: list = field(default_factory=list)
+    identities: list = field(default_factory=list)
+
+
+@dataclass
+class ClaimSpec:
+    sections: list
+    notes: list = field(default_factory=list)
+    cube: CubeSpec = None
+
+    @property
+    def claims(self):
+        return [c for s in self.sections for c in s.claims]
+
+    @property
+    def identities(self):
+        return [i for s in self.sections for i in s.identities]
+
+
+@dataclass
+class Result:
+    section: str
+    description: str
+    website: str
+    paper: str
+    website_at: tuple = None
+    paper_at: tuple = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return str(self.website).strip() == str(self.paper).strip()
+
+
+# ------------------------------------------------------------
+# Loading and template expansion
+# ------------------------------------------------------------
+
+_TEMPLATE = re.compile(r"\{(\w+)\.(\w+)\}")
+
+
+def _fill(template, context):
+    """Replace "{agent.name}" placeholders; other braces (e.g. LaTeX) are left alone."""
+    if isinstance(template, str):
+        def lookup(m):
+            item = context.get(m.group(1))
+            if item is None or m.group(2) not in item:
+                return m.group()
+            return str(item[m.group(2)])
+        return _TEMPLATE.sub(lookup, template)
+    if isinstance(template, list):
+        return [_fill(item, context) for item in template]
+    if isinstance(template, dict):
+        return {key: _fill(value, context) for key, value in template.items()}
+    return template
+
+
+def _expand(raw, dimensions):
+    loops = raw.get("for_each", [])
+    names = [name for name, _ in loops]
+    pools = [dimensions[source] if isinstance(source, str) else source for _, source in loops]
+    body = {k: v for k, v in raw.items() if k != "for_each"}
+    for combo in itertools.product(*pools):
+        context = dict(zip(names, combo))
+        yield _fill(body, context)
+
+
+def load_claims(path=DEFAULT_CLAIMS_PATH):
+    with open(path, "r") as f:
+        return parse_claims(json.load(f))
+
+
+def parse_claims(data):
+    dimensions = data.get("dimensions", {})
+    sections = []
+    for raw_section in data["sections"]:
+        section = Section(raw_section["id"], raw_section["title"])
+        for raw in raw_section.get("claims", []):
+            for claim in _expand(raw, dimensions):
+                value = claim.get("value")
+                website = claim.get("website", {})
+                paper = claim.get("paper", {})
+                if value is not None:
+                    website = {"value": value, **website}
+                    paper = {"value": value, **paper}
+                section.claims.append(Claim(section.id, claim["description"], website, paper))
+        for raw in raw_section.get("identities", []):
+            section.identities.append(_parse_identity(section.id, raw))
+        sections.append(section)
+    cube = _parse_cube(data["cube"], dimensions) if "cube" in data else None
+    return ClaimSpec(sections, data.get("notes", []), cube)
+
+
+def _parse_identity(section_id, raw):
+    cross = "expr" in raw
+    return Identity(section_id, raw["description"],
+                    raw["expr"] if cross else raw["lhs"],
+                    None if cross else raw["rhs"],
+                    DOCUMENTS if cross else tuple(raw.get("docs", DOCUMENTS)),
+                    raw.get("projects"), raw.get("round"),
+                    float(raw.get("tolerance", 0.0)), raw.get("suffix", ""))
+
+
+def _parse_cube(raw, dimensions):
+    agents = dimensions[raw.get("agents", "agents")]
+    projects = dimensions[raw.get("projects", "projects")]
+    contexts = [{"agent": a, "project": p} for a in agents for p in projects]
+    sources = {}
+    for metric, by_doc in raw["metrics"].items():
+        for doc in DOCUMENTS:
+            template = by_doc.get(doc)
+            if template is None and "value" in by_doc:
+                template = {"value": by_doc["value"]}
+            if template is not None:
+                sources[(doc, metric)] = [_fill(template, context) for context in contexts]
+    return CubeSpec([a["name"] for a in agents], [p["name"] for p in projects],
+                    list(raw["metrics"]), sources)
+
+
+# ------------------------------------------------------------
+# Formulas
+# ------------------------------------------------------------
+
+_BINARY = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: safe_div}
+
+
+def _round(value, digits=None):
+    # round(nan) with no digits raises; a NaN from a zero divisor stays NaN.
+    if isinstance(value, float) and value != value:
+        return value
+    return round(value, digits)
+
+
+_FUNCTIONS = {"round": _round, "min": min, "max": max, "abs": abs}
+
+
+def formula_names(formula):
+    """Input names of a formula, in the order they first appear in its text."""
+    nodes = [node for node in ast.walk(ast.parse(formula, mode="eval"))
+             if isinstance(node, ast.Name) and node.id not in _FUNCTIONS]
+    return list(dict.fromkeys(node.id for node in sorted(nodes, key=lambda node: node.col_offset)))
+
+
+def evaluate_formula(formula, values):
+    """Evaluate arithmetic over `values`; only + - * /, numbers and round/min/max/abs.
+
+    Division by zero gives NaN rather than raising, as in the metric cubes.
+    """
+    def walk(node):
+        if isinstance(node, ast.Expression):
+            return walk(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.Name):
+            return values[node.id]
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            return _BINARY[type(node.op)](walk(node.left), walk(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -walk(node.operand)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS:
+            return _FUNCTIONS[node.func.id](*(walk(arg) for arg in node.args))
+        raise ValueError(f"unsupported expression in formula: {formula}")
+    return walk(ast.parse(formula, mode="eval"))
+
+
+def to_number(text):
+    try:
+        return float(str(text).replace(",", "").replace("%", "").lstrip("~").strip())
+    except ValueError:
+        return None
+
+
+def format_number(value, digits=None):
+    if digits is not None:
+        return str(round(value, digits))
+    if float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+# ------------------------------------------------------------
+# Planning
+# ------------------------------------------------------------
+
+def _sources(source, doc):
+    """Yield (document, source) for a source and, recursively, its formula inputs."""
+    doc = source.get("doc", doc)
+    if "formula" in source:
+        for name, inner in source.get("inputs", {}).items():
+            if name in formula_names(source["formula"]):
+                yield from _sources(inner, doc)
+    else:
+        yield doc, source
+
+
+def region_of(doc, source):
+    if "literal" in source:
+        return (doc, "literals", None)
+    if "chart" in source:
+        return (doc, "chart", source["chart"])
+    if "section_table" in source:
+        return (doc, "section_table", source["section_table"])
+    if "table" in source:
+        return (doc, "table", source["table"])
+    return None
+
+
+@dataclass
+class Plan:
+    spec: ClaimSpec
+    # Region -> claims that read it, ordered website regions first.
+    regions: dict
+    needles: dict
+
+    @property
+    def users(self):
+        """Every claim and identity, in report order."""
+        return self.spec.claims + self.spec.identities
+
+    def extract(self, indexes, regions=None, timings=None):
+        """Extract each region (all of them by default) once from its document index.
+
+        Seconds spent per region are recorded in `timings` when given.
+        """
+        regions = list(self.regions if regions is None else regions)
+        # Headings and captions for every table region are matched in one scan
+        # per document rather than one linear search per region.
+        found = {}
+        for doc, kind in {(doc, kind) for doc, kind, _ in regions if kind in ("section_table", "table")}:
+            started = time.perf_counter()
+            keys = [key for d, k, key in regions if (d, k) == (doc, kind)]
+            index = indexes[doc]
+            found[(doc, kind)] = (index.sections_containing(keys) if kind == "section_table"
+                                  else index.tables_captioned(keys))
+            if timings is not None:
+                timings[(doc, kind + " lookup", None)] = time.perf_counter() - started
+        extracts = {}
+        for region in regions:
+            started = time.perf_counter()
+            extracts[region] = _extract(region, indexes, self.needles, found)
+            if timings is not None:
+                timings[region] = time.perf_counter() - started
+        return extracts
+
+    def evaluate(self, extracts, indexes, users=None):
+        """Results per claim or identity, keyed by id(), for `users` (default: all)."""
+        users = self.users if users is None else users
+        out = {}
+        identities = []
+        for user in users:
+            if isinstance(user, Identity):
+                identities.append(user)
+                continue
+            started = time.perf_counter()
+            w_val, w_at = _evaluate(user.website, "website", extracts, indexes)
+            p_val, p_at = _evaluate(user.paper, "paper", extracts, indexes)
+            out[id(user)] = [Result(user.section, user.description, w_val, p_val, w_at, p_at,
+                                    time.perf_counter() - started)]
+        if identities:
+            metrics = set().union(*(identity.metrics for identity in identities))
+            started = time.perf_counter()
+            cubes = {doc: load_cube(self.spec.cube, doc, extracts, indexes, metrics)
+                     for doc in DOCUMENTS}
+            # Loading the cubes is shared; charge it evenly to every identity row.
+            shared = (time.perf_counter() - started) / len(identities)
+            for identity in identities:
+                started = time.perf_counter()
+                rows = check_identity(identity, cubes)
+                elapsed = shared + time.perf_counter() - started
+                for row in rows:
+                    row.seconds = elapsed / len(rows)
+                out[id(identity)] = rows
+        return out
+
+    def check_names(self):
+        """Description of every check, in report order, without reading any document."""
+        cubes = {doc: MetricCube(self.spec.cube.agents, self.spec.cube.projects, self.spec.cube.metrics)
+                 for doc in DOCUMENTS} if self.spec.identities else {}
+        names = []
+        for user in self.users:
+            if isinstance(user, Identity):
+                names.extend(row.description for row in check_identity(user, cubes))
+            else:
+                names.append(user.description)
+        return names
+
+    def collect(self, by_user):
+        """Flatten per-user results into report order."""
+        return [r for user in self.users for r in by_user.get(id(user), [])]
+
+    def execute(self, website, paper):
+        """Extract every region once, then evaluate all claims against the extracts."""
+        indexes = {"website": website, "paper": paper}
+        extracts = self.extract(indexes)
+        return self.collect(self.evaluate(extracts, indexes))
+
+
+def compile_plan(spec):
+    regions = {}
+    needles = {doc: [] for doc in DOCUMENTS}
+
+    def register(doc, source, user):
+        region = region_of(doc, source)
+        if region is None:
+            return
+        users = regions.setdefault(region, [])
+        if not users or users[-1] is not user:
+            users.append(user)
+        if region[1] == "literals":
+            needles[doc].extend(n for n in source["literal"] if n not in needles[doc])
+
+    for claim in spec.claims:
+        for side in DOCUMENTS:
+            for doc, source in _sources(getattr(claim, side), side):
+                register(doc, source, claim)
+    for identity in spec.identities:
+        for side in identity.docs:
+            for metric in identity.metrics:
+                for cell_source in spec.cube.sources.get((side, metric), ()):
+                    for doc, source in _sources(cell_source, side):
+                        register(doc, source, identity)
+    ordered = dict(sorted(regions.items(), key=lambda item: DOCUMENTS.index(item[0][0])))
+    return Plan(spec, ordered, needles)
+
+
+def _extract(region, indexes, needles, found):
+    doc, kind, key = region
+    index = indexes[doc]
+    if kind == "literals":
+        return index.scan_literals(needles[doc])
+    if kind == "chart":
+        return index.chart(key)
+    if kind == "section_table":
+        section = found[(doc, kind)][key]
+        return section.tables[0] if section and section.tables else None
+    if kind == "table":
+        return found[(doc, kind)][key]
+    return None
+
+
+def _with_suffix(text, suffix):
+    return text if not suffix or text.endswith(suffix) else text + suffix
+
+
+def _evaluate(source, doc, extracts, indexes):
+    """Return (value text, (path, offset) or None) for one source."""
+    doc = source.get("doc", doc)
+    index = indexes[doc]
+    suffix = source.get("suffix", "")
+    if "formula" in source:
+        # A derived value is located at its first input that has a location.
+        values = {}
+        at = None
+        for name in formula_names(source["formula"]):
+            text, input_at = _evaluate(source["inputs"][name], doc, extracts, indexes)
+            values[name] = to_number(text)
+            if values[name] is None:
+                return NOT_FOUND, input_at
+            at = at or input_at
+        result = evaluate_formula(source["formula"], values)
+        if result != result:
+            # NaN: a zero divisor among the inputs.
+            return NOT_FOUND, at
+        return format_number(result, source.get("round")) + suffix, at
+    region = region_of(doc, source)
+    extract = extracts.get(region)
+    if "literal" in source:
+        for needle in source["literal"]:
+            if extract.contains(needle):
+                return source["value"], index.locate(extract.first(needle))
+        return NOT_FOUND, None
+    if "chart" in source:
+        point = extract.series(source["dataset"]).get(source["label"]) if extract else None
+        if point is None:
+            return NOT_FOUND, None
+        return _with_suffix(point.raw, suffix), index.locate(point.offset)
+    if "section_table" in source:
+        cell = extract.cell(source["row"], int(source.get("column", 1))) if extract else None
+        if cell is None:
+            return NOT_FOUND, None
+        return _with_suffix(cell.text, suffix), index.locate(cell.offset)
+    if "table" in source:
+        row = extract.row(source["row"], source.get("group")) if extract else None
+        cells = row.cells_after(source["row"]) if row else []
+        column = int(source.get("column", 0))
+        if column >= len(cells):
+            return NOT_FOUND, None
+        cell = cells[column]
+        return _with_suffix(cell.text, suffix), (extract.path, cell.offset)
+    if "value" in source:
+        return source["value"], None
+    return NOT_FOUND, None
+
+
+# ------------------------------------------------------------
+# Metric cubes and identities
+# ------------------------------------------------------------
+
+def load_cube(cube_spec, doc, extracts, indexes, metrics=None):
+    """Fill one document's cube from the shared extracts; unreadable cells stay NaN."""
+    cube = MetricCube(cube_spec.agents, cube_spec.projects, cube_spec.metrics)
+    for metric in cube_spec.metrics:
+        if metrics is not None and metric not in metrics:
+            continue
+        for cell, source in enumerate(cube_spec.sources.get((doc, metric), ())):
+            text, at = _evaluate(source, doc, extracts, indexes)
+            value = to_number(text)
+            if value is not None:
+                cube.set(cell, metric, value, at)
+    return cube
+
+
+def _display(value, identity):
+    if value != value:
+        return NOT_FOUND
+    if identity.round is not None:
+        return str(round_half_up(value, identity.round)) + identity.suffix
+    return format_number(value) + identity.suffix
+
+
+def _side_location(cube, cell, formula):
+    """Location of the first input of `formula` that the cube has one for in this cell."""
+    for metric in formula_names(formula):
+        at = cube.location(cell, metric)
+        if at is not None:
+            return at
+    return None
+
+
+def check_identity(identity, cubes):
+    """Evaluate an identity over whole cube columns; return one Residual per cell.
+
+    As with the values, website_at locates the left-hand side and paper_at the
+    right-hand side.
+    """
+    if identity.rhs is None:
+        pairs = [("website/paper", cubes["website"], identity.lhs, cubes["paper"], identity.lhs)]
+    else:
+        pairs = [(doc, cubes[doc], identity.lhs, cubes[doc], identity.rhs) for doc in identity.docs]
+    rows = []
+    for doc, left_cube, lhs, right_cube, rhs in pairs:
+        size = left_cube.size
+        left = as_vector(evaluate_formula(lhs, left_cube.columns()), size)
+        right = as_vector(evaluate_formula(rhs, right_cube.columns()), size)
+        residuals, statuses = compare(left, right, identity.round, identity.tolerance)
+        label = "" if identity.rhs is None or len(identity.docs) == 1 else f" [{doc}]"
+        for cell, (agent, project) in enumerate(left_cube.cells()):
+            if identity.projects and project not in identity.projects:
+                continue
+            rows.append(Residual(
+                identity.section, f"{project} {identity.description} - {agent}{label}",
+                identity.description, doc, agent, project,
+                left[cell], right[cell], residuals[cell], statuses[cell],
+                _display(left[cell], identity), _display(right[cell], identity),
+                _side_location(left_cube, cell, lhs), _side_location(right_cube, cell, rhs)))
+    return rows
@@ -0,0 +1,213 @@
+"""
+Dense metric cubes and vectorised identity checks.
+
+Quadrant counts and success rates are loaded once per document into one
+flat float array laid out agent x project x metric. An identity such as
+TS == Q1 / tasks * 100 is then evaluated as whole-column arithmetic over
+the cube, not cell by cell, and judged by an explicit rule:
+
+    round n       both sides rounded half away from zero to n decimals,
+                  then compared exactly
+    tolerance t   |lhs - rhs| <= t (after rounding, if both are given)
+
+Missing cells are NaN and propagate through the arithmetic, so a check that
+touches a missing value is reported as "missing" instead of pass or fail.
+"""
+
+import math
+import operator
+from array import array
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+
+NAN = float("nan")
+# Slack for binary float noise on top of the declared tolerance.
+_EPSILON = 1e-9
+
+
+def round_half_up(value, digits):
+    """Round half away from zero on the decimal text of `value`, as the tables do."""
+    if math.isnan(value):
+        return value
+    quantum = Decimal(1).scaleb(-digits)
+    # + 0.0 turns -0.0 into 0.0 so zero gaps print as "0.0".
+    return float(Decimal(repr(value)).quantize(quantum, rounding=ROUND_HALF_UP)) + 0.0
+
+
+def safe_div(a, b):
+    """a / b, or NaN for a zero divisor (e.g. an empty quadrant count)."""
+    return a / b if b else NAN
+
+
+class Vector:
+    """Element-wise float arithmetic over one metric column of a cube."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data if isinstance(data, array) else array("d", data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __getitem__(self, i):
+        return self.data[i]
+
+    def _apply(self, other, op):
+        if isinstance(other, Vector):
+            return Vector([op(a, b) for a, b in zip(self.data, other.data)])
+        return Vector([op(a, other) for a in self.data])
+
+    def _rapply(self, other, op):
+        return Vector([op(other, a) for a in self.data])
+
+    def __add__(self, other):
+        return self._apply(other, operator.add)
+
+    def __radd__(self, other):
+        return self._rapply(other, operator.add)
+
+    def __sub__(self, other):
+        return self._apply(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self._rapply(other, operator.sub)
+
+    def __mul__(self, other):
+        return self._apply(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self._rapply(other, operator.mul)
+
+    def __truediv__(self, other):
+        return self._apply(other, safe_div)
+
+    def __rtruediv__(self, other):
+        return self._rapply(other, safe_div)
+
+    def __neg__(self):
+        return Vector([-a for a in self.data])
+
+    def __abs__(self):
+        return Vector([abs(a) for a in self.data])
+
+    def __round__(self, digits=0):
+        return Vector([round_half_up(a, digits) for a in self.data])
+
+
+def as_vector(value, size):
+    """Broadcast a scalar formula result (e.g. a bare constant) to a column."""
+    if isinstance(value, Vector):
+        return value
+    return Vector(array("d", [float(value)]) * size)
+
+
+class MetricCube:
+    """Values for every (agent, project, metric), NaN where a document has none.
+
+    Each value keeps the (path, offset) it was read from, or None.
+    """
+
+    def __init__(self, agents, projects, metrics):
+        self.agents = list(agents)
+        self.projects = list(projects)
+        self.metrics = list(metrics)
+        self._metric_ids = {name: i for i, name in enumerate(self.metrics)}
+        self.data = array("d", [NAN]) * (len(self.agents) * len(self.projects) * len(self.metrics))
+        self.locations = [None] * len(self.data)
+
+    @property
+    def size(self):
+        """Number of (agent, project) cells."""
+        return len(self.agents) * len(self.projects)
+
+    def cells(self):
+        return [(agent, project) for agent in self.agents for project in self.projects]
+
+    def set(self, cell, metric, value, at=None):
+        i = cell * len(self.metrics) + self._metric_ids[metric]
+        self.data[i] = value
+        self.locations[i] = at
+
+    def location(self, cell, metric):
+        return self.locations[cell * len(self.metrics) + self._metric_ids[metric]]
+
+    def get(self, agent, project, metric):
+        cell = self.agents.index(agent) * len(self.projects) + self.projects.index(project)
+        return self.data[cell * len(self.metrics) + self._metric_ids[metric]]
+
+    def column(self, metric):
+        """All cells of one metric as a strided slice of the flat array."""
+        return Vector(self.data[self._metric_ids[metric]::len(self.metrics)])
+
+    def columns(self):
+        return {name: self.column(name) for name in self.metrics}
+
+
+def compare(lhs, rhs, digits=None, tolerance=0.0):
+    """Return (residuals, statuses) for two columns under one rounding/tolerance rule.
+
+    Residuals are lhs - rhs before rounding; statuses are "ok", "mismatch"
+    or "missing".
+    """
+    residuals = lhs - rhs
+    if digits is not None:
+        lhs, rhs = round(lhs, digits), round(rhs, digits)
+    limit = tolerance + _EPSILON
+    statuses = ["missing" if d != d else "ok" if d <= limit else "mismatch"
+                for d in abs(lhs - rhs)]
+    return residuals, statuses
+
+
+# ------------------------------------------------------------
+# Residual rows
+# ------------------------------------------------------------
+
+@dataclass
+class Residual:
+    """One cell of an identity check; reads like a claims Result for reporting."""
+    section: str
+    description: str
+    identity: str
+    doc: str
+    agent: str
+    project: str
+    lhs: float
+    rhs: float
+    residual: float
+    status: str
+    website: str
+    paper: str
+    website_at: tuple = None
+    paper_at: tuple = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+
+def format_residuals(rows):
+    """Render residual rows as a fixed-width table, one line per cell."""
+    header = ("identity", "doc", "project", "agent", "lhs", "rhs", "residual", "status")
+    body = [(r.identity, r.doc, r.project, r.agent, _number(r.lhs), _number(r.rhs),
+             _number(r.residual, signed=True), r.status) for r in rows]
+    widths = [max(len(str(line[i])) for line in [header] + body) for i in range(len(header))]
+    numeric = {4, 5, 6}
+    lines = []
+    for line in [header] + body:
+        cells = [str(v).rjust(w) if i in numeric else str(v).ljust(w)
+                 for i, (v, w) in enumerate(zip(line, widths))]
+        lines.append("  " + "  ".join(cells).rstrip())
+    return lines
+
+
+def _number(value, signed=False):
+    if value != value:
+        return "-"
+    if abs(value) < _EPSILON:
+        value = 0.0
+    return f"{value:+.4g}" if signed else f"{value:.4g}"
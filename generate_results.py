@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Generate the results figures on the page and in the paper from results.json.
+
+results.json holds the canonical data: task counts per project and, for
+every agent, how many tasks fell in each quadrant (Q1 true success, Q2 good
+intent, Q3 lucky win, Q4 failure). Every published figure derives from it:
+
+    true success  = Q1 / tasks * 100
+    hard success  = (Q1 + Q3) / tasks * 100
+    gap           = hard success - true success    (of the rounded values)
+
+Generated text lives between markers, written in the host file's comment
+syntax ("//" in the Chart.js script, "<!--" in HTML, "%" in LaTeX):
+
+    // @generated chart:quadrants:vLLM inputs=3f1c09a2b7de output=9b20e4c1a7f3
+    { label: 'Q1 True Success', data: [18, 8, 11, 7], ... },
+    // @end chart:quadrants:vLLM
+
+A new region starts as an empty pair of markers without hashes. Regions:
+
+    chart:true-success             Chart.js datasets, one per project
+    chart:hard-vs-true:<project>   Hard and True Success datasets
+    chart:quadrants:<project>      one stacked dataset per quadrant
+    html:true-success              <tr> rows, agent x project
+    tex:true-success               tabular rows, best per project in bold
+    tex:hard-vs-true               Hard/True/Gap rows grouped by project
+    tex:quadrants                  Q1-Q4 rows grouped by project
+
+"inputs" hashes the slice of results.json a region reads and "output" hashes
+the text between the markers. A run re-renders only regions whose inputs
+hash changed or whose text no longer matches its output hash, and writes a
+file only when one of its regions changed. --check verifies by comparing
+hashes alone, without parsing either document.
+
+    python generate_results.py index.html path/to/example_paper.tex
+    python generate_results.py index.html path/to/example_paper.tex --check
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+
+from consistency import round_half_up
+from paper_index import build_paper_index
+
+DEFAULT_RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.json")
+# Bump when a renderer's output format changes, so every region is regenerated.
+GENERATOR_VERSION = 1
+HASH_CHARS = 12
+
+_REGION = re.compile(r"""
+    ^(?P<indent>[ \t]*)(?P<open>//|%|<!--)[ \t]*@generated[ \t]+(?P<name>\S+)
+      (?:[ \t]+inputs=(?P<inputs>[0-9a-f]+)[ \t]+output=(?P<output>[0-9a-f]+))?[ \t]*(?:-->)?[ \t]*\n
+    (?P<body>.*?)
+    ^[ \t]*(?://|%|<!--)[ \t]*@end[ \t]+(?P=name)[ \t]*(?:-->)?[ \t]*$
+""", re.M | re.S | re.X)
+
+
+class ResultsError(Exception):
+    pass
+
+
+# ------------------------------------------------------------
+# Dataset
+# ------------------------------------------------------------
+
+@dataclass
+class Results:
+    agents: list
+    quadrants: list
+    projects: list
+
+    def project(self, name):
+        for project in self.projects:
+            if project["name"] == name:
+                return project
+        raise ResultsError(f"no project {name!r} in results")
+
+    def counts(self, project, agent):
+        return self.project(project)["outcomes"][agent]
+
+    def tasks(self, project):
+        return self.project(project)["tasks"]
+
+    def true_success(self, project, agent):
+        return round_half_up(self.counts(project, agent)[0] / self.tasks(project) * 100, 1)
+
+    def hard_success(self, project, agent):
+        q1, _, q3, _ = self.counts(project, agent)
+        return round_half_up((q1 + q3) / self.tasks(project) * 100, 1)
+
+    def gap(self, project, agent):
+        return round_half_up(self.hard_success(project, agent) - self.true_success(project, agent), 1)
+
+
+def load_results(path=DEFAULT_RESULTS_PATH):
+    with open(path, "r") as f:
+        data = json.load(f)
+    results = Results(data["agents"], data["quadrants"], data["projects"])
+    for project in results.projects:
+        for agent in results.agents:
+            counts = project["outcomes"].get(agent)
+            if counts is None or len(counts) != len(results.quadrants):
+                raise ResultsError(f"{project['name']}: {agent} needs {len(results.quadrants)} quadrant counts")
+            if sum(counts) != project["tasks"]:
+                raise ResultsError(f"{project['name']}: {agent} quadrants sum to {sum(counts)}, "
+                                   f"not {project['tasks']} tasks")
+    return results
+
+
+# ------------------------------------------------------------
+# Renderers
+# ------------------------------------------------------------
+
+def _pct(value):
+    return f"{value:.1f}"
+
+
+def _js_list(values):
+    return "[" + ", ".join(values) + "]"
+
+
+def _dataset(label, data, color, radius, count=False):
+    extra = " isCount: true," if count else ""
+    return f"{{ label: '{label}', data: {_js_list(data)}, backgroundColor: {color},{extra} borderRadius: {radius} }}"
+
+
+def _join_js(lines):
+    return [line + ("," if i < len(lines) - 1 else "") for i, line in enumerate(lines)]
+
+
+def chart_true_success(results):
+    lines = [_dataset(f"{p['name']} ({p['tasks']} tasks)",
+                      [_pct(results.true_success(p["name"], a)) for a in results.agents],
+                      f"colors.{p['name'].lower()}", 4)
+             for p in results.projects]
+    return _join_js(lines)
+
+
+def chart_hard_vs_true(results, project):
+    hard = [_pct(results.hard_success(project, a)) for a in results.agents]
+    true = [_pct(results.true_success(project, a)) for a in results.agents]
+    return _join_js([_dataset("Hard Success", hard, "colors.hard", 4),
+                     _dataset("True Success", true, "colors.true", 4)])
+
+
+def chart_quadrants(results, project):
+    lines = []
+    for i, q in enumerate(results.quadrants):
+        data = [str(results.counts(project, a)[i]) for a in results.agents]
+        lines.append(_dataset(f"{q['name']} {q['label']}", data, f"colors.{q['name'].lower()}", 2, count=True))
+    return _join_js(lines)
+
+
+def html_true_success(results):
+    return [f"<tr><td>{a}</td>" + "".join(f"<td>{_pct(results.true_success(p['name'], a))}%</td>"
+                                          for p in results.projects) + "</tr>"
+            for a in results.agents]
+
+
+def tex_true_success(results):
+    best = {p["name"]: max(results.true_success(p["name"], a) for a in results.agents) for p in results.projects}
+    lines = []
+    for a in results.agents:
+        cells = []
+        for p in results.projects:
+            value = results.true_success(p["name"], a)
+            cell = _pct(value) + "\\%"
+            cells.append(f"\\textbf{{{cell}}}" if value == best[p["name"]] else cell)
+        lines.append(f"{a} & " + " & ".join(cells) + " \\\\")
+    return lines
+
+
+def _tex_grouped(results, row):
+    lines = []
+    for i, p in enumerate(results.projects):
+        if i:
+            lines.append("\\midrule")
+        for j, a in enumerate(results.agents):
+            group = f"\\multirow{{{len(results.agents)}}}{{*}}{{{p['name']}}}" if j == 0 else ""
+            lines.append(f"{group} & {a} & " + " & ".join(row(p["name"], a)) + " \\\\")
+    return lines
+
+
+def tex_hard_vs_true(results):
+    return _tex_grouped(results, lambda p, a: [_pct(results.hard_success(p, a)), _pct(results.true_success(p, a)),
+                                               _pct(results.gap(p, a))])
+
+
+def tex_quadrants(results):
+    return _tex_grouped(results, lambda p, a: [str(n) for n in results.counts(p, a)])
+
+
+def _slice(results, projects):
+    return {"agents": results.agents, "quadrants": results.quadrants,
+            "projects": [results.project(p) for p in projects]}
+
+
+# Region kind -> (renderer, takes a project argument).
+RENDERERS = {
+    "chart:true-success": (chart_true_success, False),
+    "chart:hard-vs-true": (chart_hard_vs_true, True),
+    "chart:quadrants": (chart_quadrants, True),
+    "html:true-success": (html_true_success, False),
+    "tex:true-success": (tex_true_success, False),
+    "tex:hard-vs-true": (tex_hard_vs_true, False),
+    "tex:quadrants": (tex_quadrants, False),
+}
+
+
+def region_inputs(name, results):
+    """(renderer, arguments, inputs hash) for a region name such as chart:quadrants:vLLM."""
+    kind, _, project = name.rpartition(":") if name.count(":") == 2 else (name, "", "")
+    if kind not in RENDERERS:
+        raise ResultsError(f"unknown generated region {name!r}")
+    render, per_project = RENDERERS[kind]
+    if per_project != bool(project):
+        raise ResultsError(f"region {name!r} {'needs' if per_project else 'takes no'} project suffix")
+    args = (results, project) if per_project else (results,)
+    data = _slice(results, [project] if per_project else [p["name"] for p in results.projects])
+    raw = json.dumps([GENERATOR_VERSION, kind, data], sort_keys=True)
+    return render, args, _digest(raw)
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:HASH_CHARS]
+
+
+# ------------------------------------------------------------
+# Regions
+# ------------------------------------------------------------
+
+@dataclass
+class Region:
+    path: str
+    name: str
+    # "ok", "updated", "stale" (inputs changed), "edited" (text changed), "new" (no hashes yet)
+    status: str
+
+
+def _status(m, inputs):
+    if m.group("inputs") is None:
+        return "new"
+    if m.group("output") != _digest(m.group("body")):
+        return "edited"
+    if m.group("inputs") != inputs:
+        return "stale"
+    return "ok"
+
+
+def _render_region(m, render, args, inputs):
+    indent, opener = m.group("indent"), m.group("open")
+    closer = " -->" if opener == "<!--" else ""
+    body = "".join(f"{indent}{line}\n" for line in render(*args))
+    head = f"{indent}{opener} @generated {m.group('name')} inputs={inputs} output={_digest(body)}{closer}\n"
+    return f"{head}{body}{indent}{opener} @end {m.group('name')}{closer}"
+
+
+def process(text, path, results, check=False):
+    """Return (new text, regions) for one file; text is unchanged when checking."""
+    regions = []
+    pieces = []
+    last = 0
+    for m in _REGION.finditer(text):
+        render, args, inputs = region_inputs(m.group("name"), results)
+        status = _status(m, inputs)
+        if status != "ok" and not check:
+            pieces.append(text[last:m.start()])
+            pieces.append(_render_region(m, render, args, inputs))
+            last = m.end()
+            status = "updated"
+        regions.append(Region(path, m.group("name"), status))
+    pieces.append(text[last:])
+    return "".join(pieces), regions
+
+
+def generate_file(path, results, check=False):
+    with open(path, "r") as f:
+        text = f.read()
+    new_text, regions = process(text, path, results, check)
+    if new_text != text:
+        with open(path + ".tmp", "w") as f:
+            f.write(new_text)
+        os.replace(path + ".tmp", path)
+    return regions
+
+
+def target_files(website, paper):
+    files = [website] if website else []
+    if paper:
+        files += build_paper_index(paper, None).files()
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write results.json into the generated regions of the page and paper.")
+    parser.add_argument("website", help="path to index.html")
+    parser.add_argument("paper", nargs="?", help="root .tex file; every \\input file is processed too")
+    parser.add_argument("--results", default=DEFAULT_RESULTS_PATH, help="results dataset (default: results.json)")
+    parser.add_argument("--check", action="store_true",
+                        help="only compare hashes; exit 1 if any region is stale, edited or new")
+    args = parser.parse_args(argv)
+
+    try:
+        results = load_results(args.results)
+        regions = []
+        for path in target_files(args.website, args.paper):
+            regions += generate_file(path, results, args.check)
+    except ResultsError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    for region in regions:
+        if region.status != "ok" or args.check:
+            print(f"  {region.status:<8} {region.name}  ({region.path})")
+    counts = {s: sum(1 for r in regions if r.status == s) for s in ("ok", "updated", "stale", "edited", "new")}
+    print(f"{len(regions)} regions: " + ", ".join(f"{n} {s}" for s, n in counts.items() if n))
+    if args.check:
+        return 0 if regions and counts["ok"] == len(regions) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Run the checks across git history and bisect to the commit that broke a claim.
+
+File contents are streamed from git (`git cat-file --batch`) without
+checking out any tree. Every parse is keyed by blob:
+
+  - blob ids per (revision, path) come from one long-lived
+    `git cat-file --batch-check` process, and contents are only fetched
+    for blobs not seen before;
+  - page indexes are kept per blob id and paper events per content digest,
+    so an unchanged file is never re-parsed;
+  - check results are kept per (page blob, paper blobs), so a revision that
+    touched neither document costs a few blob-id lookups.
+
+    python history.py index.html paper/example_paper.tex log --range v1..HEAD
+    python history.py index.html paper/example_paper.tex bisect --claim "True Success vLLM - Claude Code"
+
+When the paper lives outside the repository, pass --paper-file to check
+every revision of the page against that one file on disk.
+"""
+
+import argparse
+import difflib
+import os
+import subprocess
+import sys
+from collections import OrderedDict
+
+from claims import DEFAULT_CLAIMS_PATH
+from paper_index import DEFAULT_CACHE_DIR, build_paper_index
+from verify_data import Report, load_plan
+from website_index import build_website_index
+
+# Blob contents kept in memory; enough for the page and paper files of many
+# revisions, while a long history no longer holds every version of them.
+TEXT_CACHE_SIZE = 256
+
+
+class GitBlobs:
+    """Blob ids and contents from a repository through two persistent cat-file processes."""
+
+    def __init__(self, repo=".", cache_size=TEXT_CACHE_SIZE):
+        self.repo = os.path.abspath(repo)
+        self._check = self._spawn("--batch-check")
+        self._batch = self._spawn("--batch")
+        self._ids = {}
+        # Least recently used blob texts are dropped first.
+        self._texts = OrderedDict()
+        self.cache_size = cache_size
+
+    def _spawn(self, mode):
+        return subprocess.Popen(["git", "cat-file", mode], cwd=self.repo,
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def _request(self, process, name):
+        process.stdin.write(name.encode("utf-8") + b"\n")
+        process.stdin.flush()
+        header = process.stdout.readline().decode("utf-8").split()
+        if len(header) != 3:
+            return None, None
+        return header[0], int(header[2])
+
+    def blob_id(self, rev, path):
+        """Blob id of `path` at `rev`, or None when the file does not exist there."""
+        key = (rev, path)
+        if key not in self._ids:
+            sha, _ = self._request(self._check, f"{rev}:{path}")
+            self._ids[key] = sha
+        return self._ids[key]
+
+    def text(self, sha):
+        if sha in self._texts:
+            self._texts.move_to_end(sha)
+            return self._texts[sha]
+        _, size = self._request(self._batch, sha)
+        data = self._batch.stdout.read(size)
+        self._batch.stdout.read(1)
+        text = self._texts[sha] = data.decode("utf-8", errors="replace")
+        if len(self._texts) > self.cache_size:
+            self._texts.popitem(last=False)
+        return text
+
+    def read(self, rev, path):
+        sha = self.blob_id(rev, path)
+        return None if sha is None else self.text(sha)
+
+    def close(self):
+        for process in (self._check, self._batch):
+            process.stdin.close()
+            process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True,
+                          stdout=subprocess.PIPE, text=True).stdout
+
+
+def revisions(repo, rev_range, paths):
+    """Commits in `rev_range` that touch any of `paths`, oldest first."""
+    out = git(repo, "rev-list", "--reverse", "--first-parent", rev_range, "--", *paths)
+    return out.split()
+
+
+class History:
+    def __init__(self, repo, website_path, paper_path=None, paper_file=None,
+                 claims_path=DEFAULT_CLAIMS_PATH, cache_dir=DEFAULT_CACHE_DIR):
+        self.blobs = GitBlobs(repo)
+        self.repo = self.blobs.repo
+        self.website_path = website_path
+        self.paper_path = paper_path
+        self.cache_dir = cache_dir
+        self.plan = load_plan(claims_path)
+        self._websites = {}
+        self._events = {}
+        self._results = {}
+        self._fixed_paper = build_paper_index(paper_file, cache_dir) if paper_file else None
+
+    @property
+    def paths(self):
+        """Paths whose history matters: the page and the paper's directory."""
+        if self._fixed_paper is not None:
+            return [self.website_path]
+        return [self.website_path, os.path.dirname(self.paper_path) or "."]
+
+    def _paper(self, rev):
+        if self._fixed_paper is not None:
+            return self._fixed_paper, ()
+
+        def loader(path):
+            rel = os.path.relpath(path, self.repo)
+            return None if rel.startswith("..") else self.blobs.read(rev, rel)
+        paper = build_paper_index(os.path.join(self.repo, self.paper_path), self.cache_dir,
+                                  loader=loader, memo=self._events)
+        blobs = tuple(self.blobs.blob_id(rev, os.path.relpath(p, self.repo)) for p in paper.files())
+        return paper, blobs
+
+    def report(self, rev):
+        """Report for one revision; None when the page does not exist there."""
+        website_blob = self.blobs.blob_id(rev, self.website_path)
+        if website_blob is None:
+            return None
+        paper, paper_blobs = self._paper(rev)
+        key = (website_blob, paper_blobs)
+        if key not in self._results:
+            if website_blob not in self._websites:
+                self._websites[website_blob] = build_website_index(
+                    self.blobs.text(website_blob), f"{rev[:10]}:{self.website_path}")
+            self._results[key] = self.plan.execute(self._websites[website_blob], paper)
+        return Report(self.plan.spec, self._results[key], f"{rev}:{self.website_path}", self.paper_path,
+                      missing=paper.missing)
+
+    def has_page(self, rev):
+        return self.blobs.blob_id(rev, self.website_path) is not None
+
+    def passes(self, rev, claim):
+        """Whether `claim` passes at `rev`; None when the page does not exist there."""
+        report = self.report(rev)
+        if report is None:
+            return None
+        matching = [r for r in report.results if r.description == claim]
+        if not matching:
+            raise ValueError(f"no check named {claim!r}")
+        return all(r.ok for r in matching)
+
+    def close(self):
+        self.blobs.close()
+
+
+def bisect_claim(history, revs, claim, log=print):
+    """First revision in `revs` (oldest first) where `claim` fails, given it passed before.
+
+    Revisions without the page carry no data and are skipped. Returns None
+    when the claim still passes at the newest revision with the page.
+    """
+    with_page = [rev for rev in revs if history.has_page(rev)]
+    if len(with_page) < len(revs):
+        log(f"  skipping {len(revs) - len(with_page)} revisions without the page")
+    revs = with_page
+    if not revs or history.passes(revs[-1], claim):
+        return None
+    if not history.passes(revs[0], claim):
+        log(f"  {revs[0][:10]} already failing at the oldest revision in range")
+        return revs[0]
+    good, bad = 0, len(revs) - 1
+    while bad - good > 1:
+        mid = (good + bad) // 2
+        ok = history.passes(revs[mid], claim)
+        log(f"  {revs[mid][:10]} {'good' if ok else 'bad'}")
+        if ok:
+            good = mid
+        else:
+            bad = mid
+    return revs[bad]
+
+
+def subject(repo, rev):
+    return git(repo, "log", "-1", "--format=%h %ad %s", "--date=short", rev).strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify the page against the paper across git history.")
+    parser.add_argument("website", help="repository path of index.html")
+    parser.add_argument("paper", nargs="?", help="repository path of the root .tex file")
+    parser.add_argument("command", choices=["log", "bisect"])
+    parser.add_argument("--repo", default=".", help="git repository (default: current directory)")
+    parser.add_argument("--range", default="HEAD", help="revision range for git rev-list (default: HEAD)")
+    parser.add_argument("--paper-file", help="check every revision against this paper on disk instead")
+    parser.add_argument("--claim", help="check description to bisect on")
+    parser.add_argument("--claims", default=DEFAULT_CLAIMS_PATH, help="claims file (default: claims.json)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="parsed-table cache directory")
+    args = parser.parse_args(argv)
+    if not args.paper and not args.paper_file:
+        parser.error("give the paper's repository path or --paper-file")
+    if args.command == "bisect" and not args.claim:
+        parser.error("bisect needs --claim")
+    if args.claim:
+        names = load_plan(args.claims).check_names()
+        if args.claim not in names:
+            close = difflib.get_close_matches(args.claim, names, n=3)
+            parser.error(f"no check named {args.claim!r}"
+                         + (" (did you mean: " + "; ".join(repr(c) for c in close) + ")" if close else ""))
+
+    history = History(args.repo, args.website, args.paper, args.paper_file, args.claims, args.cache_dir)
+    try:
+        revs = revisions(history.repo, args.range, history.paths)
+        if args.command == "bisect":
+            if not any(history.has_page(rev) for rev in revs):
+                print(f"{args.website} does not exist at any revision in {args.range}")
+                return 1
+            first = bisect_claim(history, revs, args.claim)
+            if first is None:
+                print(f"'{args.claim}' passes at the newest revision")
+                return 0
+            print(f"First failing revision for '{args.claim}':")
+            print(f"  {subject(history.repo, first)}")
+            report = history.report(first)
+            for r in report.results if report is not None else []:
+                if r.description == args.claim:
+                    print(f"  Website: {r.website}\n  Paper:   {r.paper}")
+            return 1
+
+        previous = set()
+        for rev in revs:
+            report = history.report(rev)
+            if report is None:
+                print(f"{subject(history.repo, rev)}: page missing")
+                continue
+            failing = {r.description for r in report.mismatches}
+            print(f"{subject(history.repo, rev)}: {len(failing)} mismatches")
+            for description in sorted(failing - previous):
+                print(f"    + {description}")
+            for description in sorted(previous - failing):
+                print(f"    - {description}")
+            previous = failing
+        return 1 if previous else 0
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Aho-Corasick multi-pattern matcher for literal presence checks.
+
+All needles are compiled into one automaton; a document is then scanned in
+a single linear pass that records every offset at which every needle occurs.
+Scan cost depends on the document length and the number of matches, not on
+how many needles are registered.
+"""
+
+import bisect
+
+
+class MatchSet:
+    """Offsets of every registered needle found in one document."""
+
+    def __init__(self, needles, offsets):
+        self.needles = needles
+        self._offsets = offsets
+
+    def __contains__(self, needle):
+        return needle in self.needles
+
+    def contains(self, needle):
+        return bool(self._offsets.get(needle))
+
+    def offsets(self, needle):
+        return self._offsets.get(needle, [])
+
+    def first(self, needle):
+        found = self._offsets.get(needle)
+        return found[0] if found else None
+
+
+class LiteralMatcher:
+    def __init__(self, needles=()):
+        self._goto = [{}]
+        self._fail = [0]
+        # Needles ending at a state, and the nearest suffix state that also ends one.
+        self._ends = [[]]
+        self._dict_link = [0]
+        self.needles = []
+        self._ids = {}
+        self._built = False
+        for needle in needles:
+            self.add(needle)
+
+    def add(self, needle):
+        if not needle or needle in self._ids:
+            return
+        self._ids[needle] = len(self.needles)
+        self.needles.append(needle)
+        state = 0
+        for ch in needle:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._ends.append([])
+                self._dict_link.append(0)
+            state = nxt
+        self._ends[state].append(needle)
+        self._built = False
+
+    def build(self):
+        """Compute failure and dictionary-suffix links breadth first."""
+        goto, fail, ends, dict_link = self._goto, self._fail, self._ends, self._dict_link
+        queue = []
+        for state in goto[0].values():
+            fail[state] = 0
+            dict_link[state] = 0
+            queue.append(state)
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                dict_link[nxt] = fail[nxt] if ends[fail[nxt]] else dict_link[fail[nxt]]
+        self._built = True
+        return self
+
+    def scan(self, text):
+        """Return a MatchSet with the start offset of every occurrence of every needle."""
+        if not self._built:
+            self.build()
+        goto, fail, ends, dict_link = self._goto, self._fail, self._ends, self._dict_link
+        root = goto[0]
+        offsets = {}
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0) if state else root.get(ch, 0)
+            if not state:
+                continue
+            out = state if ends[state] else dict_link[state]
+            while out:
+                for needle in ends[out]:
+                    offsets.setdefault(needle, []).append(i - len(needle) + 1)
+                out = dict_link[out]
+        return MatchSet(set(self.needles), offsets)
+
+
+def scan_literals(text, needles):
+    return LiteralMatcher(needles).scan(text)
+
+
+def first_containing(texts, needles):
+    """Map each needle to the index of the first text containing it, in one scan.
+
+    Texts are joined with newlines, so needles must not contain one.
+    """
+    starts = []
+    position = 0
+    for text in texts:
+        starts.append(position)
+        position += len(text) + 1
+    found = scan_literals("\n".join(texts), needles)
+    out = {}
+    for needle in needles:
+        offset = found.first(needle)
+        if offset is not None:
+            out[needle] = bisect.bisect_right(starts, offset) - 1
+    return out
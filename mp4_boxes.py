@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Streaming MP4 box parser: layout report, faststart rewrite and poster manifest.
+
+Files are never read whole. Top-level boxes are found by seeking from header
+to header, so mdat payloads are skipped without being read; only the moov
+box (a few KB to a few hundred KB) is loaded and parsed in memory. Copies
+stream in 1 MB chunks.
+
+    inspect     top-level layout, whether moov precedes mdat, duration,
+                bitrate, and per track: codec, size, frame rate, keyframe
+                count/spacing and the size of the first keyframe
+    faststart   move moov in front of mdat, shifting every stco/co64 chunk
+                offset by the distance its data moved
+    posters     write a manifest of poster frames for <video preload="none">
+
+    python mp4_boxes.py inspect static/videos/*.mp4
+    python mp4_boxes.py faststart in.mp4 [out.mp4]
+    python mp4_boxes.py posters static/videos/*.mp4 [--manifest static/videos/posters.json]
+
+Extracting the poster image itself needs a video decoder, which pure Python
+does not have; the manifest records the first keyframe's time so an encoder
+can grab it, and marks each video whose poster file is present.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import struct
+import sys
+from dataclasses import dataclass, field
+
+CHUNK = 1 << 20
+CONTAINERS = {"moov", "trak", "mdia", "minf", "stbl", "edts", "dinf", "mvex", "udta"}
+POSTER_DIR = "posters"
+DEFAULT_MANIFEST = "static/videos/posters.json"
+
+
+class Mp4Error(ValueError):
+    pass
+
+
+@dataclass
+class Box:
+    type: str
+    offset: int
+    size: int
+    header: int
+
+    @property
+    def end(self):
+        return self.offset + self.size
+
+    @property
+    def payload(self):
+        return self.offset + self.header
+
+
+# ------------------------------------------------------------
+# Box walking
+# ------------------------------------------------------------
+
+def _header(data, pos, limit):
+    """(type, size, header length) of the box at `pos` in a buffer."""
+    if limit - pos < 8:
+        raise Mp4Error(f"truncated box header at {pos}")
+    size, kind = struct.unpack_from(">I4s", data, pos)
+    header = 8
+    if size == 1:
+        if limit - pos < 16:
+            raise Mp4Error(f"truncated box header at {pos}")
+        size = struct.unpack_from(">Q", data, pos + 8)[0]
+        header = 16
+    elif size == 0:
+        size = limit - pos
+    if size < header or pos + size > limit:
+        raise Mp4Error(f"bad size {size} for {kind!r} box at {pos}")
+    return kind, size, header
+
+
+def top_level(f):
+    """Top-level boxes of an open file, found by seeking; payloads are not read."""
+    f.seek(0, os.SEEK_END)
+    file_size = f.tell()
+    boxes = []
+    pos = 0
+    while pos < file_size:
+        f.seek(pos)
+        head = f.read(16)
+        kind, size, header = _header(head, 0, file_size - pos)
+        boxes.append(Box(kind.decode("latin-1"), pos, size, header))
+        pos += size
+    return boxes
+
+
+def children(data, start, end):
+    """Boxes directly inside data[start:end]."""
+    pos = start
+    while pos < end:
+        kind, size, header = _header(data, pos, end)
+        yield Box(kind.decode("latin-1"), pos, size, header)
+        pos += size
+
+
+def walk(data, start=0, end=None, path=()):
+    """Every box in a moov buffer, depth first, with its path of ancestor types."""
+    end = len(data) if end is None else end
+    for box in children(data, start, end):
+        yield path, box
+        if box.type in CONTAINERS:
+            yield from walk(data, box.payload, box.end, path + (box.type,))
+
+
+def read_box(f, box):
+    f.seek(box.offset)
+    data = f.read(box.size)
+    if len(data) != box.size:
+        raise Mp4Error(f"short read of {box.type} box at {box.offset}")
+    return data
+
+
+def _copy(src, dst, offset, size):
+    src.seek(offset)
+    while size > 0:
+        chunk = src.read(min(CHUNK, size))
+        if not chunk:
+            raise Mp4Error(f"unexpected end of file at {src.tell()}")
+        dst.write(chunk)
+        size -= len(chunk)
+
+
+# ------------------------------------------------------------
+# Tracks
+# ------------------------------------------------------------
+
+def _full_box(data, box):
+    """(version, payload offset after version/flags) of a full box."""
+    return data[box.payload], box.payload + 4
+
+
+def _times(data, box):
+    """(timescale, duration) from an mvhd or mdhd box."""
+    version, pos = _full_box(data, box)
+    if version == 1:
+        return struct.unpack_from(">IQ", data, pos + 16)
+    return struct.unpack_from(">II", data, pos + 8)
+
+
+def _table(data, box, fmt):
+    _, pos = _full_box(data, box)
+    count = struct.unpack_from(">I", data, pos)[0]
+    width = struct.calcsize(fmt)
+    return [struct.unpack_from(fmt, data, pos + 4 + i * width) for i in range(count)]
+
+
+@dataclass
+class Track:
+    id: int = 0
+    handler: str = ""
+    codec: str = ""
+    width: int = 0
+    height: int = 0
+    timescale: int = 1
+    duration: int = 0
+    sizes: list = field(default_factory=list)
+    # 1-based sample numbers of sync samples; None means every sample is one.
+    sync: list = None
+    deltas: list = field(default_factory=list)
+    chunk_offsets: list = field(default_factory=list)
+    sample_to_chunk: list = field(default_factory=list)
+
+    @property
+    def seconds(self):
+        return self.duration / self.timescale if self.timescale else 0.0
+
+    @property
+    def samples(self):
+        return len(self.sizes)
+
+    def sample_times(self):
+        times = []
+        t = 0
+        for count, delta in self.deltas:
+            for _ in range(count):
+                times.append(t / self.timescale)
+                t += delta
+        return times
+
+    def keyframes(self):
+        return list(range(1, self.samples + 1)) if self.sync is None else list(self.sync)
+
+    def first_keyframe(self):
+        """1-based number of the first keyframe, or None with no samples or an empty stss."""
+        keys = self.keyframes()
+        return keys[0] if keys and keys[0] <= len(self.sizes) else None
+
+    def sample_offset(self, number):
+        """File offset of 1-based sample `number`, via stsc and stco/co64."""
+        runs = self.sample_to_chunk
+        sample = 1
+        for i, (first_chunk, per_chunk, _) in enumerate(runs):
+            last_chunk = runs[i + 1][0] - 1 if i + 1 < len(runs) else len(self.chunk_offsets)
+            for chunk in range(first_chunk, last_chunk + 1):
+                if number < sample + per_chunk:
+                    return self.chunk_offsets[chunk - 1] + sum(self.sizes[sample - 1:number - 1])
+                sample += per_chunk
+        raise Mp4Error(f"sample {number} is not in any chunk")
+
+
+def parse_tracks(moov):
+    """(movie timescale, movie duration, [Track]) from a moov box's bytes."""
+    timescale, duration = 1, 0
+    tracks = []
+    for box in children(moov, _header(moov, 0, len(moov))[2], len(moov)):
+        if box.type == "mvhd":
+            timescale, duration = _times(moov, box)
+        elif box.type == "trak":
+            tracks.append(_parse_track(moov, box))
+    return timescale, duration, tracks
+
+
+def _parse_track(data, trak):
+    track = Track()
+    for _, box in walk(data, trak.payload, trak.end):
+        kind = box.type
+        if kind == "tkhd":
+            version, pos = _full_box(data, box)
+            track.id = struct.unpack_from(">I", data, pos + (16 if version == 1 else 8))[0]
+            track.width, track.height = (v >> 16 for v in struct.unpack_from(">II", data, box.end - 8))
+        elif kind == "mdhd":
+            track.timescale, track.duration = _times(data, box)
+        elif kind == "hdlr":
+            track.handler = data[box.payload + 8:box.payload + 12].decode("latin-1")
+        elif kind == "stsd":
+            entry = box.payload + 8
+            track.codec = data[entry + 4:entry + 8].decode("latin-1")
+            if track.handler == "vide":
+                track.width, track.height = struct.unpack_from(">HH", data, entry + 32)
+        elif kind == "stts":
+            track.deltas = _table(data, box, ">II")
+        elif kind == "stss":
+            track.sync = [n for (n,) in _table(data, box, ">I")]
+        elif kind == "stsc":
+            track.sample_to_chunk = _table(data, box, ">III")
+        elif kind == "stsz":
+            _, pos = _full_box(data, box)
+            uniform, count = struct.unpack_from(">II", data, pos)
+            track.sizes = ([uniform] * count if uniform else
+                           list(struct.unpack_from(f">{count}I", data, pos + 8)))
+        elif kind in ("stco", "co64"):
+            fmt = ">I" if kind == "stco" else ">Q"
+            track.chunk_offsets = [o for (o,) in _table(data, box, fmt)]
+    return track
+
+
+# ------------------------------------------------------------
+# Inspect
+# ------------------------------------------------------------
+
+@dataclass
+class Movie:
+    path: str
+    size: int
+    boxes: list
+    timescale: int
+    duration: int
+    tracks: list
+
+    @property
+    def seconds(self):
+        return self.duration / self.timescale if self.timescale else 0.0
+
+    @property
+    def faststart(self):
+        moov = next((b.offset for b in self.boxes if b.type == "moov"), None)
+        mdat = next((b.offset for b in self.boxes if b.type == "mdat"), None)
+        return moov is not None and (mdat is None or moov < mdat)
+
+    @property
+    def video(self):
+        return next((t for t in self.tracks if t.handler == "vide"), None)
+
+    def first_frame_bytes(self):
+        """Bytes a progressive download needs before the first video frame can be shown."""
+        track = self.video
+        moov_end = next(b.end for b in self.boxes if b.type == "moov")
+        first = track.first_keyframe() if track is not None else None
+        if first is None:
+            return moov_end
+        frame_end = track.sample_offset(first) + track.sizes[first - 1]
+        return max(moov_end, frame_end)
+
+
+def open_movie(path):
+    with open(path, "rb") as f:
+        boxes = top_level(f)
+        moov = next((b for b in boxes if b.type == "moov"), None)
+        if moov is None:
+            raise Mp4Error(f"{path}: no moov box")
+        timescale, duration, tracks = parse_tracks(read_box(f, moov))
+    return Movie(path, boxes[-1].end if boxes else 0, boxes, timescale, duration, tracks)
+
+
+def _size(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def describe(movie):
+    lines = [f"{movie.path}  {_size(movie.size)}  {movie.seconds:.2f} s  "
+             f"{movie.size * 8 / movie.seconds / 1000 if movie.seconds else 0:.0f} kbit/s  "
+             f"{'faststart' if movie.faststart else 'moov after mdat'}"]
+    for box in movie.boxes:
+        lines.append(f"  {box.type:<6} @ {box.offset:>10}  {_size(box.size):>9}")
+    for track in movie.tracks:
+        data = sum(track.sizes)
+        line = (f"  track {track.id} {track.handler} {track.codec}  {track.samples} samples  "
+                f"{data * 8 / track.seconds / 1000 if track.seconds else 0:.0f} kbit/s")
+        if track.handler == "vide":
+            times = track.sample_times()
+            keys = track.keyframes()
+            key_times = [times[n - 1] for n in keys if n <= len(times)]
+            gaps = [b - a for a, b in zip(key_times, key_times[1:])]
+            fps = track.samples / track.seconds if track.seconds else 0
+            line += (f"  {track.width}x{track.height}  {fps:.2f} fps  {len(keys)} keyframes"
+                     + (f", every {sum(gaps) / len(gaps):.2f} s (max {max(gaps):.2f} s)" if gaps else ""))
+            first = track.first_keyframe()
+            if first is not None:
+                line += f"  first keyframe {_size(track.sizes[first - 1])}"
+        lines.append(line)
+    if movie.video is not None:
+        lines.append(f"  first frame after {_size(movie.first_frame_bytes())} "
+                     f"({movie.first_frame_bytes() / movie.size:.1%} of the file)")
+    return "\n".join(lines)
+
+
+# ------------------------------------------------------------
+# Faststart
+# ------------------------------------------------------------
+
+def _patch_offsets(moov, shift_of):
+    """Rewrite every stco/co64 entry in a moov buffer through shift_of(offset)."""
+    for _, box in walk(moov, _header(moov, 0, len(moov))[2], len(moov)):
+        if box.type not in ("stco", "co64"):
+            continue
+        fmt = ">I" if box.type == "stco" else ">Q"
+        width = struct.calcsize(fmt)
+        _, pos = _full_box(moov, box)
+        count = struct.unpack_from(">I", moov, pos)[0]
+        for i in range(count):
+            at = pos + 4 + i * width
+            offset = struct.unpack_from(fmt, moov, at)[0]
+            new = offset + shift_of(offset)
+            if box.type == "stco" and new > 0xFFFFFFFF:
+                raise Mp4Error("moved chunk offsets no longer fit in stco; co64 upgrade is not supported")
+            struct.pack_into(fmt, moov, at, new)
+
+
+def faststart(src_path, dst_path=None):
+    """Write src with moov ahead of all media data; returns False if it already was.
+
+    An input that is already faststart is copied unchanged to a separate dst.
+    """
+    dst_path = dst_path or src_path
+    with open(src_path, "rb") as src:
+        boxes = top_level(src)
+        kinds = [b.type for b in boxes]
+        if "moof" in kinds:
+            raise Mp4Error(f"{src_path}: fragmented MP4 already streams; nothing to move")
+        if "moov" not in kinds:
+            raise Mp4Error(f"{src_path}: no moov box")
+        moov_box = boxes[kinds.index("moov")]
+        first_media = next((i for i, k in enumerate(kinds) if k == "mdat"), None)
+        if first_media is None or moov_box.offset < boxes[first_media].offset:
+            if os.path.abspath(dst_path) != os.path.abspath(src_path):
+                shutil.copyfile(src_path, dst_path)
+            return False
+        if moov_box.header != 8:
+            raise Mp4Error(f"{src_path}: 64-bit moov header is not supported")
+        # ftyp first, then moov, then everything else in its original order.
+        order = ([b for b in boxes if b.type == "ftyp"] + [moov_box]
+                 + [b for b in boxes if b.type != "ftyp" and b is not moov_box])
+        shifts = []
+        pos = 0
+        for box in order:
+            if box is not moov_box:
+                shifts.append((box.offset, box.end, pos - box.offset))
+            pos += box.size
+
+        def shift_of(offset):
+            for start, end, shift in shifts:
+                if start <= offset < end:
+                    return shift
+            raise Mp4Error(f"chunk offset {offset} points outside every box")
+
+        moov = bytearray(read_box(src, moov_box))
+        _patch_offsets(moov, shift_of)
+        tmp = dst_path + ".tmp"
+        with open(tmp, "wb") as dst:
+            for box in order:
+                if box is moov_box:
+                    dst.write(moov)
+                else:
+                    _copy(src, dst, box.offset, box.size)
+    os.replace(tmp, dst_path)
+    return True
+
+
+# ------------------------------------------------------------
+# Posters
+# ------------------------------------------------------------
+
+def poster_path(video_path):
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(os.path.dirname(video_path), POSTER_DIR, stem + ".jpg")
+
+
+def poster_manifest(paths, root="."):
+    """{video url: entry} for each video; `poster` is set only when the poster file exists."""
+    manifest = {}
+    for path in paths:
+        movie = open_movie(path)
+        track = movie.video
+        expected = poster_path(path)
+        first = track.first_keyframe() if track else None
+        manifest[os.path.relpath(path, root)] = {
+            "poster": os.path.relpath(expected, root) if os.path.exists(expected) else None,
+            "expected_poster": os.path.relpath(expected, root),
+            "width": track.width if track else None,
+            "height": track.height if track else None,
+            "duration": round(movie.seconds, 3),
+            "first_keyframe_time": round(track.sample_times()[first - 1], 3) if first else None,
+            "first_frame_bytes": movie.first_frame_bytes(),
+            "faststart": movie.faststart,
+        }
+    return manifest
+
+
+_VIDEO = re.compile(r"<video\b[^>]*>.*?</video>", re.S | re.I)
+
+
+def apply_posters(html, manifest):
+    """Give every <video> with a known poster `poster=` and `preload="none"`."""
+    def rewrite(m):
+        block = m.group(0)
+        src = re.search(r"""\ssrc\s*=\s*["']([^"']+)["']""", block)
+        entry = manifest.get(src.group(1)) if src else None
+        if not entry or not entry["poster"]:
+            return block
+        tag_end = block.index(">")
+        tag = re.sub(r"""\s(poster|preload)\s*=\s*(["'])[^"']*\2""", "", block[:tag_end])
+        return f'{tag} poster="{entry["poster"]}" preload="none"{block[tag_end:]}'
+    return _VIDEO.sub(rewrite, html)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect MP4 files, rewrite them for faststart, list posters.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_inspect = sub.add_parser("inspect", help="report box layout, bitrate and keyframe spacing")
+    p_inspect.add_argument("videos", nargs="+")
+    p_fast = sub.add_parser("faststart", help="move moov ahead of mdat")
+    p_fast.add_argument("video")
+    p_fast.add_argument("output", nargs="?", help="output file (default: rewrite in place)")
+    p_posters = sub.add_parser("posters", help="write the poster-frame manifest")
+    p_posters.add_argument("videos", nargs="+")
+    p_posters.add_argument("--manifest", default=DEFAULT_MANIFEST, help=f"output JSON (default: {DEFAULT_MANIFEST})")
+    p_posters.add_argument("--page", help="also add poster/preload=\"none\" to <video> tags in this page")
+    p_posters.add_argument("--out", default="build", help="directory for the rewritten page (default: build)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "inspect":
+            for i, path in enumerate(args.videos):
+                print(("\n" if i else "") + describe(open_movie(path)))
+        elif args.command == "faststart":
+            moved = faststart(args.video, args.output)
+            print(f"{args.output or args.video}: " + ("moov moved ahead of mdat" if moved else
+                                                      "already faststart" + (", copied" if args.output else "")))
+        else:
+            manifest = poster_manifest(args.videos)
+            with open(args.manifest, "w") as f:
+                json.dump(manifest, f, indent=1, sort_keys=True)
+            for video, entry in sorted(manifest.items()):
+                if entry["poster"] is None:
+                    print(f"missing poster {entry['expected_poster']} "
+                          f"(first keyframe at {entry['first_keyframe_time']} s of {video})")
+            print(f"wrote {args.manifest}")
+            if args.page:
+                with open(args.page, "r") as f:
+                    html = apply_posters(f.read(), manifest)
+                os.makedirs(args.out, exist_ok=True)
+                out_page = os.path.join(args.out, os.path.basename(args.page))
+                with open(out_page, "w") as f:
+                    f.write(html)
+                print(f"wrote {out_page}")
+    except Mp4Error as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
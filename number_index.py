@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Every number on the page and in the paper, and the numbers nobody checks.
+
+One regex pass per document tokenizes each number with its formatting:
+"~", thousands separators, a sign, and a unit ("%" or "\\%", "s", "ms",
+"tok/s", "x", and counts such as "tasks" or "steps"). Page tokens come from
+the visible text plus every Chart.js data point; paper tokens come from the
+expanded .tex source with comments, labels, citations and lengths skipped.
+
+A NumberIndex maps each normalized (value, unit) pair, and each bare value,
+to its occurrences with their offset and surrounding text, so checking one
+token is a dictionary lookup and the whole cross-check stays linear in the
+size of the documents.
+
+A page number is accounted for when the paper has the same value (in the
+same unit, or unitless on either side) or when some claim in claims.json
+produced it, e.g. a formula such as (Q1 + Q2) / tasks * 100. Everything
+else is an orphan: a figure on the page that nothing ties to the paper.
+
+    python number_index.py path/to/index.html path/to/example_paper.tex
+    python number_index.py ... --unchecked     # also list paper-backed numbers no claim covers
+    python number_index.py ... --jsonl -       # one JSON object per page number
+"""
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from claims import DEFAULT_CLAIMS_PATH
+from consistency import Residual
+from paper_index import DEFAULT_CACHE_DIR
+from verify_data import Documents, verify_documents
+
+CONTEXT_CHARS = 40
+
+# Unit spellings -> normalized unit. Count words are singular.
+UNITS = {
+    "%": "%", "\\%": "%", "percent": "%",
+    "tok/s": "tok/s", "ms": "ms", "s": "s", "sec": "s", "seconds": "s", "second": "s",
+    "minutes": "min", "minute": "min", "min": "min",
+    "x": "x", "×": "x", "$\\times$": "x", "k": "k", "K": "k", "M": "M",
+}
+COUNT_WORDS = ("tasks", "task", "steps", "step", "tool calls", "calls", "call", "models", "model",
+               "commits", "commit", "tokens", "token", "agents", "agent", "projects", "runs", "attempts")
+
+_APPROX = r"(?P<approx>(?:~|≈|&asymp;|&approx;|\$?\\sim\$?|\$?\\approx\$?)\s?)?"
+_VALUE = r"(?P<sign>[-−+](?=[\d.]))?(?P<value>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+)"
+_COUNT = r"\s(?P<count>" + "|".join(re.escape(w) for w in COUNT_WORDS) + r")\b"
+
+
+def _number_pattern(units):
+    unit = "|".join(re.escape(u) for u in sorted(units, key=len, reverse=True))
+    # Not part of an identifier such as GPT-5, Q1 or v4.5.1.
+    return (r"(?<![\w.])(?<![A-Za-z]-)" + _APPROX + _VALUE
+            + r"(?:(?P<unit>\s?(?:" + unit + r"))(?![\w])|" + _COUNT + r"|(?![\w]))")
+
+
+# Tags, scripts, styles, comments and entities carry no visible numbers.
+_HTML_TOKEN = re.compile(
+    r"(?P<number>" + _number_pattern([u for u in UNITS if u != "\\%" and "$" not in u]) + r")"
+    r"|<script\b.*?</script\s*>|<style\b.*?</style\s*>|<!--.*?-->|<[^>]*>|&\#?\w+;",
+    re.S | re.I)
+
+# A bare % starts a comment in LaTeX, so only \% is a percent sign there.
+_TEX_TOKEN = re.compile(
+    r"(?<!\\)%[^\n]*"
+    r"|\d*\.?\d+\s*(?:pt|em|ex|cm|mm|in|bp)\b"
+    r"|\d*\.?\d+\\(?:textwidth|linewidth|columnwidth|textheight)"
+    r"|(?P<number>" + _number_pattern([u for u in UNITS if u != "%"]) + r")"
+    r"|\\(?:label|ref|eqref|autoref|cref|Cref|cite\w*|input|include|usepackage|documentclass|begin|end"
+    r"|includegraphics|url|href|bibliography\w*|multirow|multicolumn)\*?(?:\[[^\][]*\])?\{[^{}]*\}"
+    r"|\\(?:hspace|vspace|setlength|resizebox|scalebox)\*?\{[^{}]*\}"
+    r"|\\[A-Za-z]+")
+
+# Whole tags, and the halves of tags cut off at the edges of a context window.
+_TAG = re.compile(r"<[^>]*>|^[^<>]*>|<[^<>]*$")
+
+
+def normalize(raw):
+    """Canonical decimal text: "1,599,945" -> "1599945", "46.20" -> "46.2"."""
+    try:
+        value = Decimal(raw.replace(",", "").replace("−", "-"))
+    except InvalidOperation:
+        return raw
+    text = format(value.normalize(), "f")
+    return "0" if text in ("-0", "+0") else text.lstrip("+")
+
+
+@dataclass
+class NumberToken:
+    raw: str
+    value: str
+    unit: str
+    offset: int
+    context: str = ""
+    approx: bool = False
+    grouped: bool = False
+    # (path, offset) in the original file; the paper's offsets are into its expanded text.
+    at: tuple = None
+    source: str = "text"
+
+    @property
+    def key(self):
+        return (self.value, self.unit)
+
+
+def _token(m, text, clean_context):
+    unit_raw = m.group("unit")
+    if unit_raw is not None:
+        unit = UNITS[unit_raw.strip()]
+    elif m.group("count") is not None:
+        unit = m.group("count").rstrip("s") if m.group("count") != "tool calls" else "tool call"
+    else:
+        unit = ""
+    digits = m.group("value")
+    sign = "-" if m.group("sign") in ("-", "−") else ""
+    start, end = m.start(), m.end()
+    context = clean_context(text[max(0, start - CONTEXT_CHARS):end + CONTEXT_CHARS])
+    return NumberToken(m.group().strip(), normalize(sign + digits), unit, start, context,
+                       bool(m.group("approx")), "," in digits)
+
+
+def _collapse(text):
+    return " ".join(text.split())
+
+
+def tokenize_html(source):
+    """Numbers in the visible text of a page, in order."""
+    clean = lambda s: _collapse(_TAG.sub(" ", s))
+    return [_token(m, source, clean) for m in _HTML_TOKEN.finditer(source) if m.group("number")]
+
+
+def tokenize_tex(text):
+    """Numbers in LaTeX source outside comments, references and lengths, in order."""
+    return [_token(m, text, _collapse) for m in _TEX_TOKEN.finditer(text) if m.group("number")]
+
+
+def tokenize_value(text):
+    """Tokens of a short value such as "46.2%" or "1,599,945"."""
+    return tokenize_html(str(text))
+
+
+def ignorable(token):
+    """Bare small integers and years: list numbering, figure numbers and dates."""
+    if token.unit or token.approx or "." in token.value:
+        return False
+    try:
+        number = int(token.value)
+    except ValueError:
+        return False
+    return 0 <= number < 10 or 1900 <= number <= 2099
+
+
+# ------------------------------------------------------------
+# Index
+# ------------------------------------------------------------
+
+def compatible(a, b):
+    """Units that may describe the same figure: equal, or one side unitless or a count."""
+    return a == b or not a or not b or a not in UNITS.values() or b not in UNITS.values()
+
+
+class NumberIndex:
+    """Occurrences of every number in one document, keyed by (value, unit) and by value."""
+
+    def __init__(self, tokens=(), path=None):
+        self.path = path
+        self.tokens = []
+        self.by_key = {}
+        self.by_value = {}
+        for token in tokens:
+            self.add(token)
+
+    def add(self, token):
+        self.tokens.append(token)
+        self.by_key.setdefault(token.key, []).append(token)
+        self.by_value.setdefault(token.value, {}).setdefault(token.unit, []).append(token)
+
+    def lookup(self, token):
+        """Occurrences of the same figure: exact (value, unit) first, else any compatible unit."""
+        exact = self.by_key.get(token.key)
+        if exact:
+            return exact
+        for unit, found in self.by_value.get(token.value, {}).items():
+            if compatible(unit, token.unit):
+                return found
+        return []
+
+    def __contains__(self, token):
+        return bool(self.lookup(token))
+
+    def __len__(self):
+        return len(self.tokens)
+
+
+def website_numbers(website):
+    """NumberIndex of a WebsiteIndex: visible text plus every chart data point."""
+    index = NumberIndex(path=website.path)
+    for token in tokenize_html(website.source):
+        token.at = website.locate(token.offset)
+        index.add(token)
+    for chart in website.charts.values():
+        for dataset in chart.datasets:
+            for label, point in zip(chart.labels, dataset.points):
+                label = label if isinstance(label, str) else ""
+                index.add(NumberToken(point.raw, normalize(point.raw), "", point.offset,
+                                      f"chart {chart.canvas_id}: {dataset.label} / {label}",
+                                      at=website.locate(point.offset), source="chart"))
+    return index
+
+
+def paper_numbers(paper):
+    """NumberIndex of a PaperIndex over its expanded text."""
+    index = NumberIndex(path=paper.root_path)
+    for token in tokenize_tex(paper.text):
+        token.at = paper.locate(token.offset)
+        index.add(token)
+    return index
+
+
+def derived_numbers(results):
+    """Every value the claims produced: checked literals, table cells and formula results."""
+    index = NumberIndex()
+    for result in results:
+        values = [result.website, result.paper]
+        if isinstance(result, Residual):
+            values += [f"{v:.1f}" for v in (result.lhs, result.rhs) if v == v]
+        for value in values:
+            for token in tokenize_value(value):
+                token.source = f"claim: {result.description}"
+                index.add(token)
+    return index
+
+
+# ------------------------------------------------------------
+# Orphan report
+# ------------------------------------------------------------
+
+@dataclass
+class Classified:
+    token: NumberToken
+    # "paper", "derived" or "orphan"
+    status: str
+    paper: list = field(default_factory=list)
+    checked: bool = False
+
+
+def classify(website, paper, derived, keep_all=False):
+    """Status of every page number; bare small integers and years are dropped unless keep_all."""
+    out = []
+    for token in website.tokens:
+        if not keep_all and ignorable(token):
+            continue
+        found = paper.lookup(token)
+        checked = token in derived
+        status = "paper" if found else "derived" if checked else "orphan"
+        out.append(Classified(token, status, found, checked))
+    return out
+
+
+def render(classified, show_unchecked=False):
+    lines = ["=" * 70, "PAGE NUMBERS NOT FOUND IN THE PAPER OR DERIVED BY A CLAIM", "=" * 70]
+    orphans = [c for c in classified if c.status == "orphan"]
+    for c in orphans:
+        t = c.token
+        lines.append(f"  {t.raw:<14} offset {t.offset:<7} ...{t.context}...")
+    if not orphans:
+        lines.append("  (none)")
+    if show_unchecked:
+        unchecked = [c for c in classified if c.status == "paper" and not c.checked]
+        lines += ["", "=" * 70, "IN THE PAPER BUT NOT COVERED BY ANY CLAIM", "=" * 70]
+        for c in unchecked:
+            t, p = c.token, c.paper[0]
+            lines.append(f"  {t.raw:<14} offset {t.offset:<7} ...{t.context}...")
+            lines.append(f"  {'':<14} paper: {p.raw} ...{p.context}...")
+    counts = {s: sum(1 for c in classified if c.status == s) for s in ("paper", "derived", "orphan")}
+    lines += ["", "-" * 70,
+              f"Page numbers: {len(classified)}  in paper: {counts['paper']}  "
+              f"derived: {counts['derived']}  orphans: {counts['orphan']}  "
+              f"claim-checked: {sum(1 for c in classified if c.checked)}"]
+    return "\n".join(lines)
+
+
+def record(c):
+    t = c.token
+    return {"type": "number", "raw": t.raw, "value": t.value, "unit": t.unit, "status": c.status,
+            "checked": c.checked, "approx": t.approx, "grouped": t.grouped, "source": t.source,
+            "at": {"path": t.at[0], "offset": t.at[1]} if t.at else None, "context": t.context,
+            "paper_at": [{"path": p.at[0], "offset": p.at[1]} for p in c.paper[:3] if p.at]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List numbers on the page that nothing ties to the paper.")
+    parser.add_argument("website", help="path to index.html")
+    parser.add_argument("paper", help="path to the root .tex file of the paper")
+    parser.add_argument("--claims", default=DEFAULT_CLAIMS_PATH, help="claims file (default: claims.json)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="parsed-table cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the parse cache")
+    parser.add_argument("--all", action="store_true", help="keep bare integers under 10 and years")
+    parser.add_argument("--unchecked", action="store_true", help="also list paper-backed numbers no claim covers")
+    parser.add_argument("--jsonl", metavar="PATH", help="write one JSON object per page number ('-' for stdout)")
+    parser.add_argument("--strict", action="store_true", help="exit 1 when any orphan is found")
+    args = parser.parse_args(argv)
+
+    with open(args.website, "r") as f:
+        source = f.read()
+    documents = Documents(source, None, args.website, args.paper, None if args.no_cache else args.cache_dir)
+    report = verify_documents(documents, args.claims)
+    classified = classify(website_numbers(documents.website), paper_numbers(documents.paper),
+                          derived_numbers(report.results), args.all)
+    if args.jsonl:
+        out = sys.stdout if args.jsonl == "-" else open(args.jsonl, "w")
+        try:
+            for c in classified:
+                out.write(json.dumps(record(c)) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    if args.jsonl != "-":
+        print(render(classified, args.unchecked))
+    orphans = sum(1 for c in classified if c.status == "orphan")
+    return 1 if args.strict and orphans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,508 @@
+"""
+Structured index of a LaTeX paper split across \\input / \\include files.
+
+Each source file is scanned once into a short list of events (includes,
+table environments, captions, labels and parsed tabular rows). The events
+are cached on disk under the file's content hash, so a repeat run only
+re-parses files that changed. Includes are followed lazily: asking for one
+table reads files only until that table has been seen.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+
+from literal_matcher import first_containing, scan_literals
+
+PARSER_VERSION = 3
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".verify_cache")
+
+# One alternation, scanned left to right: comments are consumed first so
+# that anything commented out never produces an event.
+# Bracketed arguments exclude their own opening delimiter, so an unclosed
+# "\label{" stops at the next brace instead of rescanning the rest of the file.
+_EVENT_PATTERN = re.compile(r"""
+    (?P<comment>(?<!\\)%[^\n]*)
+  | \\(?P<include>input|include)\s*\{(?P<include_name>[^{}]*)\}
+  | \\begin\{(?P<begin_table>table\*?)\}
+  | \\end\{(?P<end_table>table\*?)\}
+  | \\(?P<caption>caption)(?:\[[^\][]*\])?\s*\{
+  | \\label\{(?P<label>[^{}]*)\}
+  | \\begin\{(?P<tabular>tabular[x*]?)\}
+""", re.X)
+
+_RULES = re.compile(r"\\(?:toprule|midrule|bottomrule|hline|cline\{[^{}]*\}|cmidrule(?:\([^()]*\))?\{[^{}]*\})")
+_ROW_SPLIT = re.compile(r"\\\\(?:\s*\[[^\][]*\])?")
+_CELL_SPLIT = re.compile(r"(?<!\\)&")
+_FORMATTING = re.compile(r"\\(?:textbf|textit|emph|underline|mathbf|mathrm|text|textsc|textrm|texttt)\s*\{([^{}]*)\}")
+_MULTIROW = re.compile(r"^\\multirow\s*\{(\d+)\}\s*\{[^}]*\}\s*\{(.*)\}$", re.S)
+_MULTICOLUMN = re.compile(r"^\\multicolumn\s*\{(\d+)\}\s*\{[^}]*\}\s*\{(.*)\}$", re.S)
+_NUMBER = re.compile(r"^[~\u2248]?(-?\d[\d,]*(?:\.\d+)?|-?\.\d+)\s*(%?)$")
+
+
+def _braced(text, start):
+    """Return (content, end) of the brace group opening at text[start].
+
+    An unclosed group ends at the end of its line, so it cannot swallow the
+    labels and tables that follow it.
+    """
+    depth = 0
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:i], i + 1
+        i += 1
+    end = text.find("\n", start)
+    end = len(text) if end < 0 else end
+    return text[start + 1:end], end
+
+
+def clean_cell(raw):
+    """Normalise one cell's LaTeX to plain text: formatting stripped, \\% -> %."""
+    text = raw.strip()
+    previous = None
+    while previous != text:
+        previous = text
+        text = _FORMATTING.sub(r"\1", text)
+    text = text.replace("\\%", "%").replace("\\&", "&").replace("\\_", "_").replace("\\#", "#")
+    text = text.replace("$", "").replace("~", " ")
+    text = re.sub(r"\\[,;!: ]", " ", text)
+    text = text.replace("{", "").replace("}", "")
+    return " ".join(text.split())
+
+
+def parse_tabular(body):
+    """Split a tabular body into rows of [text, offset] cells and rule flags."""
+    rows = []
+    rule_pending = False
+    position = 0
+    for chunk in _ROW_SPLIT.split(body):
+        chunk_offset = body.find(chunk, position) if chunk else position
+        position = chunk_offset + len(chunk)
+        stripped = _RULES.sub(lambda r: " " * len(r.group()), chunk)
+        if _RULES.search(chunk):
+            rule_pending = True
+        if not stripped.strip():
+            continue
+        cells = []
+        cell_pos = 0
+        for raw in _CELL_SPLIT.split(stripped):
+            cells.append([raw, chunk_offset + cell_pos + len(raw) - len(raw.lstrip())])
+            cell_pos += len(raw) + 1
+        rows.append({"cells": cells, "rule_before": rule_pending})
+        rule_pending = False
+    return rows
+
+
+def scan_events(text):
+    """One pass over a .tex source, returning JSON-serialisable events."""
+    events = []
+    pos = 0
+    while True:
+        m = _EVENT_PATTERN.search(text, pos)
+        if m is None:
+            break
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "comment":
+            continue
+        if m.group("include"):
+            name = m.group("include_name").strip()
+            events.append(["input", name, m.start(), m.end()])
+        elif m.group("begin_table"):
+            events.append(["begin_table", m.start()])
+        elif m.group("end_table"):
+            events.append(["end_table", m.start()])
+        elif m.group("caption"):
+            content, pos = _braced(text, m.end() - 1)
+            events.append(["caption", clean_cell(content), m.start()])
+        elif m.group("label"):
+            events.append(["label", m.group("label").strip(), m.start()])
+        elif m.group("tabular"):
+            env = m.group("tabular")
+            end_tag = "\\end{%s}" % env
+            cursor = m.end()
+            # Skip the width argument of tabular*/tabularx and the column spec.
+            for _ in range(2 if env != "tabular" else 1):
+                while cursor < len(text) and text[cursor].isspace():
+                    cursor += 1
+                if cursor < len(text) and text[cursor] == "{":
+                    _, cursor = _braced(text, cursor)
+            end = text.find(end_tag, cursor)
+            end = len(text) if end < 0 else end
+            # Blank out comments in place so cell offsets still point into the file.
+            body = re.sub(r"(?<!\\)%[^\n]*", lambda c: " " * len(c.group()), text[cursor:end])
+            rows = parse_tabular(body)
+            for row in rows:
+                for cell in row["cells"]:
+                    cell[1] += cursor
+            events.append(["tabular", rows, m.start()])
+            pos = end + len(end_tag)
+    return events
+
+
+@dataclass
+class Cell:
+    text: str
+    offset: int
+    span: int = 1
+
+    @property
+    def number(self):
+        """Numeric value of the cell, or None when it is not a plain number."""
+        m = _NUMBER.match(self.text)
+        if not m:
+            return None
+        raw = m.group(1).replace(",", "")
+        return float(raw) if "." in raw else int(raw)
+
+    @property
+    def is_percent(self):
+        m = _NUMBER.match(self.text)
+        return bool(m and m.group(2))
+
+
+@dataclass
+class Row:
+    cells: list
+    group: str = ""
+    rule_before: bool = False
+
+    @property
+    def texts(self):
+        return [c.text for c in self.cells]
+
+    def cells_after(self, key):
+        """Cells to the right of the cell reading `key`."""
+        texts = self.texts
+        return self.cells[texts.index(key) + 1:] if key in texts else []
+
+    def after(self, key):
+        return [c.text for c in self.cells_after(key)]
+
+
+@dataclass
+class Table:
+    path: str
+    offset: int
+    caption: str = ""
+    label: str = ""
+    columns: list = field(default_factory=list)
+    rows: list = field(default_factory=list)
+
+    def row(self, key, group=None):
+        """First body row holding a cell equal to `key`, optionally within `group`."""
+        for row in self.rows:
+            if key not in row.texts:
+                continue
+            if group is None or group in row.group or group in row.texts:
+                return row
+        return None
+
+    def column(self, name):
+        return self.columns.index(name) if name in self.columns else None
+
+
+def _build_table(tabulars, caption, label):
+    # Cell offsets point into the file holding the tabular, which may be an
+    # \input of the file holding the caption.
+    path, (_, _, offset) = tabulars[0]
+    table = Table(path, offset, caption, label)
+    raw_rows = [row for _, (_, rows, _) in tabulars for row in rows]
+    has_rules = any(row["rule_before"] for row in raw_rows[1:])
+    carry = {}
+    group = ""
+    for i, raw in enumerate(raw_rows):
+        cells = []
+        for text, cell_offset in raw["cells"]:
+            text = text.strip()
+            span_rows = 1
+            m = _MULTIROW.match(text)
+            if m:
+                span_rows, text = int(m.group(1)), m.group(2)
+            m = _MULTICOLUMN.match(text)
+            if m:
+                width, text = int(m.group(1)), m.group(2)
+                cells.append(Cell(clean_cell(text), cell_offset, width))
+                cells.extend(Cell("", cell_offset) for _ in range(width - 1))
+                continue
+            column = len(cells)
+            cell = Cell(clean_cell(text), cell_offset)
+            if span_rows > 1:
+                carry[column] = [cell.text, span_rows - 1]
+            elif not cell.text and column in carry and carry[column][1] > 0:
+                cell = Cell(carry[column][0], cell_offset)
+                carry[column][1] -= 1
+            cells.append(cell)
+        if i == 0 and (has_rules or len(raw_rows) > 1):
+            table.columns = [c.text for c in cells]
+            continue
+        non_empty = [c for c in cells if c.text]
+        if len(non_empty) == 1 and non_empty[0].span > 1:
+            # A full-width \multicolumn row introduces a group (e.g. "SGLang").
+            group = non_empty[0].text
+            continue
+        row_group = group
+        for column, (text, _) in carry.items():
+            if column < len(cells) and cells[column].text == text:
+                row_group = text
+        table.rows.append(Row(cells, row_group, raw["rule_before"]))
+    return table
+
+
+class PaperIndex:
+    """Tables and text of a LaTeX paper rooted at `root_path`, parsed lazily and cached."""
+
+    def __init__(self, root_path, cache_dir=DEFAULT_CACHE_DIR, sources=None, loader=None, memo=None):
+        self.root_path = os.path.abspath(root_path)
+        self.base_dir = os.path.dirname(self.root_path)
+        self.cache_dir = cache_dir
+        # In-memory file contents (e.g. an unsaved root file); anything else comes from
+        # `loader(path)` -> text or None when given (e.g. git blobs), else from disk.
+        self._sources = {os.path.abspath(path): text for path, text in (sources or {}).items()}
+        self._loader = loader
+        # Events by content digest, shared between indexes of different revisions.
+        self._memo = memo
+        self._events = {}
+        self._tables = []
+        self._walker = self._walk_tables()
+        self._complete = False
+        self._text = None
+        self._segments = []
+        self.literals = None
+
+    # -- file level -------------------------------------------------
+
+    def resolve(self, name):
+        path = os.path.join(self.base_dir, name)
+        if not os.path.splitext(path)[1]:
+            path += ".tex"
+        return path
+
+    def _load(self, path):
+        """Contents of `path`, or None if it does not exist."""
+        if path not in self._sources:
+            if self._loader is not None:
+                text = self._loader(path)
+            elif os.path.exists(path):
+                with open(path, "r") as f:
+                    text = f.read()
+            else:
+                text = None
+            if text is None:
+                return None
+            self._sources[path] = text
+        return self._sources[path]
+
+    def exists(self, path):
+        return self._load(path) is not None
+
+    def source(self, path):
+        text = self._load(path)
+        if text is None:
+            raise FileNotFoundError(path)
+        return text
+
+    def events(self, path):
+        """Events of one file, from the on-disk cache when its content hash is known."""
+        if path in self._events:
+            return self._events[path]
+        text = self.source(path)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if self._memo is not None and digest in self._memo:
+            self._events[path] = self._memo[digest]
+            return self._events[path]
+        cache_path = None
+        if self.cache_dir:
+            cache_path = os.path.join(self.cache_dir, f"tex-v{PARSER_VERSION}-{digest}.json")
+            try:
+                with open(cache_path, "r") as f:
+                    self._events[path] = json.load(f)
+                if self._memo is not None:
+                    self._memo[digest] = self._events[path]
+                return self._events[path]
+            except (OSError, ValueError):
+                pass
+        events = scan_events(text)
+        if cache_path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(events, f)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+        self._events[path] = events
+        if self._memo is not None:
+            self._memo[digest] = events
+        return events
+
+    def _walk_events(self, path, seen):
+        if path in seen:
+            return
+        if not self.exists(path):
+            return
+        seen.add(path)
+        for event in self.events(path):
+            if event[0] == "input":
+                yield from self._walk_events(self.resolve(event[1]), seen)
+            else:
+                yield path, event
+
+    def _reach(self):
+        """(existing, missing) files reachable from the root, in first-visit order."""
+        found, missing, seen = [], [], set()
+
+        def walk(path):
+            if path in seen:
+                return
+            seen.add(path)
+            if not self.exists(path):
+                missing.append(path)
+                return
+            found.append(path)
+            for event in self.events(path):
+                if event[0] == "input":
+                    walk(self.resolve(event[1]))
+        walk(self.root_path)
+        return found, missing
+
+    def files(self):
+        """Every existing file reachable from the root through \\input/\\include, root first."""
+        return self._reach()[0]
+
+    @property
+    def missing(self):
+        """Reachable files that do not exist: the root itself, or an \\input target."""
+        return self._reach()[1]
+
+    # -- tables -----------------------------------------------------
+
+    def _walk_tables(self):
+        env = None
+        for path, event in self._walk_events(self.root_path, set()):
+            kind = event[0]
+            if kind == "begin_table":
+                env = {"caption": "", "label": "", "tabulars": []}
+            elif kind == "end_table" and env is not None:
+                if env["tabulars"]:
+                    yield _build_table(env["tabulars"], env["caption"], env["label"])
+                env = None
+            elif kind == "caption" and env is not None:
+                env["caption"] = event[1]
+            elif kind == "label" and env is not None:
+                env["label"] = event[1]
+            elif kind == "tabular":
+                if env is not None:
+                    env["tabulars"].append((path, event))
+                else:
+                    yield _build_table([(path, event)], "", "")
+
+    def _pull(self):
+        try:
+            self._tables.append(next(self._walker))
+            return True
+        except StopIteration:
+            self._complete = True
+            return False
+
+    @property
+    def tables(self):
+        while not self._complete and self._pull():
+            pass
+        return self._tables
+
+    def table(self, caption=None, label=None):
+        """First table whose label equals `label` or whose caption contains `caption`."""
+        def matches(t):
+            return (label is not None and t.label == label) or (caption is not None and caption in t.caption)
+        for t in self._tables:
+            if matches(t):
+                return t
+        while not self._complete and self._pull():
+            if matches(self._tables[-1]):
+                return self._tables[-1]
+        return None
+
+    def tables_captioned(self, captions):
+        """Map each caption to the first table whose caption contains it.
+
+        One scan over every caption instead of a search per caption, at the
+        cost of reading the whole paper; a single caption still stops early.
+        """
+        if len(captions) == 1:
+            return {captions[0]: self.table(caption=captions[0])}
+        tables = self.tables
+        found = first_containing([t.caption for t in tables], [c for c in captions if "\n" not in c])
+        return {c: tables[found[c]] if c in found else self.table(caption=c) for c in captions}
+
+    # -- text -------------------------------------------------------
+
+    def _expand(self, path, seen, pieces, start):
+        """Append `path` with its includes spliced in; return the new expanded length."""
+        if path in seen or not self.exists(path):
+            return start
+        seen.add(path)
+        text = self.source(path)
+        last = 0
+        for event in self.events(path):
+            if event[0] == "input":
+                start = self._piece(pieces, path, text, last, event[2], start)
+                start = self._expand(self.resolve(event[1]), seen, pieces, start)
+                last = event[3]
+        return self._piece(pieces, path, text, last, len(text), start)
+
+    def _piece(self, pieces, path, text, begin, end, start):
+        pieces.append(text[begin:end])
+        self._segments.append((start, path, begin))
+        return start + end - begin
+
+    @property
+    def text(self):
+        """Full paper source with every include expanded in place."""
+        if self._text is None:
+            pieces = []
+            self._segments = []
+            self._expand(self.root_path, set(), pieces, 0)
+            self._text = "".join(pieces)
+        return self._text
+
+    def locate(self, offset):
+        """Map an offset in the expanded text to (file path, offset in that file)."""
+        self.text
+        i = bisect.bisect_right(self._segments, (offset, chr(0x10FFFF))) - 1
+        if i < 0:
+            return (self.root_path, offset)
+        start, path, begin = self._segments[i]
+        return (path, begin + offset - start)
+
+    def scan_literals(self, needles):
+        """Find every needle in the expanded text in one pass."""
+        self.literals = scan_literals(self.text, needles)
+        return self.literals
+
+    def find(self, needle):
+        """Offset of the first occurrence of `needle` in the expanded text, or None."""
+        if self.literals is not None and needle in self.literals:
+            return self.literals.first(needle)
+        offset = self.text.find(needle)
+        return None if offset < 0 else offset
+
+    def contains(self, needle):
+        return self.find(needle) is not None
+
+
+def build_paper_index(root_path, cache_dir=DEFAULT_CACHE_DIR, sources=None, loader=None, memo=None):
+    return PaperIndex(root_path, cache_dir, sources, loader, memo)
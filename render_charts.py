@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Pre-render the page's Chart.js bar charts to inline SVG at build time.
+
+The chart definitions are read with website_index's Chart.js literal parser,
+so labels, datasets and colors come from the same `agents`, `colors` and
+`defaultOptions` bindings the page script uses. Spread options
+(`...defaultOptions.scales`) are merged the way the browser would. Each
+<canvas> is preceded by an SVG with the title, legend, y-axis ticks, grid and
+bars, and every bar carries a <title> so hovering shows its value without JS.
+
+By default Chart.js stays as a progressive enhancement: its script is
+deferred, and when it loads it adds `chartjs` to <html>, which swaps the SVGs
+for the interactive canvases before the page script draws them. With
+--static the Chart.js script and the chart script are removed.
+
+    python render_charts.py [index.html] [--out build] [--static]
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+from html import escape
+from html.parser import HTMLParser
+
+from website_index import DataPoint, Ref, _resolve, build_website_index
+
+# viewBox width per chart container class; Chart.js bar charts default to a 2:1 aspect ratio.
+WIDTH_BY_CLASS = {"chart-container-wide": 700, "chart-container": 460}
+DEFAULT_WIDTH = 600
+ASPECT_RATIO = 2.0
+
+FONT = "Inter, sans-serif"
+TEXT_COLOR = "#666"
+GRID_COLOR = "rgba(0,0,0,0.1)"
+# Average advance of Inter glyphs, in em, for laying out text without a font engine.
+CHAR_WIDTH = 0.56
+
+CHARTJS_SCRIPT = re.compile(r"(^|/)chart(\.umd)?(\.min)?\.js$")
+SWAP_CSS = (".chart-svg{display:block;width:100%;height:auto}.chart-svg+canvas{display:none}"
+            ".chartjs .chart-svg{display:none}.chartjs .chart-svg+canvas{display:block}")
+
+
+# ------------------------------------------------------------
+# Options
+# ------------------------------------------------------------
+
+def resolved(value, bindings):
+    """A parsed literal with Refs looked up and `...spread` entries merged underneath own keys."""
+    if isinstance(value, Ref):
+        target = _resolve(value, bindings)
+        return value if target is value else resolved(target, bindings)
+    if isinstance(value, list):
+        return [resolved(v, bindings) for v in value]
+    if isinstance(value, dict):
+        out = {}
+        for spread in value.get("...", []):
+            base = resolved(spread, bindings)
+            if isinstance(base, dict):
+                out.update(base)
+        for key, v in value.items():
+            if key != "...":
+                out[key] = resolved(v, bindings)
+        return out
+    return value
+
+
+def option(config, path, default=None):
+    """config["a"]["b"]... for "a.b..." with DataPoints unwrapped to floats."""
+    value = config
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value.value if isinstance(value, DataPoint) else value
+
+
+def _font_size(config, path, default=12):
+    size = option(config, path + ".font.size")
+    return size if isinstance(size, (int, float)) else default
+
+
+def _js_number(value):
+    """How JavaScript prints a number: 80.0 -> "80", 46.2 -> "46.2"."""
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+# ------------------------------------------------------------
+# Layout
+# ------------------------------------------------------------
+
+def text_width(text, size):
+    return len(text) * size * CHAR_WIDTH
+
+
+def nice_step(span, max_ticks):
+    """Chart.js-style tick spacing: 1, 2, 5 or 10 times a power of ten."""
+    raw = span / max(1, max_ticks - 1)
+    power = 10 ** math.floor(math.log10(raw)) if raw > 0 else 1
+    for factor in (1, 2, 5, 10):
+        if raw <= factor * power:
+            return factor * power
+    return 10 * power
+
+
+def ticks(top, plot_height, font_size):
+    max_ticks = min(11, max(2, int(plot_height / (font_size * 2.5)) + 1))
+    step = nice_step(top, max_ticks)
+    values = [i * step for i in range(int(top / step + 1e-9) + 1)]
+    if top - values[-1] > step * 0.25:
+        values.append(top)
+    elif values[-1] != top:
+        values[-1] = top
+    return values
+
+
+def _fmt(n):
+    return f"{n:.1f}".rstrip("0").rstrip(".")
+
+
+def _bar_path(x, y, w, h, radius):
+    """A bar with its top corners rounded and its base square, like borderSkipped: 'start'."""
+    r = max(0.0, min(radius, w / 2, h))
+    if r == 0:
+        return f"M{_fmt(x)} {_fmt(y + h)}V{_fmt(y)}H{_fmt(x + w)}V{_fmt(y + h)}Z"
+    return (f"M{_fmt(x)} {_fmt(y + h)}V{_fmt(y + r)}Q{_fmt(x)} {_fmt(y)} {_fmt(x + r)} {_fmt(y)}"
+            f"H{_fmt(x + w - r)}Q{_fmt(x + w)} {_fmt(y)} {_fmt(x + w)} {_fmt(y + r)}V{_fmt(y + h)}Z")
+
+
+def render_svg(chart, bindings, width=DEFAULT_WIDTH):
+    """SVG markup for one bar chart, or None when it is not a bar chart."""
+    config = resolved(chart.config, bindings)
+    if option(config, "type") != "bar":
+        return None
+    options = option(config, "options", {})
+    height = width / ASPECT_RATIO
+    stacked = bool(option(options, "scales.x.stacked") or option(options, "scales.y.stacked"))
+    percent = "%" in getattr(option(options, "scales.y.ticks.callback"), "source", "")
+    labels = [str(label) for label in chart.labels]
+    datasets = [(ds.label, ds.values, str(resolved(ds.options.get("backgroundColor"), bindings) or "#999"),
+                 option(ds.options, "borderRadius", 0) or 0, bool(ds.options.get("isCount")))
+                for ds in chart.datasets]
+
+    parts = []
+    top = 8.0
+    title = option(options, "plugins.title.text") if option(options, "plugins.title.display") else None
+    if title:
+        size = _font_size(options, "plugins.title", 12)
+        weight = option(options, "plugins.title.font.weight", "bold")
+        top += 10
+        parts.append(f'<text x="{_fmt(width / 2)}" y="{_fmt(top + size * 0.8)}" text-anchor="middle" '
+                     f'font-size="{size}" font-weight="{weight}">{escape(str(title))}</text>')
+        top += size + 10
+
+    if option(options, "plugins.legend.display", True) is not False:
+        size = _font_size(options, "plugins.legend.labels", 12)
+        box = option(options, "plugins.legend.labels.boxWidth", 40)
+        pad = option(options, "plugins.legend.labels.padding", 10)
+        items = [(label, color, box + size / 2 + text_width(label, size)) for label, _, color, _, _ in datasets]
+        rows, row = [], []
+        for item in items:
+            if row and sum(w for _, _, w in row) + pad * len(row) + item[2] > width - 16:
+                rows.append(row)
+                row = []
+            row.append(item)
+        rows.append(row)
+        top += pad
+        for row in rows:
+            x = (width - sum(w for _, _, w in row) - pad * (len(row) - 1)) / 2
+            for label, color, w in row:
+                parts.append(f'<rect x="{_fmt(x)}" y="{_fmt(top)}" width="{_fmt(box)}" height="{_fmt(size)}" '
+                             f'fill="{escape(color)}"/>')
+                parts.append(f'<text x="{_fmt(x + box + size / 2)}" y="{_fmt(top + size * 0.85)}" '
+                             f'font-size="{size}">{escape(label)}</text>')
+                x += w + pad
+            top += size + pad
+
+    y_size = _font_size(options, "scales.y.ticks", 12)
+    x_size = _font_size(options, "scales.x.ticks", 12)
+    if stacked:
+        data_max = max((sum(values[i] for _, values, _, _, _ in datasets if i < len(values))
+                        for i in range(len(labels))), default=0)
+    else:
+        data_max = max((v for _, values, _, _, _ in datasets for v in values), default=0)
+    y_max = option(options, "scales.y.max")
+    y_max = y_max if isinstance(y_max, (int, float)) else data_max
+    bottom = height - 8 - x_size - 6
+    tick_values = ticks(y_max, bottom - top, y_size) if y_max > 0 else [0]
+    suffix = "%" if percent else ""
+    tick_labels = [_js_number(round(v, 10)) + suffix for v in tick_values]
+    left = 8 + max(text_width(t, y_size) for t in tick_labels) + 8
+    right = width - 8
+    plot_h = bottom - top
+
+    def y_of(v):
+        return bottom - (v / y_max * plot_h if y_max else 0)
+
+    for v, label in zip(tick_values, tick_labels):
+        y = y_of(v)
+        parts.append(f'<line x1="{_fmt(left)}" y1="{_fmt(y)}" x2="{_fmt(right)}" y2="{_fmt(y)}" '
+                     f'stroke="{GRID_COLOR}"/>')
+        parts.append(f'<text x="{_fmt(left - 8)}" y="{_fmt(y + y_size * 0.35)}" text-anchor="end" '
+                     f'font-size="{y_size}">{escape(label)}</text>')
+
+    # Chart.js defaults: categoryPercentage 0.8, barPercentage 0.9.
+    category = (right - left) / max(1, len(labels))
+    for i, label in enumerate(labels):
+        cx = left + category * (i + 0.5)
+        parts.append(f'<text x="{_fmt(cx)}" y="{_fmt(bottom + 6 + x_size * 0.85)}" text-anchor="middle" '
+                     f'font-size="{x_size}">{escape(label)}</text>')
+        if stacked:
+            w = category * 0.8 * 0.9
+            base = 0.0
+            for ds_label, values, color, radius, is_count in datasets:
+                v = values[i] if i < len(values) else 0
+                if v:
+                    parts.append(_bar(cx - w / 2, y_of(base + v), w, y_of(base) - y_of(base + v), radius,
+                                      color, f"{label} - {ds_label}: {_js_number(v)}{'' if is_count else '%'}"))
+                base += v
+        else:
+            group = category * 0.8
+            slot = group / max(1, len(datasets))
+            for j, (ds_label, values, color, radius, is_count) in enumerate(datasets):
+                v = values[i] if i < len(values) else 0
+                if v:
+                    x = cx - group / 2 + slot * j + slot * 0.05
+                    parts.append(_bar(x, y_of(v), slot * 0.9, bottom - y_of(v), radius,
+                                      color, f"{label} - {ds_label}: {_js_number(v)}{'' if is_count else '%'}"))
+    parts.append(f'<line x1="{_fmt(left)}" y1="{_fmt(bottom)}" x2="{_fmt(right)}" y2="{_fmt(bottom)}" '
+                 f'stroke="{GRID_COLOR}"/>')
+
+    label = escape(str(title or chart.canvas_id), quote=True)
+    return (f'<svg class="chart-svg" data-chart="{escape(chart.canvas_id, quote=True)}" role="img" '
+            f'aria-label="{label}" viewBox="0 0 {_fmt(width)} {_fmt(height)}" '
+            f'xmlns="http://www.w3.org/2000/svg" font-family="{FONT}" fill="{TEXT_COLOR}">'
+            + "".join(parts) + "</svg>")
+
+
+def _bar(x, y, w, h, radius, color, tip):
+    return (f'<path d="{_bar_path(x, y, w, h, radius)}" fill="{escape(color, quote=True)}">'
+            f"<title>{escape(tip)}</title></path>")
+
+
+# ------------------------------------------------------------
+# Page rewrite
+# ------------------------------------------------------------
+
+class _ChartTags(HTMLParser):
+    """Spans of <canvas> tags (with their container's class), the Chart.js script and inline scripts."""
+
+    def __init__(self, source):
+        super().__init__(convert_charrefs=True)
+        self.source = source
+        self.line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+        self.canvases = {}
+        self.scripts = []
+        self.head_end = None
+        self._classes = []
+        self._script = None
+
+    def _start(self):
+        line, col = self.getpos()
+        return self.line_starts[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        start = self._start()
+        end = start + len(self.get_starttag_text())
+        if tag == "div":
+            self._classes.append((a.get("class") or "").split())
+        elif tag == "canvas" and a.get("id"):
+            container = next((c for classes in reversed(self._classes) for c in classes if c in WIDTH_BY_CLASS), None)
+            self.canvases[a["id"]] = (start, end, container)
+        elif tag == "script":
+            self._script = [start, end, a.get("src"), None]
+            self.scripts.append(self._script)
+
+    def handle_endtag(self, tag):
+        start = self._start()
+        if tag == "div" and self._classes:
+            self._classes.pop()
+        elif tag == "script" and self._script is not None:
+            self._script[3] = self.source.index(">", start) + 1
+            self._script = None
+        elif tag == "head":
+            self.head_end = start
+
+
+def _whole_line(source, start, end):
+    line_start = source.rfind("\n", 0, start) + 1
+    line_end = source.find("\n", end)
+    line_end = len(source) if line_end < 0 else line_end + 1
+    if source[line_start:start].strip() or source[end:line_end].strip():
+        return start, end
+    return line_start, line_end
+
+
+def prerender(source, path="index.html", static=False, log=print):
+    """The page with every bar chart pre-rendered; returns (html, rendered ids)."""
+    index = build_website_index(source, path)
+    tags = _ChartTags(source)
+    tags.feed(source)
+    tags.close()
+
+    edits = []
+    rendered = []
+    for canvas_id, chart in index.charts.items():
+        if canvas_id not in tags.canvases:
+            continue
+        start, end, container = tags.canvases[canvas_id]
+        svg = render_svg(chart, index.bindings, WIDTH_BY_CLASS.get(container, DEFAULT_WIDTH))
+        if svg is None:
+            log(f"  {canvas_id}: not a bar chart, left to Chart.js")
+            continue
+        edits.append((start, start, svg))
+        rendered.append(canvas_id)
+
+    chart_scripts = [s for s in tags.scripts if s[2] and CHARTJS_SCRIPT.search(s[2].split("?")[0])]
+    if static and len(rendered) == len(index.charts):
+        for start, _, _, end in chart_scripts:
+            edits.append((*_whole_line(source, start, end), ""))
+        for start, _, src, end in tags.scripts:
+            if src is None and end is not None and "new Chart(" in source[start:end]:
+                edits.append((*_whole_line(source, start, end), ""))
+    else:
+        for start, tag_end, _, _ in chart_scripts:
+            tag = source[start:tag_end]
+            if " defer" not in tag and " async" not in tag:
+                tag = tag.replace("<script", "<script defer", 1)
+            tag = tag[:-1] + ' onload="document.documentElement.classList.add(\'chartjs\')">'
+            edits.append((start, tag_end, tag))
+    if rendered and tags.head_end is not None:
+        edits.append((tags.head_end, tags.head_end, f"  <style>{SWAP_CSS}</style>\n"))
+
+    pieces = []
+    last = 0
+    for start, end, text in sorted(edits, key=lambda e: (e[0], e[1])):
+        pieces.append(source[last:start])
+        pieces.append(text)
+        last = end
+    pieces.append(source[last:])
+    return "".join(pieces), rendered
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render the Chart.js bar charts to inline SVG.")
+    parser.add_argument("page", nargs="?", default="index.html", help="source page (default: index.html)")
+    parser.add_argument("--out", default="build", help="output directory (default: build)")
+    parser.add_argument("--static", action="store_true", help="drop Chart.js and the chart script entirely")
+    args = parser.parse_args(argv)
+
+    with open(args.page, "r") as f:
+        source = f.read()
+    html, rendered = prerender(source, args.page, args.static)
+    os.makedirs(args.out, exist_ok=True)
+    out_page = os.path.join(args.out, os.path.basename(args.page))
+    with open(out_page, "w") as f:
+        f.write(html)
+    print(f"{len(rendered)} charts pre-rendered: {', '.join(rendered)}")
+    print(f"wrote {out_page}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
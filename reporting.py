@@ -0,0 +1,163 @@
+"""
+Machine-readable report output and phase profiling.
+
+write_jsonl() emits one JSON object per check, then a summary object:
+
+    {"type": "check", "section": "3", "description": "...", "status": "ok",
+     "website": "46.2%", "paper": "46.2%",
+     "website_at": {"path": "index.html", "offset": 28404}, "paper_at": null,
+     "seconds": 0.00001}
+    {"type": "summary", "total": 162, "passed": 160, "mismatches": 2,
+     "notes": [...], "phases": {"read": ..., "index": ..., ...}}
+
+Identity rows add "identity", "doc", "lhs", "rhs" and "residual".
+
+write_junit() emits one <testsuite> per report section and one <testcase>
+per check, with a <failure> for each mismatch.
+"""
+
+import json
+import math
+import time
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+
+from consistency import Residual
+
+PHASES = ("read", "index", "extract", "check")
+
+
+class Profile:
+    """Exclusive wall time per phase: time inside a nested phase counts only there."""
+
+    def __init__(self):
+        self.phases = {}
+        # Extraction seconds per plan region.
+        self.regions = {}
+        self._stack = []
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.add(outer[0], now - outer[1])
+        self._stack.append([name, now])
+        try:
+            yield self
+        finally:
+            end = time.perf_counter()
+            inner = self._stack.pop()
+            self.add(inner[0], end - inner[1])
+            if self._stack:
+                self._stack[-1][1] = end
+
+    def render(self):
+        total = sum(self.phases.values()) or 1.0
+        lines = ["-" * 70, "PROFILE", "-" * 70]
+        names = [p for p in PHASES if p in self.phases] + [p for p in self.phases if p not in PHASES]
+        for name in names:
+            seconds = self.phases[name]
+            lines.append(f"  {name:<10} {seconds * 1000:9.2f} ms  {seconds / total:6.1%}")
+        if self.regions:
+            lines.append("\n  extract by region:")
+            for region, seconds in sorted(self.regions.items(), key=lambda item: -item[1]):
+                doc, kind, key = region
+                lines.append(f"    {seconds * 1000:9.2f} ms  {doc} {kind} {key or ''}".rstrip())
+        return "\n".join(lines)
+
+
+# ------------------------------------------------------------
+# JSON lines
+# ------------------------------------------------------------
+
+def _location(at):
+    return {"path": at[0], "offset": at[1]} if at is not None else None
+
+
+def _finite(value):
+    return value if value is not None and math.isfinite(value) else None
+
+
+def check_record(result):
+    record = {
+        "type": "check",
+        "section": result.section,
+        "description": result.description,
+        "status": "ok" if result.ok else getattr(result, "status", "mismatch"),
+        "website": result.website,
+        "paper": result.paper,
+        "website_at": _location(result.website_at),
+        "paper_at": _location(result.paper_at),
+        "seconds": result.seconds,
+    }
+    if isinstance(result, Residual):
+        record.update(identity=result.identity, doc=result.doc, lhs=_finite(result.lhs),
+                      rhs=_finite(result.rhs), residual=_finite(result.residual))
+    return record
+
+
+def summary_record(report):
+    record = {
+        "type": "summary",
+        "website": report.website_path,
+        "paper": report.paper_path,
+        "total": len(report.results),
+        "passed": len(report.matches),
+        "mismatches": len(report.mismatches),
+        "notes": report.notes,
+        "missing_files": list(report.missing or []),
+    }
+    if report.profile is not None:
+        record["phases"] = dict(report.profile.phases)
+    return record
+
+
+def write_jsonl(report, f):
+    for result in report.results:
+        f.write(json.dumps(check_record(result)) + "\n")
+    f.write(json.dumps(summary_record(report)) + "\n")
+
+
+# ------------------------------------------------------------
+# JUnit XML
+# ------------------------------------------------------------
+
+def junit_tree(report, name="verify_data"):
+    suites = ET.Element("testsuites", name=name)
+    for section in report.spec.sections:
+        results = report.section_results(section.id)
+        failures = [r for r in results if not r.ok]
+        suite = ET.SubElement(suites, "testsuite", name=f"{section.id}. {section.title}",
+                              tests=str(len(results)), failures=str(len(failures)), errors="0",
+                              time=f"{sum(r.seconds for r in results):.6f}")
+        for result in results:
+            case = ET.SubElement(suite, "testcase", classname=f"{name}.section_{section.id}",
+                                 name=result.description, time=f"{result.seconds:.6f}")
+            if not result.ok:
+                failure = ET.SubElement(case, "failure",
+                                        message=f"website {result.website} != paper {result.paper}")
+                failure.text = "\n".join(
+                    f"{side}: {value}" + (f" ({at[0]}, offset {at[1]})" if at else "")
+                    for side, value, at in (("website", result.website, result.website_at),
+                                            ("paper", result.paper, result.paper_at)))
+    missing = list(report.missing or [])
+    if missing:
+        suite = ET.SubElement(suites, "testsuite", name="paper files", tests=str(len(missing)),
+                              failures=str(len(missing)), errors="0", time="0.000000")
+        for path in missing:
+            case = ET.SubElement(suite, "testcase", classname=f"{name}.paper_files", name=path, time="0.000000")
+            ET.SubElement(case, "failure", message=f"missing file {path}")
+    suites.set("tests", str(len(report.results) + len(missing)))
+    suites.set("failures", str(len(report.mismatches) + len(missing)))
+    return ET.ElementTree(suites)
+
+
+def write_junit(report, f):
+    tree = junit_tree(report)
+    ET.indent(tree)
+    tree.write(f, encoding="unicode", xml_declaration=True)
+    f.write("\n")
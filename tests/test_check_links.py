@@ -0,0 +1,146 @@
+"""check_links against a local http.server stub: fallbacks, revalidation, redirects."""
+
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from check_links import MAX_REDIRECTS, Link, Pool, check_external, check_local, check_url
+
+ETAG = '"v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, headers=()):
+        self.server.requests.append((self.command, self.path, self.headers.get("If-None-Match")))
+        body = b"" if self.command == "HEAD" or status in (204, 304) else b"ok"
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        path = self.path
+        if path == "/ok":
+            if self.headers.get("If-None-Match") == ETAG:
+                return self._reply(304, [("ETag", ETAG)])
+            return self._reply(200, [("ETag", ETAG)])
+        if path == "/no-head":
+            return self._reply(405 if self.command == "HEAD" else 200)
+        if path == "/moved":
+            return self._reply(301, [("Location", "/ok")])
+        if path in ("/loop-a", "/loop-b"):
+            return self._reply(302, [("Location", "/loop-b" if path == "/loop-a" else "/loop-a")])
+        if path == "/huge-header":
+            # Over the 64 KiB header limit of asyncio streams.
+            return self._reply(200, [("X-Padding", "x" * 70000)])
+        if path.startswith("/chain/"):
+            return self._reply(302, [("Location", f"/chain/{int(path.rsplit('/', 1)[1]) + 1}")])
+        return self._reply(404)
+
+    do_HEAD = do_GET = _route
+
+    def log_message(self, *args):
+        pass
+
+
+class CheckUrlTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.server.requests = []
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+
+    def check(self, path, cached=None):
+        async def run():
+            pool = Pool(timeout=5.0)
+            try:
+                return await check_url(pool, self.base + path, cached)
+            finally:
+                pool.close()
+        return asyncio.run(run())
+
+    def test_head_refused_falls_back_to_get(self):
+        result = self.check("/no-head")
+        self.assertTrue(result.ok)
+        self.assertEqual((result.status, result.method), (200, "GET"))
+        self.assertEqual([r[0] for r in self.server.requests], ["HEAD", "GET"])
+
+    def test_etag_revalidation(self):
+        first = self.check("/ok")
+        self.assertTrue(first.ok)
+        self.assertEqual(first.etag, ETAG)
+        self.assertIsNone(first.cached)
+
+        second = self.check("/ok", cached=first)
+        self.assertEqual(second.cached, "revalidated")
+        self.assertTrue(second.ok)
+        self.assertEqual(self.server.requests[-1], ("HEAD", "/ok", ETAG))
+
+    def test_redirect_is_followed(self):
+        result = self.check("/moved")
+        self.assertTrue(result.ok)
+        self.assertEqual(result.status, 200)
+        self.assertEqual(result.final_url, self.base + "/ok")
+
+    def test_redirect_loop_is_broken(self):
+        result = self.check("/loop-a")
+        self.assertFalse(result.ok)
+        self.assertIn("redirect loop", result.error)
+
+    def test_endless_redirect_chain_is_broken(self):
+        result = self.check("/chain/0")
+        self.assertFalse(result.ok)
+        self.assertIn("too many redirects", result.error)
+        self.assertEqual(len(self.server.requests), MAX_REDIRECTS + 1)
+
+    def test_not_found(self):
+        result = self.check("/missing")
+        self.assertFalse(result.ok)
+        self.assertEqual((result.status, result.method), (404, "GET"))
+
+    def test_oversized_header_fails_only_its_url(self):
+        urls = [self.base + "/huge-header", self.base + "/ok"]
+        results = asyncio.run(check_external(urls, {}, 0, timeout=5.0))
+        self.assertFalse(results[urls[0]].ok)
+        self.assertIn("LimitOverrunError", results[urls[0]].error)
+        self.assertTrue(results[urls[1]].ok)
+
+
+class CheckLocalTest(unittest.TestCase):
+    def test_percent_encoded_path(self):
+        with tempfile.TemporaryDirectory() as root:
+            page = os.path.join(root, "index.html")
+            with open(os.path.join(root, "my file.pdf"), "w"):
+                pass
+            self.assertIsNone(check_local(Link(page, 1, "a", "my%20file.pdf"), lambda path: set()))
+            self.assertIn("missing file", check_local(Link(page, 1, "a", "other%20file.pdf"), lambda path: set()))
+
+    def test_root_relative_path(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "static", "images"))
+            os.makedirs(os.path.join(root, "docs"))
+            with open(os.path.join(root, "static", "images", "x.png"), "w"):
+                pass
+            page = os.path.join(root, "index.html")
+            self.assertIsNone(check_local(Link(page, 1, "img", "/static/images/x.png"), lambda path: set()))
+            nested = os.path.join(root, "docs", "page.html")
+            link = Link(nested, 1, "img", "/static/images/x.png")
+            self.assertIn("missing file", check_local(link, lambda path: set()))
+            self.assertIsNone(check_local(link, lambda path: set(), root=root))
@@ -0,0 +1,22 @@
+"""claims formula evaluation."""
+
+import math
+import unittest
+
+from claims import NOT_FOUND, compile_plan, evaluate_formula, parse_claims
+
+
+class ZeroDivisorTest(unittest.TestCase):
+    def test_evaluate_formula_gives_nan(self):
+        self.assertTrue(math.isnan(evaluate_formula("q1 / tasks * 100", {"q1": 3, "tasks": 0})))
+        self.assertTrue(math.isnan(evaluate_formula("round(q1 / tasks)", {"q1": 3, "tasks": 0})))
+
+    def test_claim_with_zero_divisor_is_not_found(self):
+        spec = parse_claims({"sections": [{"id": "1", "title": "RATES", "claims": [{
+            "description": "rate",
+            "website": {"formula": "q1 / tasks * 100", "round": 1,
+                        "inputs": {"q1": {"value": "3"}, "tasks": {"value": "0"}}},
+            "paper": {"value": "12.5"}}]}]})
+        [result] = compile_plan(spec).execute(None, None)
+        self.assertEqual(result.website, NOT_FOUND)
+        self.assertFalse(result.ok)
@@ -0,0 +1,70 @@
+"""history bisection on a throwaway git repository."""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+
+from history import History, bisect_claim, main
+
+CLAIM = "Q1 count"
+CLAIMS = {"sections": [{"id": "1", "title": "COUNTS", "claims": [
+    {"description": CLAIM, "value": "18",
+     "website": {"literal": ["Q1 = 18"]}, "paper": {"literal": ["Q1 = 18"]}}]}]}
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                          cwd=repo, check=True, stdout=subprocess.PIPE, text=True).stdout.strip()
+
+
+def _commit(repo, message, files):
+    for path, text in files.items():
+        os.makedirs(os.path.dirname(os.path.join(repo, path)) or repo, exist_ok=True)
+        with open(os.path.join(repo, path), "w") as f:
+            f.write(text)
+    _git(repo, "add", *files)
+    _git(repo, "commit", "-q", "-m", message)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+class BisectBeforePageTest(unittest.TestCase):
+    """The range starts before index.html existed: those revisions are not failures."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.tmp.name, "repo")
+        os.makedirs(self.repo)
+        _git(self.repo, "init", "-q")
+        self.claims = os.path.join(self.tmp.name, "claims.json")
+        with open(self.claims, "w") as f:
+            json.dump(CLAIMS, f)
+        self.revs = [
+            _commit(self.repo, "paper only", {"paper/paper.tex": "We report Q1 = 18 here.\n"}),
+            _commit(self.repo, "page", {"index.html": "<html><body><p>Q1 = 18</p></body></html>"}),
+            _commit(self.repo, "break", {"index.html": "<html><body><p>Q1 = 19</p></body></html>"}),
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_bisect_blames_the_breaking_commit(self):
+        history = History(self.repo, "index.html", "paper/paper.tex", claims_path=self.claims, cache_dir=None)
+        try:
+            self.assertIsNone(history.passes(self.revs[0], CLAIM))
+            self.assertEqual(bisect_claim(history, self.revs, CLAIM, log=lambda *a: None), self.revs[2])
+        finally:
+            history.close()
+
+    def test_main_reports_the_breaking_commit(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = main(["index.html", "paper/paper.tex", "bisect", "--repo", self.repo, "--claim", CLAIM,
+                           "--claims", self.claims, "--cache-dir", os.path.join(self.tmp.name, "cache")])
+        self.assertEqual(status, 1)
+        self.assertIn("break", out.getvalue())
+        self.assertNotIn("paper only", out.getvalue())
+        self.assertIn("Website: NOT FOUND", out.getvalue())
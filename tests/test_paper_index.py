@@ -0,0 +1,105 @@
+"""paper_index table extraction on small LaTeX fixtures."""
+
+import unittest
+
+from paper_index import build_paper_index, clean_cell, scan_events
+
+ROOT = "/fixture/paper.tex"
+
+
+def tables(tex):
+    return build_paper_index(ROOT, None, {ROOT: tex}).tables
+
+
+GROUPED = r"""
+\begin{table}
+\caption{Results \& more}
+\label{tab:results}
+\begin{tabular}{llr}
+\toprule
+Project & Agent & Rate \\
+\midrule
+\multirow{2}{*}{vLLM} & A & 46.2\% \\
+ & B & 20.5\% \\
+% Hidden & C & 99.9\% \\
+\midrule
+\multicolumn{3}{c}{SGLang} \\
+ & A & \textbf{26.7\%} \\
+R\&D & B & 5\% \\
+\bottomrule
+\end{tabular}
+\end{table}
+"""
+
+
+class CleanCellTest(unittest.TestCase):
+    def test_formatting_and_escapes(self):
+        self.assertEqual(clean_cell(r"\textbf{\textit{1.5\%}}"), "1.5%")
+        self.assertEqual(clean_cell(r" R\&D \_ \# "), "R&D _ #")
+        self.assertEqual(clean_cell(r"$\sim$3~s"), r"\sim3 s")
+
+
+class TabularTest(unittest.TestCase):
+    def setUp(self):
+        [self.table] = tables(GROUPED)
+
+    def test_caption_label_and_header(self):
+        self.assertEqual(self.table.caption, "Results & more")
+        self.assertEqual(self.table.label, "tab:results")
+        self.assertEqual(self.table.columns, ["Project", "Agent", "Rate"])
+
+    def test_multirow_fills_following_rows(self):
+        self.assertEqual(self.table.rows[1].texts, ["vLLM", "B", "20.5%"])
+        self.assertEqual(self.table.row("B", "vLLM").group, "vLLM")
+
+    def test_multicolumn_row_starts_a_group(self):
+        row = self.table.row("A", "SGLang")
+        self.assertEqual(row.texts, ["", "A", "26.7%"])
+        self.assertEqual(row.cells[2].number, 26.7)
+        self.assertTrue(row.cells[2].is_percent)
+
+    def test_escaped_ampersand_is_not_a_cell_break(self):
+        self.assertEqual(self.table.row("R&D").texts, ["R&D", "B", "5%"])
+
+    def test_commented_row_is_dropped(self):
+        self.assertIsNone(self.table.row("Hidden"))
+        self.assertEqual(len(self.table.rows), 4)
+
+    def test_cell_offsets_point_into_the_source(self):
+        cell = self.table.row("R&D").cells[0]
+        self.assertTrue(GROUPED.startswith(r"R\&D", cell.offset))
+
+    def test_multicolumn_cell_inside_a_row(self):
+        [table] = tables(r"""
+\begin{tabular}{lll}
+a & b & c \\
+\multicolumn{2}{c}{n/a} & 3 \\
+\end{tabular}
+""")
+        row = table.rows[0]
+        self.assertEqual(row.texts, ["n/a", "", "3"])
+        self.assertEqual([c.span for c in row.cells], [2, 1, 1])
+
+
+class UnclosedArgumentTest(unittest.TestCase):
+    def test_unclosed_label_stops_at_next_brace(self):
+        self.assertEqual([e[:2] for e in scan_events("\\label{a\n\\label{b}")], [["label", "b"]])
+
+    def test_unclosed_caption_does_not_swallow_the_table(self):
+        [table] = tables(r"""
+\begin{table}
+\caption{Unclosed \textbf{bold
+\label{tab:bad}
+\begin{tabular}{ll}
+X & 1 \\
+\end{tabular}
+\end{table}
+""")
+        self.assertTrue(table.caption.startswith("Unclosed"))
+        self.assertEqual(table.label, "tab:bad")
+        self.assertEqual(table.rows[0].texts, ["X", "1"])
+
+    def test_unclosed_tabular_runs_to_end_of_file(self):
+        [table] = tables("\\begin{tabular}{ll}\nX & 1 \\\\\nY & 2")
+        self.assertEqual([row.texts for row in table.rows], [["Y", "2"]])
+        self.assertEqual(table.columns, ["X", "1"])
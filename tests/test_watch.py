@@ -0,0 +1,60 @@
+"""Watcher surviving files that briefly disappear."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from watch import Watcher
+
+CLAIM = "Q1 count"
+CLAIMS = {"sections": [{"id": "1", "title": "COUNTS", "claims": [
+    {"description": CLAIM, "value": "18",
+     "website": {"literal": ["Q1 = 18"]}, "paper": {"literal": ["Q1 = 18"]}}]}]}
+
+
+class MissingFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.website = self.path("index.html")
+        self.paper = self.path("paper.tex")
+        self.write(self.website, "<p>Q1 = 18</p>")
+        self.write(self.paper, "We report Q1 = 18.\n")
+        claims = self.path("claims.json")
+        self.write(claims, json.dumps(CLAIMS))
+        self.watcher = Watcher(self.website, self.paper, claims, cache_dir=None)
+        self.watcher.start()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    @staticmethod
+    def write(path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_missing_page_keeps_last_results(self):
+        os.remove(self.website)
+        docs, _, _ = self.watcher.poll()
+        self.assertEqual(docs, {"website"})
+        self.assertIn("website", self.watcher.errors)
+        self.assertTrue(self.watcher.report().ok)
+
+        self.write(self.website, "<p>Q1 = 19</p>")
+        docs, _, _ = self.watcher.poll()
+        self.assertEqual(self.watcher.errors, {})
+        self.assertEqual([r.description for r in self.watcher.report().mismatches], [CLAIM])
+
+    def test_missing_paper_root_keeps_last_results(self):
+        os.remove(self.paper)
+        self.watcher.poll()
+        self.assertIn("paper", self.watcher.errors)
+        self.assertTrue(self.watcher.report().ok)
+
+        self.write(self.paper, "We report Q1 = 18 again.\n")
+        self.watcher.poll()
+        self.assertEqual(self.watcher.errors, {})
+        self.assertTrue(self.watcher.report().ok)
@@ -0,0 +1,117 @@
+"""website_index Chart.js literal extraction on small script fixtures."""
+
+import unittest
+
+from website_index import Expr, Ref, build_website_index, extract_charts
+
+SCRIPT = """
+// new Chart('commented-out', {data: {labels: ['x'], datasets: []}});
+const agents = ['A', 'B', 'C',];
+/* a block comment with new Chart('also-commented', {}) inside */
+new Chart(document.getElementById('rates'), {
+  type: 'bar', // trailing comment
+  data: {
+    labels: agents,
+    datasets: [
+      { label: 'vLLM (39 tasks)', data: [46.2, /* 0.0, */ 20.5, -3,], backgroundColor: colors.vllm, },
+      { label: 'vLLM', data: [1, 2, 3] },
+      { label: 'Q1 True Success', data: [18, 8, 11], url: 'http://example.com/a', },
+    ],
+  },
+});
+"""
+
+
+def chart(script):
+    charts, _ = extract_charts(script, script)
+    return charts
+
+
+class ExtractChartsTest(unittest.TestCase):
+    def setUp(self):
+        [self.chart] = chart(SCRIPT)
+
+    def test_commented_out_charts_are_skipped(self):
+        self.assertEqual(self.chart.canvas_id, "rates")
+
+    def test_labels_resolve_through_bindings_with_trailing_comma(self):
+        self.assertEqual(self.chart.labels, ["A", "B", "C"])
+
+    def test_trailing_commas_and_inline_comments_in_data(self):
+        dataset = self.chart.datasets[0]
+        self.assertEqual(dataset.values, [46.2, 20.5, -3.0])
+        self.assertEqual([p.raw for p in dataset.points], ["46.2", "20.5", "-3"])
+        self.assertEqual(dataset.options["backgroundColor"], Ref("colors.vllm"))
+
+    def test_point_offsets_point_into_the_script(self):
+        point = self.chart.series("vLLM (39 tasks)")["B"]
+        self.assertTrue(SCRIPT.startswith("20.5", point.offset))
+
+    def test_comment_markers_inside_strings_are_kept(self):
+        self.assertEqual(self.chart.datasets[2].options["url"], "http://example.com/a")
+
+
+class DatasetLabelTest(unittest.TestCase):
+    def setUp(self):
+        [self.chart] = chart(SCRIPT)
+
+    def test_exact_label_wins_over_prefix(self):
+        self.assertEqual(self.chart.dataset("vLLM").values, [1.0, 2.0, 3.0])
+
+    def test_prefix_needs_a_word_boundary(self):
+        self.assertEqual(self.chart.dataset("Q1").label, "Q1 True Success")
+        self.assertIsNone(self.chart.dataset("Q"))
+        self.assertIsNone(self.chart.dataset("True Success"))
+        self.assertEqual(self.chart.series("Q"), {})
+
+    def test_computed_label_is_not_matched(self):
+        [computed] = chart("new Chart('c', {data: {labels: ['a'], datasets: [{label: name + '!', data: [1]}]}})")
+        self.assertEqual(computed.datasets[0].label, "")
+        self.assertIsNone(computed.dataset("name"))
+
+
+class NonLiteralConfigTest(unittest.TestCase):
+    def test_data_bound_to_a_variable(self):
+        [c] = chart("const chartData = {labels: ['a', 'b'], datasets: [{label: 'x', data: [1, 2]}]};\n"
+                    "new Chart('c', {type: 'bar', data: chartData});")
+        self.assertEqual(c.series("x")["b"].value, 2.0)
+
+    def test_data_from_a_call_skips_only_that_chart(self):
+        charts = chart("new Chart('c', {data: build()});\n"
+                       "new Chart('d', {data: {labels: ['a'], datasets: [{label: 'x', data: [1]}]}});")
+        self.assertEqual([c.canvas_id for c in charts], ["d"])
+
+    def test_dataset_data_bound_to_a_variable(self):
+        [c] = chart("const values = [3, 4];\n"
+                    "new Chart('c', {data: {labels: ['a', 'b'], datasets: [{label: 'x', data: values},"
+                    " {label: 'y', data: compute()}]}});")
+        self.assertEqual(c.dataset("x").values, [3.0, 4.0])
+        self.assertEqual([ds.label for ds in c.datasets], ["x"])
+
+    def test_unbound_dataset_data_is_skipped(self):
+        [c] = chart("new Chart('c', {data: {labels: ['a'], datasets: [{label: 'x', data: values}]}});")
+        self.assertEqual(c.datasets, [])
+
+
+class TokenizerEdgeTest(unittest.TestCase):
+    def test_unterminated_string_keeps_its_last_character(self):
+        script = "const names = ['ab', 'abc\n];"
+        _, bindings = extract_charts(script, script)
+        self.assertEqual(bindings["names"], ["ab", "abc"])
+
+    def test_unterminated_block_comment_runs_to_the_end(self):
+        self.assertEqual(chart("new Chart('c', {data: {labels: ['a']}}); /* new Chart('d', {})"), chart(
+            "new Chart('c', {data: {labels: ['a']}});"))
+
+    def test_expression_values_are_kept_as_source(self):
+        [c] = chart("new Chart('c', {options: {max: Math.max(1, 2)}, data: {labels: []}})")
+        self.assertEqual(c.config["options"]["max"], Expr("Math.max(1, 2)"))
+
+
+class WebsiteIndexTest(unittest.TestCase):
+    def test_chart_from_page_script(self):
+        page = f"<html><body><canvas id='rates'></canvas><script>{SCRIPT}</script></body></html>"
+        index = build_website_index(page, "fixture.html")
+        point = index.chart("rates").series("Q1")["C"]
+        self.assertEqual(point.value, 11.0)
+        self.assertTrue(page.startswith("11", point.offset))
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Watch the page and the paper, re-checking only what an edit can affect.
+
+Both document indexes and every region extract stay in memory. Each poll
+stats the page and every file reachable from the paper root; only files
+whose (mtime, size) moved are read and hashed, and only a changed hash
+counts as an edit. The changed document is re-indexed (paper files that
+did not change reuse their parsed events), its regions are re-extracted,
+and each region is compared with its previous extract by value. Only the
+claims and identities that read a region whose values changed are
+evaluated again.
+
+    python watch.py path/to/index.html path/to/example_paper.tex
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+from claims import DEFAULT_CLAIMS_PATH
+from paper_index import DEFAULT_CACHE_DIR, build_paper_index
+from verify_data import Report, load_plan
+from website_index import build_website_index
+
+
+def _fingerprint(region, extract):
+    """Comparable values of one extract; offsets are left out so edits above it don't count."""
+    if extract is None:
+        return None
+    kind = region[1]
+    if kind == "literals":
+        return frozenset(n for n in extract.needles if extract.contains(n))
+    if kind == "chart":
+        return (tuple(extract.labels),
+                tuple((ds.label, tuple(p.raw for p in ds.points)) for ds in extract.datasets))
+    if kind == "section_table":
+        return tuple(tuple(cell.text for cell in row) for row in extract.rows)
+    if kind == "table":
+        return (extract.caption, tuple((row.group, tuple(row.texts)) for row in extract.rows))
+    return None
+
+
+class _File:
+    """Last seen (mtime, size) and content hash of one watched file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.stat = None
+        self.digest = None
+
+    def changed(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            st = None
+        stat = (st.st_mtime_ns, st.st_size) if st else None
+        if stat == self.stat:
+            return False
+        self.stat = stat
+        digest = None
+        if st:
+            try:
+                with open(self.path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                # Gone between stat and open (e.g. mid atomic save); seen as missing.
+                self.stat = None
+        if digest == self.digest:
+            return False
+        self.digest = digest
+        return True
+
+
+class Watcher:
+    def __init__(self, website_path, paper_path, claims_path=DEFAULT_CLAIMS_PATH, cache_dir=DEFAULT_CACHE_DIR):
+        self.website_path = website_path
+        self.paper_path = paper_path
+        self.cache_dir = cache_dir
+        self.plan = load_plan(claims_path)
+        self._events = {}
+        self._website_file = _File(website_path)
+        self._paper_files = {}
+        self.indexes = {}
+        self.extracts = {}
+        self.fingerprints = {}
+        self.by_user = {}
+        # Document -> why it could not be read at the last refresh; its last index is kept.
+        self.errors = {}
+
+    def _index(self, doc):
+        if doc == "website":
+            with open(self.website_path, "r") as f:
+                return build_website_index(f.read(), self.website_path)
+        paper = build_paper_index(self.paper_path, self.cache_dir, memo=self._events)
+        if not paper.exists(paper.root_path):
+            raise FileNotFoundError(f"paper not found: {self.paper_path}")
+        # Missing \input files are watched too, so creating one triggers a refresh.
+        files = {path: self._paper_files.get(path) or _File(path) for path in paper.files() + paper.missing}
+        for watched in files.values():
+            watched.changed()
+        self._paper_files = files
+        return paper
+
+    def _poll(self):
+        """Documents with at least one file whose contents changed since the last poll."""
+        docs = set()
+        if self._website_file.changed():
+            docs.add("website")
+        if any(f.changed() for f in list(self._paper_files.values())):
+            docs.add("paper")
+        return docs
+
+    def refresh(self, docs):
+        """Re-index `docs`, re-extract their regions and re-evaluate affected checks.
+
+        Returns (changed regions, number of checks re-run). A document that
+        cannot be read (e.g. briefly missing during an editor's atomic save)
+        keeps its last index and is recorded in `errors`; its files are
+        still watched, so it is re-read once they change again.
+        """
+        self.errors = {}
+        for doc in list(docs):
+            try:
+                self.indexes[doc] = self._index(doc)
+            except OSError as e:
+                if doc not in self.indexes:
+                    raise
+                self.errors[doc] = str(e)
+                docs = set(docs) - {doc}
+        regions = [r for r in self.plan.regions if r[0] in docs]
+        fresh = self.plan.extract(self.indexes, regions)
+        changed = []
+        for region, extract in fresh.items():
+            fingerprint = _fingerprint(region, extract)
+            if region not in self.fingerprints or fingerprint != self.fingerprints[region]:
+                changed.append(region)
+            self.fingerprints[region] = fingerprint
+            self.extracts[region] = extract
+        if not self.by_user:
+            users = self.plan.users
+        else:
+            seen = set()
+            users = []
+            for region in changed:
+                for user in self.plan.regions[region]:
+                    if id(user) not in seen:
+                        seen.add(id(user))
+                        users.append(user)
+        self.by_user.update(self.plan.evaluate(self.extracts, self.indexes, users))
+        return changed, len(users)
+
+    def start(self):
+        self._website_file.changed()
+        return self.refresh({"website", "paper"})
+
+    def poll(self):
+        docs = self._poll()
+        return (docs, *self.refresh(docs)) if docs else (docs, [], 0)
+
+    def report(self):
+        return Report(self.plan.spec, self.plan.collect(self.by_user), self.website_path, self.paper_path,
+                      missing=self.indexes["paper"].missing)
+
+
+def _print_mismatches(report, previous):
+    current = {r.description for r in report.mismatches}
+    added, fixed = current - previous, previous - current
+    print(f"  {len(current)} mismatches (+{len(added)} new, -{len(fixed)} fixed)")
+    for r in report.mismatches:
+        marker = "+" if r.description in added else " "
+        print(f"  {marker} {r.description}: website {r.website} / paper {r.paper}")
+    for description in sorted(fixed):
+        print(f"  - {description}")
+    return current
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-check the page against the paper on every save.")
+    parser.add_argument("website", help="path to index.html")
+    parser.add_argument("paper", help="path to the root .tex file of the paper")
+    parser.add_argument("--interval", type=float, default=0.2, help="polling interval in seconds")
+    parser.add_argument("--claims", default=DEFAULT_CLAIMS_PATH, help="claims file (default: claims.json)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="parsed-table cache directory")
+    args = parser.parse_args(argv)
+
+    watcher = Watcher(args.website, args.paper, args.claims, args.cache_dir)
+    started = time.perf_counter()
+    try:
+        _, checked = watcher.start()
+    except FileNotFoundError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"Watching {args.website} and {len(watcher._paper_files)} paper files "
+          f"({checked} checks in {(time.perf_counter() - started) * 1000:.0f} ms)")
+    previous = _print_mismatches(watcher.report(), set())
+    try:
+        while True:
+            time.sleep(args.interval)
+            started = time.perf_counter()
+            docs, regions, checked = watcher.poll()
+            if not docs:
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            for doc, error in sorted(watcher.errors.items()):
+                print(f"\n[{time.strftime('%H:%M:%S')}] {doc} unreadable ({error}); keeping the last results")
+            if not docs - set(watcher.errors):
+                continue
+            print(f"\n[{time.strftime('%H:%M:%S')}] {', '.join(sorted(docs - set(watcher.errors)))} changed: "
+                  f"{len(regions)} regions differ, {checked} checks re-run in {elapsed:.1f} ms")
+            previous = _print_mismatches(watcher.report(), previous)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,476 @@
+"""
+Single-pass structured index of an ISO-Bench style project page.
+
+One walk over index.html records every section heading with the text and
+tables under it, and every Chart.js chart built by the inline scripts
+(canvas id, labels, dataset labels and numeric arrays). Checks look values
+up here instead of re-scanning and slicing the page source.
+"""
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+from literal_matcher import first_containing, scan_literals
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+SKIP_TEXT_TAGS = ("script", "style")
+
+
+@dataclass
+class Section:
+    heading: str
+    level: int
+    offset: int
+    parent: "Section | None" = None
+    text_parts: list = field(default_factory=list, repr=False)
+    tables: list = field(default_factory=list)
+    canvases: list = field(default_factory=list)
+
+    @property
+    def text(self):
+        return " ".join(self.text_parts)
+
+
+@dataclass
+class Cell:
+    text: str
+    offset: int
+    header: bool = False
+
+
+@dataclass
+class Table:
+    offset: int
+    section: "Section | None"
+    rows: list = field(default_factory=list)
+
+    def row(self, key):
+        """First row whose first cell reads `key`, as a list of cell texts."""
+        for row in self.rows:
+            if row and row[0].text == key:
+                return [cell.text for cell in row]
+        return None
+
+    def cell(self, key, column=1):
+        for row in self.rows:
+            if row and row[0].text == key:
+                return row[column] if column < len(row) else None
+        return None
+
+    def value(self, key, column=1):
+        cell = self.cell(key, column)
+        return None if cell is None else cell.text
+
+
+@dataclass
+class DataPoint:
+    raw: str
+    value: float
+    offset: int
+
+
+@dataclass
+class Dataset:
+    label: str
+    points: list
+    offset: int
+    options: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def values(self):
+        return [p.value for p in self.points]
+
+
+@dataclass
+class Chart:
+    canvas_id: str
+    offset: int
+    labels: list
+    datasets: list
+    config: dict = field(default_factory=dict, repr=False)
+
+    def dataset(self, name):
+        """Dataset labelled `name`, else the first whose label starts with `name` and a space."""
+        for ds in self.datasets:
+            if ds.label == name:
+                return ds
+        for ds in self.datasets:
+            if ds.label.startswith(name + " "):
+                return ds
+        return None
+
+    def series(self, name):
+        """Map chart label -> DataPoint for the dataset called `name`."""
+        ds = self.dataset(name)
+        if ds is None:
+            return {}
+        return dict(zip(self.labels, ds.points))
+
+
+# ------------------------------------------------------------
+# Chart.js literal extraction
+# ------------------------------------------------------------
+
+# An unterminated string or comment runs to the end of its line (or script)
+# rather than failing and being retried from every later quote.
+_JS_TOKEN = re.compile(r"""
+    (?P<skip>\s+|//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?|`(?:[^`\\]|\\.)*`?)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>\.\.\.|=>|.)
+""", re.S | re.X)
+
+_OPEN = "([{"
+_CLOSE = ")]}"
+
+
+@dataclass
+class Ref:
+    """An identifier or member expression such as `agents` or `colors.vllm`."""
+    name: str
+
+
+@dataclass
+class Expr:
+    """Any other JavaScript expression, kept as source text."""
+    source: str
+
+
+def _tokenize(script, base):
+    tokens = []
+    for m in _JS_TOKEN.finditer(script):
+        kind = m.lastgroup
+        if kind != "skip":
+            tokens.append((kind, m.group(), base + m.start()))
+    return tokens
+
+
+def _unquote(raw):
+    # An unterminated string has no closing quote to drop; a quote preceded by
+    # an odd number of backslashes is escaped, not closing.
+    escapes = len(raw[1:-1]) - len(raw[1:-1].rstrip("\\"))
+    closed = len(raw) > 1 and raw[-1] == raw[0] and escapes % 2 == 0
+    body = raw[1:-1] if closed else raw[1:]
+    return re.sub(r"\\(.)", r"\1", body)
+
+
+class _LiteralParser:
+    """Parses object/array literals out of a token list; anything else becomes Ref or Expr."""
+
+    def __init__(self, tokens, source):
+        self.tokens = tokens
+        self.source = source
+        self.pos = 0
+
+    def peek(self, ahead=0):
+        i = self.pos + ahead
+        return self.tokens[i] if i < len(self.tokens) else ("eof", "", len(self.source))
+
+    def take(self):
+        tok = self.peek()
+        self.pos += 1
+        return tok
+
+    def value(self):
+        kind, text, offset = self.peek()
+        if text == "{" and kind == "punct":
+            return self.object()
+        if text == "[" and kind == "punct":
+            return self.array()
+        following = self.peek(1)[1]
+        if kind == "string" and following in (",", "}", "]", ")"):
+            self.take()
+            return _unquote(text)
+        if kind == "number" and following in (",", "}", "]", ")"):
+            self.take()
+            return DataPoint(text, float(text), offset)
+        if text == "-" and self.peek(1)[0] == "number" and self.peek(2)[1] in (",", "}", "]", ")"):
+            self.take()
+            _, num, _ = self.take()
+            return DataPoint("-" + num, -float(num), offset)
+        return self.expression()
+
+    def object(self):
+        self.take()
+        obj = {}
+        spreads = []
+        while self.peek()[1] != "}" and self.peek()[0] != "eof":
+            kind, text, _ = self.peek()
+            if text == "...":
+                self.take()
+                spreads.append(self.expression())
+            else:
+                self.take()
+                key = _unquote(text) if kind == "string" else text
+                if self.peek()[1] == ":":
+                    self.take()
+                    obj[key] = self.value()
+                else:
+                    obj[key] = Ref(key)
+            if self.peek()[1] == ",":
+                self.take()
+        self.take()
+        if spreads:
+            obj["..."] = spreads
+        return obj
+
+    def array(self):
+        self.take()
+        items = []
+        while self.peek()[1] != "]" and self.peek()[0] != "eof":
+            items.append(self.value())
+            if self.peek()[1] == ",":
+                self.take()
+        self.take()
+        return items
+
+    def expression(self):
+        start = self.peek()[2]
+        depth = 0
+        end = start
+        parts = []
+        while True:
+            kind, text, offset = self.peek()
+            if kind == "eof":
+                break
+            if kind == "punct" and text in _CLOSE or text in (",", ";"):
+                if depth == 0:
+                    break
+            if kind == "punct" and text in _OPEN:
+                depth += 1
+            elif kind == "punct" and text in _CLOSE:
+                depth -= 1
+            self.take()
+            parts.append((kind, text))
+            end = offset + len(text)
+        if parts and all(k == "name" or t == "." for k, t in parts):
+            name = "".join(t for _, t in parts)
+            if name in ("true", "false"):
+                return name == "true"
+            return Ref(name)
+        return Expr(self.source[start:end])
+
+
+def _resolve(value, bindings):
+    if isinstance(value, Ref):
+        head, _, rest = value.name.partition(".")
+        target = bindings.get(head)
+        for part in rest.split(".") if rest else []:
+            target = target.get(part) if isinstance(target, dict) else None
+        return value if target is None else target
+    return value
+
+
+def _chart_from_config(canvas_id, offset, config, bindings):
+    """Chart for one config; None when its data is not a literal or bound object.
+
+    Every level may name a `const` binding. Values computed in JavaScript
+    (calls, expressions) cannot be read, so their chart or dataset is skipped.
+    """
+    config = _resolve(config, bindings)
+    data = _resolve(config.get("data", {}), bindings) if isinstance(config, dict) else None
+    if not isinstance(data, dict):
+        return None
+    labels = _resolve(data.get("labels", []), bindings)
+    labels = labels if isinstance(labels, list) else []
+    raw_datasets = _resolve(data.get("datasets", []), bindings)
+    datasets = []
+    for raw in raw_datasets if isinstance(raw_datasets, list) else []:
+        raw = _resolve(raw, bindings)
+        if not isinstance(raw, dict):
+            continue
+        values = _resolve(raw.get("data", []), bindings)
+        if not isinstance(values, list):
+            continue
+        points = [p for p in values if isinstance(p, DataPoint)]
+        options = {k: _resolve(v, bindings) for k, v in raw.items() if k not in ("label", "data")}
+        ds_offset = points[0].offset if points else offset
+        # A label computed in JavaScript cannot be matched by name.
+        label = _resolve(raw.get("label", ""), bindings)
+        datasets.append(Dataset(label if isinstance(label, str) else "", points, ds_offset, options))
+    return Chart(canvas_id, offset, list(labels), datasets, config)
+
+
+def extract_charts(script, source, base=0):
+    """Return (charts, bindings) for every `new Chart(...)` in one inline script."""
+    tokens = _tokenize(script, base)
+    parser = _LiteralParser(tokens, source)
+    bindings = {}
+    charts = []
+    while parser.pos < len(tokens):
+        kind, text, offset = parser.peek()
+        if text in ("const", "let", "var") and parser.peek(1)[0] == "name" and parser.peek(2)[1] == "=" \
+                and parser.peek(3)[1] in ("[", "{"):
+            name = parser.peek(1)[1]
+            parser.pos += 3
+            bindings[name] = parser.value()
+        elif text == "new" and parser.peek(1)[1] == "Chart" and parser.peek(2)[1] == "(":
+            parser.pos += 3
+            canvas_id = None
+            depth = 0
+            while parser.peek()[0] != "eof":
+                tok_kind, tok_text, _ = parser.peek()
+                if depth == 0 and tok_text in (",", ")"):
+                    break
+                if tok_kind == "punct" and tok_text in _OPEN:
+                    depth += 1
+                elif tok_kind == "punct" and tok_text in _CLOSE:
+                    depth -= 1
+                elif tok_kind == "string":
+                    canvas_id = _unquote(tok_text)
+                parser.take()
+            if parser.peek()[1] == ",":
+                parser.take()
+                chart = _chart_from_config(canvas_id, offset, parser.value(), bindings)
+                if chart is not None:
+                    charts.append(chart)
+        else:
+            parser.pos += 1
+    return charts, bindings
+
+
+# ------------------------------------------------------------
+# HTML walk
+# ------------------------------------------------------------
+
+class _IndexBuilder(HTMLParser):
+    def __init__(self, source):
+        super().__init__(convert_charrefs=True)
+        self.source = source
+        self.line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+        self.sections = []
+        self.tables = []
+        self.scripts = []
+        self.canvases = {}
+        self.current = None
+        self.heading = None
+        self.skip_depth = 0
+        self.table_stack = []
+        self.row = None
+        self.cell = None
+
+    def source_offset(self):
+        line, col = self.getpos()
+        return self.line_starts[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TEXT_TAGS:
+            self.skip_depth += 1
+        elif tag in HEADING_TAGS:
+            self.heading = (int(tag[1]), self.source_offset(), [])
+        elif tag == "table":
+            table = Table(self.source_offset(), self.current)
+            self.table_stack.append(table)
+            self.tables.append(table)
+            if self.current is not None:
+                self.current.tables.append(table)
+        elif tag == "tr" and self.table_stack:
+            self.row = []
+            self.table_stack[-1].rows.append(self.row)
+        elif tag in ("td", "th") and self.row is not None:
+            self.cell = (self.source_offset(), tag == "th", [])
+        elif tag == "canvas":
+            canvas_id = dict(attrs).get("id")
+            if canvas_id:
+                self.canvases[canvas_id] = self.current
+                if self.current is not None:
+                    self.current.canvases.append(canvas_id)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TEXT_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in HEADING_TAGS and self.heading is not None:
+            level, offset, parts = self.heading
+            self.heading = None
+            parent = self.current
+            while parent is not None and parent.level >= level:
+                parent = parent.parent
+            self.current = Section(_collapse(" ".join(parts)), level, offset, parent)
+            self.sections.append(self.current)
+        elif tag in ("td", "th") and self.cell is not None:
+            offset, header, parts = self.cell
+            self.row.append(Cell(_collapse("".join(parts)), offset, header))
+            self.cell = None
+        elif tag == "tr":
+            self.row = None
+        elif tag == "table" and self.table_stack:
+            self.table_stack.pop()
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            if self.lasttag == "script" and data.strip():
+                self.scripts.append((self.source_offset(), data))
+            return
+        if self.heading is not None:
+            self.heading[2].append(data)
+            return
+        if self.cell is not None:
+            self.cell[2].append(data)
+        text = data.strip()
+        if text and self.current is not None:
+            self.current.text_parts.append(_collapse(text))
+
+
+def _collapse(text):
+    return " ".join(text.split())
+
+
+class WebsiteIndex:
+    """Sections, tables and Chart.js datasets of one page, built in a single pass."""
+
+    def __init__(self, source, path="index.html"):
+        self.source = source
+        self.path = path
+        builder = _IndexBuilder(source)
+        builder.feed(source)
+        builder.close()
+        self.sections = builder.sections
+        self.tables = builder.tables
+        self.charts = {}
+        self.bindings = {}
+        for offset, script in builder.scripts:
+            charts, bindings = extract_charts(script, source, offset)
+            self.bindings.update(bindings)
+            for chart in charts:
+                self.charts[chart.canvas_id] = chart
+        self.canvas_sections = builder.canvases
+        self.literals = None
+
+    def scan_literals(self, needles):
+        """Find every needle in one pass; contains()/find() then answer from the result."""
+        self.literals = scan_literals(self.source, needles)
+        return self.literals
+
+    def find(self, needle):
+        """Offset of the first occurrence of `needle`, or None."""
+        if self.literals is not None and needle in self.literals:
+            return self.literals.first(needle)
+        offset = self.source.find(needle)
+        return None if offset < 0 else offset
+
+    def contains(self, needle):
+        return self.find(needle) is not None
+
+    def locate(self, offset):
+        return (self.path, offset)
+
+    def section(self, heading):
+        """First section whose heading contains `heading`."""
+        for section in self.sections:
+            if heading in section.heading:
+                return section
+        return None
+
+    def sections_containing(self, headings):
+        """Map each heading to the first section whose heading contains it, in one scan."""
+        found = first_containing([s.heading for s in self.sections], [h for h in headings if "\n" not in h])
+        return {h: self.sections[found[h]] if h in found else self.section(h) for h in headings}
+
+    def chart(self, canvas_id):
+        return self.charts.get(canvas_id)
+
+
+def build_website_index(source, path="index.html"):
+    return WebsiteIndex(source, path)